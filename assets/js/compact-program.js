@@ -0,0 +1,116 @@
+/**
+ * Compact Program Module
+ * Reads program.compact.json (written by scripts/compact_program.py) and
+ * expands it into the same week documents as the phaseN-weekM.json files
+ */
+
+// Location of the compact program, next to the week files
+const COMPACT_PROGRAM_URL = './dev/exercise-data/program.compact.json';
+
+// Compact format this reader understands
+const COMPACT_FORMAT = 'ppl-compact';
+const COMPACT_VERSION = 4;
+
+// Exercise keys stored in a prescription row, after the exercise index
+const COMPACT_ENTRY_FIELDS = ['warmup_sets', 'working_sets', 'reps', 'rpe', 'rest'];
+
+// Expanded program, loaded once per page
+let compactProgramPromise = null;
+
+/**
+ * Percent-encode a name the way Python's urllib.parse.quote() does
+ * @param {string} text - The text to encode
+ * @returns {string} The encoded text
+ */
+function quoteLikePython(text) {
+  return encodeURIComponent(text)
+    .replace(/[!'()*]/g, c => '%' + c.charCodeAt(0).toString(16).toUpperCase())
+    .replace(/%2F/g, '/');
+}
+
+/**
+ * Expand a compact program into week documents
+ * @param {Object} compact - The parsed program.compact.json
+ * @returns {Object} File stem (e.g. 'phase1-week1') -> week document
+ */
+function expandCompactProgram(compact) {
+  if (compact.format !== COMPACT_FORMAT || compact.version !== COMPACT_VERSION) {
+    throw new Error(`Unsupported compact format: ${compact.format} v${compact.version}`);
+  }
+  
+  const strings = compact.strings;
+  const [linkPrefix, linkSuffix] = compact.linkTemplate;
+  
+  const expandRow = row => {
+    const [exerciseId, name, link, notes, substitutions] = compact.exercises[row[0]];
+    const exercise = { id: strings[exerciseId], name: strings[name] };
+    COMPACT_ENTRY_FIELDS.forEach((field, i) => {
+      exercise[field] = strings[row[i + 1]];
+    });
+    // A null link is the generated search link for the name
+    exercise.link = link !== null ? strings[link] : linkPrefix + quoteLikePython(exercise.name) + linkSuffix;
+    exercise.notes = strings[notes];
+    exercise.substitutions = substitutions.map(sub => strings[sub]);
+    
+    if (row[6] !== null) {
+      exercise.targets = {};
+      compact.targetFields.forEach((field, i) => {
+        const range = compact.targets[row[6]][i];
+        exercise.targets[field] = range !== null
+          ? { min: compact.ranges[range][0], max: compact.ranges[range][1] }
+          : null;
+      });
+    }
+    return exercise;
+  };
+  
+  const weeks = {};
+  compact.weeks.forEach(packed => {
+    const doc = {};
+    ['phase', 'week', 'description', 'deload', 'derived', 'base_week'].forEach(key => {
+      if (key in packed) {
+        doc[key] = key === 'description' ? strings[packed[key]] : packed[key];
+      }
+    });
+    
+    if (packed.days) {
+      doc.days = {};
+      packed.days.forEach(([dayKey, title, rows]) => {
+        doc.days[strings[dayKey]] = {
+          title: strings[title],
+          exercises: rows.map(row => expandRow(compact.rows[row]))
+        };
+      });
+    }
+    
+    weeks[packed.name] = doc;
+  });
+  
+  return weeks;
+}
+
+/**
+ * Get one week from the compact program
+ * @param {number} phase - The phase number
+ * @param {number} week - The week number
+ * @returns {Promise<Object|null>} The week document, or null if the compact program is unavailable
+ */
+async function fetchCompactWeek(phase, week) {
+  if (!compactProgramPromise) {
+    compactProgramPromise = fetch(COMPACT_PROGRAM_URL)
+      .then(response => (response.ok ? response.json() : null))
+      .then(compact => (compact ? expandCompactProgram(compact) : null))
+      .catch(error => {
+        console.warn(`Compact program not available: ${error.message}`);
+        return null;
+      });
+  }
+  
+  const weeks = await compactProgramPromise;
+  return weeks ? weeks[`phase${phase}-week${week}`] || null : null;
+}
+
+window.compactProgram = {
+  expand: expandCompactProgram,
+  fetchWeek: fetchCompactWeek
+};
@@ -0,0 +1 @@
+const COMPACT_PROGRAM_URL="./dev/exercise-data/program.compact.json",COMPACT_FORMAT="ppl-compact",COMPACT_VERSION=4,COMPACT_ENTRY_FIELDS=["warmup_sets","working_sets","reps","rpe","rest"];let compactProgramPromise=null;function quoteLikePython(e){return encodeURIComponent(e).replace(/[!'()*]/g,(e=>"%"+e.charCodeAt(0).toString(16).toUpperCase())).replace(/%2F/g,"/")}function expandCompactProgram(e){if(e.format!==COMPACT_FORMAT||e.version!==COMPACT_VERSION)throw new Error(`Unsupported compact format: ${e.format} v${e.version}`);const t=e.strings,[n,r]=e.linkTemplate,a=a=>{const[o,s,c,l,i]=e.exercises[a[0]],p={id:t[o],name:t[s]};return COMPACT_ENTRY_FIELDS.forEach(((e,n)=>{p[e]=t[a[n+1]]})),p.link=null!==c?t[c]:n+quoteLikePython(p.name)+r,p.notes=t[l],p.substitutions=i.map((e=>t[e])),null!==a[6]&&(p.targets={},e.targetFields.forEach(((t,n)=>{const r=e.targets[a[6]][n];p.targets[t]=null!==r?{min:e.ranges[r][0],max:e.ranges[r][1]}:null}))),p},o={};return e.weeks.forEach((n=>{const r={};["phase","week","description","deload","derived","base_week"].forEach((e=>{e in n&&(r[e]="description"===e?t[n[e]]:n[e])})),n.days&&(r.days={},n.days.forEach((([n,o,s])=>{r.days[t[n]]={title:t[o],exercises:s.map((t=>a(e.rows[t])))}}))),o[n.name]=r})),o}async function fetchCompactWeek(e,t){compactProgramPromise||(compactProgramPromise=fetch(COMPACT_PROGRAM_URL).then((e=>e.ok?e.json():null)).then((e=>e?expandCompactProgram(e):null)).catch((e=>(console.warn(`Compact program not available: ${e.message}`),null))));const n=await compactProgramPromise;return n&&n[`phase${e}-week${t}`]||null}window.compactProgram={expand:expandCompactProgram,fetchWeek:fetchCompactWeek};
\ No newline at end of file
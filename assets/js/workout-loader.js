@@ -11,6 +11,15 @@
  */
 async function fetchWorkoutData(phase, week) {
   try {
+    // Prefer the compact program, which holds every week in one request
+    if (window.compactProgram) {
+      const compactData = await window.compactProgram.fetchWeek(phase, week);
+      if (compactData) {
+        console.log(`Loaded Phase ${phase}, Week ${week} from the compact program`);
+        return compactData;
+      }
+    }
+    
     // Define all possible paths to try in order of preference
     const paths = [
       // Path relative to the current directory (most common case)
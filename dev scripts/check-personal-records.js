@@ -0,0 +1,100 @@
+/**
+ * Personal Record Fixture Check
+ * Runs the set sequences of scripts/personal-record-fixtures.json through
+ * checkPersonalRecord() in assets/js/workout-storage.js and compares every
+ * outcome and the final records with the fixture. The Python engine is
+ * checked against the same file by scripts/personal_records.py --check-fixtures.
+ *
+ * Usage: node "dev scripts/check-personal-records.js" [fixture.json]
+ */
+
+import fs from 'fs';
+import path from 'path';
+import vm from 'vm';
+import { fileURLToPath } from 'url';
+
+// Get the current directory and project root
+const __filename = fileURLToPath(import.meta.url);
+const __dirname = path.dirname(__filename);
+const projectRoot = path.join(__dirname, '..');  // Up one level from "dev scripts"
+
+const storageScript = path.join(projectRoot, 'assets', 'js', 'workout-storage.js');
+const fixtureFile = process.argv[2] || path.join(projectRoot, 'scripts', 'personal-record-fixtures.json');
+
+/**
+ * Load workout-storage.js into a sandbox with an in-memory localStorage
+ * @returns {Object} The sandbox, with the script's functions as globals
+ */
+function loadStorage() {
+  const items = {};
+  const sandbox = {
+    console,
+    localStorage: {
+      getItem: key => (key in items ? items[key] : null),
+      setItem: (key, value) => { items[key] = String(value); },
+      removeItem: key => { delete items[key]; },
+      clear: () => { for (const key in items) delete items[key]; }
+    },
+    window: {},
+    document: {}
+  };
+  vm.createContext(sandbox);
+  vm.runInContext(fs.readFileSync(storageScript, 'utf8'), sandbox, { filename: storageScript });
+  return sandbox;
+}
+
+/**
+ * Run one fixture case from empty storage
+ * @param {Object} sandbox - Sandbox from loadStorage()
+ * @param {Object} fixtureCase - Case with its sets
+ * @returns {Object} The outcome of every set and the final records without dates
+ */
+function runCase(sandbox, fixtureCase) {
+  // Start from stored empty data; initializeWorkoutData() hands out its shared default object
+  sandbox.localStorage.clear();
+  sandbox.localStorage.setItem('pplWorkoutData', JSON.stringify({ progress: {}, personalRecords: {} }));
+  const outcomes = fixtureCase.sets.map(([exerciseId, weight, reps]) =>
+    sandbox.checkPersonalRecord(exerciseId, weight, reps));
+
+  const records = {};
+  const stored = sandbox.loadWorkoutData().personalRecords || {};
+  for (const exerciseId of Object.keys(stored).sort()) {
+    const { weight, reps, volume } = stored[exerciseId];
+    records[exerciseId] = { weight, reps, volume };
+  }
+  return { outcomes, records };
+}
+
+/**
+ * Serialize records with sorted keys, so key order never causes a mismatch
+ * @param {Object} records - exerciseId -> { weight, reps, volume }
+ * @returns {string} Canonical JSON
+ */
+function canonical(records) {
+  return JSON.stringify(Object.keys(records).sort().map(id =>
+    [id, records[id].weight, records[id].reps, records[id].volume]));
+}
+
+const fixture = JSON.parse(fs.readFileSync(fixtureFile, 'utf8'));
+const sandbox = loadStorage();
+let failures = 0;
+
+for (const fixtureCase of fixture.cases) {
+  const { outcomes, records } = runCase(sandbox, fixtureCase);
+  const problems = [];
+
+  if (JSON.stringify(outcomes) !== JSON.stringify(fixtureCase.expected)) {
+    problems.push(`outcomes ${JSON.stringify(outcomes)}, expected ${JSON.stringify(fixtureCase.expected)}`);
+  }
+  if (canonical(records) !== canonical(fixtureCase.records)) {
+    problems.push(`records ${JSON.stringify(records)}, expected ${JSON.stringify(fixtureCase.records)}`);
+  }
+
+  if (problems.length) {
+    failures++;
+    console.log(`FAIL ${fixtureCase.name}: ${problems.join('; ')}`);
+  }
+}
+
+console.log(`checkPersonalRecord: ${fixture.cases.length - failures} of ${fixture.cases.length} fixture cases match`);
+process.exit(failures ? 1 : 0);
@@ -47,6 +47,8 @@ cp -r /workspaces/exceljson/ppl-workout/assets/css/weight-tracker.min.css ${TEMP
 # Copy JS files
 cp -r /workspaces/exceljson/ppl-workout/assets/js/exercise-inputs.js ${TEMP_DIR}/assets/js/
 cp -r /workspaces/exceljson/ppl-workout/assets/js/exercise-inputs.min.js ${TEMP_DIR}/assets/js/
+cp -r /workspaces/exceljson/ppl-workout/assets/js/compact-program.js ${TEMP_DIR}/assets/js/
+cp -r /workspaces/exceljson/ppl-workout/assets/js/compact-program.min.js ${TEMP_DIR}/assets/js/
 cp -r /workspaces/exceljson/ppl-workout/assets/js/load-all-phases.js ${TEMP_DIR}/assets/js/
 cp -r /workspaces/exceljson/ppl-workout/assets/js/load-all-phases.min.js ${TEMP_DIR}/assets/js/
 cp -r /workspaces/exceljson/ppl-workout/assets/js/network-status.js ${TEMP_DIR}/assets/js/
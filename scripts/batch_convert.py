@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Script to convert many workout program workbooks in one run.
+Each workbook is run through extract_workout_data -> generate_workout_file
+-> write_html in a worker process, and its outputs are written to a
+separate program directory named after the workbook plus a hash of its
+path, so no program overwrites another and a workbook is always written to
+the same directory. Each worker's output is collected and printed with the
+program's name once the workbook is done, so parallel runs do not
+interleave their lines.
+
+Usage:
+    python batch_convert.py "programs/*.xlsx" --workers 4 --output-dir build
+    python batch_convert.py programs/ --output-dir build
+"""
+
+import argparse
+import glob
+import hashlib
+import io
+import os
+import time
+from contextlib import redirect_stderr, redirect_stdout
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from build_metrics import EXERCISES_EMITTED, FILES_WRITTEN, add_arguments, apply_arguments, detail, finish, metrics
+from extract_workout_data import extract_workout_data
+from generate_workout_json import build_exercise_library, generate_workout_file
+from generate_ppl_html import write_html
+from progression import add_derive_arguments, fill_missing_weeks
+
+# Default root directory for the per-program output directories
+DEFAULT_OUTPUT_ROOT = "programs"
+
+# Name of the generated HTML page inside each program directory
+HTML_FILENAME = "ppl-workout-html.html"
+
+# Hex digits of the path hash that tells apart workbooks with the same file name
+PATH_HASH_LENGTH = 8
+
+def find_workbooks(sources):
+    """
+    Resolve directories, glob patterns and file paths to a list of workbooks.
+    
+    Args:
+        sources (list): Directories, glob patterns or .xlsx file paths
+    
+    Returns:
+        list: Sorted, de-duplicated workbook paths
+    """
+    workbooks = set()
+    
+    for source in sources:
+        if os.path.isdir(source):
+            matches = glob.glob(os.path.join(source, "*.xlsx"))
+        else:
+            matches = glob.glob(source)
+        
+        # Skip Excel lock files such as "~$program.xlsx"
+        workbooks.update(path for path in matches
+                         if path.endswith(".xlsx") and not os.path.basename(path).startswith("~$"))
+    
+    return sorted(workbooks)
+
+def program_dir_for(excel_file, output_root):
+    """
+    Return the output directory for a workbook, named after the workbook file
+    plus a hash of its absolute path, e.g. "Program-1a2b3c4d".
+    
+    The name depends only on the workbook's path, so a workbook lands in the
+    same directory in every run, whatever else is converted with it.
+    
+    Args:
+        excel_file (str): Path to the Excel file
+        output_root (str): Directory in which the program directory is created
+    """
+    program_name = os.path.splitext(os.path.basename(excel_file))[0]
+    path_hash = hashlib.sha256(os.path.abspath(excel_file).encode("utf-8")).hexdigest()
+    return os.path.join(output_root, f"{program_name}-{path_hash[:PATH_HASH_LENGTH]}")
+
+def program_dirs(workbooks, output_root):
+    """
+    Return a distinct output directory for every workbook, see program_dir_for().
+    
+    Directories are compared without case, as on case-insensitive file systems.
+    
+    Args:
+        workbooks (list): Paths to the Excel files
+        output_root (str): Directory in which the program directories are created
+    
+    Returns:
+        dict: Workbook path -> program directory
+    
+    Raises:
+        ValueError: If two workbooks would still share a directory
+    """
+    dirs = {workbook: program_dir_for(workbook, output_root) for workbook in workbooks}
+    
+    seen = {}
+    for workbook, program_dir in dirs.items():
+        other = seen.setdefault(program_dir.lower(), workbook)
+        if other != workbook:
+            raise ValueError(f"{workbook} and {other} would both be written to {program_dir}")
+    return dirs
+
+def convert_workbook(excel_file, program_dir, derive_missing_weeks=False):
+    """
+    Run the full Excel -> JSON -> HTML pipeline for one workbook.
+    
+    Args:
+        excel_file (str): Path to the Excel file
+        program_dir (str): Directory for the program's outputs, see program_dirs()
+        derive_missing_weeks (bool): Also write the weeks missing from the
+            workbook, derived by progression.fill_missing_weeks()
+    
+    Returns:
+        dict: Conversion result with the workbook, program directory,
+            count of exercises extracted from the workbook, file count,
+            elapsed seconds, the output it printed and any error
+    """
+    start = time.perf_counter()
+    result = {
+        "workbook": excel_file,
+        "program_dir": program_dir,
+        "exercises": 0,
+        "files": 0,
+        "seconds": 0.0,
+        "log": "",
+        "error": None
+    }
+    
+    # Collect the worker's output; the parent prints it in one piece
+    log = io.StringIO()
+    try:
+        with redirect_stdout(log), redirect_stderr(log):
+            os.makedirs(program_dir, exist_ok=True)
+            
+            # Excel -> source JSON
+            source_file = os.path.join(program_dir, os.path.basename(program_dir) + "_workout_data.json")
+            data = extract_workout_data(excel_file, output_file=source_file)
+            if data is None:
+                raise ValueError("could not extract workout data")
+            
+            # Count the extracted exercises only, not the ones of derived weeks
+            result["exercises"] = sum(len(exercises)
+                                      for phase_data in data["phases"].values()
+                                      for week_data in phase_data["weeks"].values()
+                                      for exercises in week_data.values())
+            if derive_missing_weeks:
+                data, _ = fill_missing_weeks(data)
+            
+            # Source JSON -> per-week app JSON
+            exercise_dir = os.path.join(program_dir, "exercise-data")
+            num_phases = data["program_info"]["phases"]
+            weeks_per_phase = data["program_info"]["weeks_per_phase"]
+            library = build_exercise_library(data)
+            
+            for phase in range(1, num_phases + 1):
+                if f"phase{phase}" not in data["phases"]:
+                    print(f"Skipping phase{phase} - data not found in {excel_file}")
+                    continue
+                for week in range(1, weeks_per_phase + 1):
+                    if generate_workout_file(phase, week, data, output_dir=exercise_dir, library=library):
+                        result["files"] += 1
+            
+            # Source JSON -> HTML page
+            with open(os.path.join(program_dir, HTML_FILENAME), "w", encoding="utf-8") as f:
+                write_html(data, f)
+            result["files"] += 1
+    except Exception as e:
+        result["error"] = str(e)
+    
+    result["log"] = log.getvalue()
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+def batch_convert(workbooks, output_root=DEFAULT_OUTPUT_ROOT, workers=None, derive_missing_weeks=False):
+    """
+    Convert workbooks in parallel using a process pool.
+    
+    Args:
+        workbooks (list): Paths to the Excel files
+        output_root (str): Directory in which the program directories are created
+        workers (int, optional): Number of worker processes. Defaults to the CPU count.
+        derive_missing_weeks (bool): Also write the weeks missing from each workbook
+    
+    Returns:
+        list: Conversion results in the order of workbooks
+    
+    Raises:
+        ValueError: If two workbooks would share a program directory
+    """
+    dirs = program_dirs(workbooks, output_root)
+    results = {}
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(convert_workbook, workbook, dirs[workbook], derive_missing_weeks): workbook
+                   for workbook in workbooks}
+        
+        for future in as_completed(futures):
+            result = future.result()
+            results[futures[future]] = result
+            print_log(result)
+            
+            if result["error"]:
+                print(f"FAILED {result['workbook']}: {result['error']}")
+            else:
+                metrics.count(EXERCISES_EMITTED, result["exercises"])
+                metrics.count(FILES_WRITTEN, result["files"])
+                detail(f"Converted {result['workbook']} -> {result['program_dir']} "
+                       f"({result['exercises']} exercises, {result['seconds']:.2f}s)")
+    
+    return [results[workbook] for workbook in workbooks]
+
+def print_log(result):
+    """Print the output of a worker, each line prefixed with its program directory name."""
+    prefix = f"[{os.path.basename(result['program_dir'])}]"
+    for line in result["log"].splitlines():
+        print(f"{prefix} {line}")
+
+def print_summary(results, elapsed):
+    """Print the aggregate throughput of a batch run."""
+    converted = [result for result in results if not result["error"]]
+    total_exercises = sum(result["exercises"] for result in converted)
+    
+    print(f"\nSummary: {len(converted)} of {len(results)} workbooks converted in {elapsed:.2f}s")
+    if elapsed > 0:
+        print(f"Throughput: {len(converted) / elapsed:.2f} workbooks/s, "
+              f"{total_exercises / elapsed:.1f} exercises/s")
+    
+    for result in results:
+        if result["error"]:
+            print(f"  Failed: {result['workbook']} ({result['error']})")
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert workout program workbooks to app JSON and HTML.")
+    parser.add_argument("sources", nargs="+",
+                        help="Directories, glob patterns or .xlsx files to convert")
+    parser.add_argument("-o", "--output-dir", default=DEFAULT_OUTPUT_ROOT,
+                        help=f"Root directory for the program directories (default: {DEFAULT_OUTPUT_ROOT})")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="Number of worker processes (default: CPU count)")
+    add_derive_arguments(parser)
+    add_arguments(parser)
+    args = parser.parse_args()
+    apply_arguments(args)
+    
+    with metrics.stage("find_workbooks"):
+        workbooks = find_workbooks(args.sources)
+    if not workbooks:
+        print("No workbooks found.")
+        return
+    
+    print(f"Converting {len(workbooks)} workbooks...")
+    start = time.perf_counter()
+    try:
+        # Worker processes are not profiled; their counts come back in the results
+        with metrics.stage("convert_workbooks"):
+            results = batch_convert(workbooks, args.output_dir, args.workers, args.derive_missing_weeks)
+    except ValueError as e:
+        parser.error(str(e))
+    print_summary(results, time.perf_counter() - start)
+    
+    finish(args.metrics)
+
+if __name__ == "__main__":
+    main()
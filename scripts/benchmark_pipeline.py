@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the Excel -> JSON -> HTML build pipeline.
+Synthetic programs are generated at the requested sizes (phases x weeks x
+days x exercises) and each pipeline stage is timed in a fresh process,
+recording wall time, peak RSS and output bytes. Results are written to a
+JSON file that can be compared against a previous run.
+
+Usage:
+    python benchmark_pipeline.py --sizes 3x6x6x6 10x12x6x10 --output bench.json
+    python benchmark_pipeline.py --sizes 20x52x6x12 --compare bench.json
+
+A week has at most six days: the extractor and the HTML generator only
+know the day keys push1, pull1, legs1, push2, pull2 and legs2, so larger
+weeks would be folded into other days or left out of the page.
+"""
+
+import argparse
+import contextlib
+import multiprocessing
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from build_metrics import add_arguments, apply_arguments, finish, metrics
+from json_io import PRETTY, load_json, write_json
+
+# Default program sizes, as phases x weeks x days x exercises
+DEFAULT_SIZES = ["3x6x6x6", "6x12x6x10"]
+
+# Default results file
+RESULTS_FILE = "benchmark-results.json"
+
+# Pipeline stages, in run order
+STAGES = ["extract_workout_data", "generate_workout_file", "update_existing_files_with_links", "generate_html"]
+
+# Source day keys of a synthetic week, in the order the HTML page lists them.
+# These are the only day keys the extractor and the generators know.
+DAY_KEYS = ["push1", "pull1", "legs1", "push2", "pull2", "legs2"]
+
+# Workbook day headers of DAY_KEYS, as matched by extract_workout_data.DAY_PATTERNS
+DAY_NAMES = {"push1": "Push #1", "pull1": "Pull #1", "legs1": "Legs #1",
+             "push2": "Push #2", "pull2": "Pull #2", "legs2": "Legs #2"}
+
+# Header row of a week block in the workbook
+WEEK_HEADER = ["Exercise", "Warm-up Sets", "Working Sets", "Reps", "Load", "RPE", "Rest",
+               "Substitution Option 1", "Substitution Option 2", "Notes"]
+
+def parse_size(text):
+    """
+    Parse a size such as "3x6x6x6" into a dict.
+    
+    Returns:
+        dict: phases, weeks, days and exercises
+    """
+    try:
+        parts = [int(part) for part in text.lower().split("x")]
+    except ValueError:
+        parts = []
+    if len(parts) != 4 or min(parts) < 1:
+        raise argparse.ArgumentTypeError(f"Invalid size '{text}', expected PHASESxWEEKSxDAYSxEXERCISES")
+    if parts[2] > len(DAY_KEYS):
+        raise argparse.ArgumentTypeError(f"Invalid size '{text}': at most {len(DAY_KEYS)} days per week, "
+                                         f"the pipeline only knows the days {', '.join(DAY_KEYS)}")
+    return dict(zip(["phases", "weeks", "days", "exercises"], parts))
+
+def size_label(size):
+    """Return the PHASESxWEEKSxDAYSxEXERCISES label of a size."""
+    return f"{size['phases']}x{size['weeks']}x{size['days']}x{size['exercises']}"
+
+def day_key(day_index):
+    """Return the source day key of a day of the week (0-5)."""
+    return DAY_KEYS[day_index]
+
+def day_name(day_index):
+    """Return the workbook day header of a day, matching day_key()."""
+    return DAY_NAMES[day_key(day_index)]
+
+def synthetic_exercise(phase, week, day_index, index):
+    """Return the source fields of one synthetic exercise."""
+    number = day_index * 100 + index
+    return {
+        "name": f"Exercise {number}",
+        "warmup_sets": str(1 + index % 3),
+        "working_sets": str(1 + (week + index) % 3),
+        "reps": f"{4 + index % 4}-{6 + index % 4}",
+        "load": "",
+        "rpe": "8-9" if index % 2 else "10",
+        "rest": f"~{1 + index % 3}-{2 + index % 3} min",
+        "substitution1": f"Substitute A {number}",
+        "substitution2": f"Substitute B {number}" if index % 3 else "",
+        "notes": f"Phase {phase} cue for exercise {number}: control the eccentric and keep a stable torso"
+    }
+
+def synthesize_source_data(size):
+    """
+    Build a source workout data dict (the _workout_data.json schema) of the given size.
+    
+    Returns:
+        dict: Workout data
+    """
+    data = {
+        "program_info": {
+            "name": "Synthetic Benchmark Program",
+            "phases": size["phases"],
+            "weeks_per_phase": size["weeks"],
+            "days_per_week": size["days"]
+        },
+        "phases": {}
+    }
+    
+    for phase in range(1, size["phases"] + 1):
+        weeks = {}
+        for week in range(1, size["weeks"] + 1):
+            weeks[f"week{week}"] = {
+                day_key(day_index): [synthetic_exercise(phase, week, day_index, index)
+                                     for index in range(size["exercises"])]
+                for day_index in range(size["days"])
+            }
+        data["phases"][f"phase{phase}"] = {"description": f"Phase {phase} - Synthetic", "weeks": weeks}
+    
+    return data
+
+def write_synthetic_workbook(path, size):
+    """
+    Write an .xlsx workbook laid out like the program spreadsheet.
+    
+    Each phase is a sheet whose first header cell is the phase description,
+    followed by week blocks with one day header per day.
+    """
+    from openpyxl import Workbook
+    
+    workbook = Workbook(write_only=True)
+    
+    for phase in range(1, size["phases"] + 1):
+        sheet = workbook.create_sheet(f"Phase {phase}")
+        sheet.append([f"Phase {phase} - Synthetic"] + [None] * 10)
+        
+        for week in range(1, size["weeks"] + 1):
+            sheet.append([f"Week {week}"] + WEEK_HEADER)
+            for day_index in range(size["days"]):
+                for index in range(size["exercises"]):
+                    exercise = synthetic_exercise(phase, week, day_index, index)
+                    sheet.append([day_name(day_index) if index == 0 else None, exercise["name"],
+                                  exercise["warmup_sets"], exercise["working_sets"], exercise["reps"],
+                                  None, exercise["rpe"], exercise["rest"], exercise["substitution1"],
+                                  exercise["substitution2"] or None, exercise["notes"]])
+    
+    workbook.save(path)
+
+def directory_bytes(path):
+    """Return the total size of the files below path."""
+    total = 0
+    for root, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return total
+
+def run_stage(stage, size, work_dir):
+    """
+    Run one pipeline stage on synthetic input and measure it.
+    
+    Runs in a fresh worker process, so peak RSS covers only this stage,
+    the interpreter, imports and the synthetic input. Input preparation
+    is not timed.
+    
+    Returns:
+        dict: seconds, peak_rss_kb, output_bytes and exercises
+    """
+    from extract_workout_data import extract_workout_data
+    from generate_workout_json import build_exercise_library, generate_workout_file, update_existing_files_with_links
+    from generate_ppl_html import write_html
+    
+    data = synthesize_source_data(size)
+    exercises = size["phases"] * size["weeks"] * size["days"] * size["exercises"]
+    exercise_dir = os.path.join(work_dir, "exercise-data")
+    
+    # Prepare the inputs of the stage
+    if stage == "extract_workout_data":
+        workbook = os.path.join(work_dir, "program.xlsx")
+        output = os.path.join(work_dir, "program_workout_data.json")
+        write_synthetic_workbook(workbook, size)
+    elif stage == "update_existing_files_with_links":
+        # Blank the links so every file has to be rewritten
+        library = build_exercise_library(data)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            for phase in range(1, size["phases"] + 1):
+                for week in range(1, size["weeks"] + 1):
+                    generate_workout_file(phase, week, data, output_dir=exercise_dir, library=library)
+        for filename in os.listdir(exercise_dir):
+            path = os.path.join(exercise_dir, filename)
+            doc = load_json(path)
+            for day in doc["days"].values():
+                for exercise in day["exercises"]:
+                    exercise["link"] = ""
+            write_json(path, doc)
+    
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        
+        if stage == "extract_workout_data":
+            extract_workout_data(workbook, output_file=output)
+        elif stage == "generate_workout_file":
+            library = build_exercise_library(data)
+            for phase in range(1, size["phases"] + 1):
+                for week in range(1, size["weeks"] + 1):
+                    generate_workout_file(phase, week, data, output_dir=exercise_dir, library=library)
+        elif stage == "update_existing_files_with_links":
+            update_existing_files_with_links(output_dir=exercise_dir)
+        elif stage == "generate_html":
+            output = os.path.join(work_dir, "program.html")
+            with open(output, "w") as f:
+                write_html(data, f)
+        
+        seconds = time.perf_counter() - start
+    
+    if stage == "extract_workout_data":
+        output_bytes = os.path.getsize(output)
+    elif stage == "generate_html":
+        output_bytes = os.path.getsize(output)
+    else:
+        output_bytes = directory_bytes(exercise_dir)
+    
+    # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak_rss //= 1024
+    
+    return {
+        "seconds": seconds,
+        "peak_rss_kb": peak_rss,
+        "output_bytes": output_bytes,
+        "exercises": exercises
+    }
+
+def benchmark(sizes, stages=STAGES, repeat=1):
+    """
+    Time every stage at every size.
+    
+    Each measurement runs in a new spawned process. With repeat > 1 the
+    fastest run is kept, together with its peak RSS.
+    
+    Returns:
+        list: One result dict per size and stage
+    """
+    results = []
+    context = multiprocessing.get_context("spawn")
+    
+    for size in sizes:
+        for stage in stages:
+            best = None
+            with metrics.stage(stage):
+                for _ in range(repeat):
+                    work_dir = tempfile.mkdtemp(prefix="ppl-bench-")
+                    try:
+                        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                            result = executor.submit(run_stage, stage, size, work_dir).result()
+                    finally:
+                        shutil.rmtree(work_dir, ignore_errors=True)
+                    if best is None or result["seconds"] < best["seconds"]:
+                        best = result
+            
+            best = {"size": size_label(size), "stage": stage, **best}
+            results.append(best)
+            print(f"{best['size']:>14}  {stage:<34} {best['seconds'] * 1000:10.1f} ms "
+                  f"{best['peak_rss_kb'] / 1024:8.1f} MB {best['output_bytes'] / 1024:10.1f} KB")
+    
+    return results
+
+def compare_results(results, previous):
+    """Print the change in wall time and peak RSS against a previous results file."""
+    baseline = {(run["size"], run["stage"]): run for run in previous.get("runs", [])}
+    
+    print("\nComparison with previous run:")
+    for run in results:
+        before = baseline.get((run["size"], run["stage"]))
+        if not before or not before["seconds"]:
+            continue
+        print(f"{run['size']:>14}  {run['stage']:<34} time x{run['seconds'] / before['seconds']:.2f}  "
+              f"rss x{run['peak_rss_kb'] / max(before['peak_rss_kb'], 1):.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the workout build pipeline on synthetic programs.")
+    parser.add_argument("--sizes", nargs="+", type=parse_size, default=[parse_size(s) for s in DEFAULT_SIZES],
+                        help="Program sizes as PHASESxWEEKSxDAYSxEXERCISES (default: %(default)s)")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES,
+                        help="Stages to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="Runs per stage and size, the fastest is kept (default: 1)")
+    parser.add_argument("--output", default=RESULTS_FILE,
+                        help=f"Results file (default: {RESULTS_FILE})")
+    parser.add_argument("--compare", metavar="FILE",
+                        help="Previous results file to compare against")
+    add_arguments(parser)
+    args = parser.parse_args()
+    apply_arguments(args)
+    
+    print(f"{'size':>14}  {'stage':<34} {'wall':>13} {'peak RSS':>11} {'output':>13}")
+    results = benchmark(args.sizes, args.stages, args.repeat)
+    
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": results
+    }
+    write_json(args.output, report, PRETTY)
+    print(f"\nResults saved to {args.output}")
+    
+    if args.compare:
+        compare_results(results, load_json(args.compare))
+    
+    finish(args.metrics)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+On-disk build cache for the Excel -> JSON -> HTML pipeline.
+Each cache entry records the content hash of a build input (a workbook
+sheet, a week slice of the source JSON, ...) together with the hashes of
+the files generated from it, so unchanged inputs can be skipped and
+changed or missing outputs are always regenerated.
+"""
+
+import hashlib
+import json
+import os
+import posixpath
+import re
+import zipfile
+
+from json_io import backend_name, get_mode
+
+# Default location of the cache file, relative to the working directory
+CACHE_FILE = ".build-cache.json"
+
+# Bump to invalidate every cache entry after a change in the cache format
+CACHE_FORMAT = 1
+
+# Scripts whose source is part of the generator version
+GENERATOR_SCRIPTS = [
+    "build_cache.py",
+    "build_metrics.py",
+    "extract_workout_data.py",
+    "generate_workout_json.py",
+    "generate_ppl_html.py",
+    "compact_program.py",
+    "progression.py",
+    "precompress.py",
+    "precache_manifest.py",
+    "json_io.py",
+    "prescriptions.py",
+    "workout_model.py"
+]
+
+# Workbook parts that affect how every sheet is parsed
+SHARED_WORKBOOK_PARTS = ["xl/sharedStrings.xml", "xl/styles.xml"]
+
+_generator_version = None
+
+def hash_bytes(*parts):
+    """Return the SHA-256 hex digest of the concatenated byte strings."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part)
+    return digest.hexdigest()
+
+def hash_json(data):
+    """Return a content hash of a JSON-serializable value."""
+    return hash_bytes(json.dumps(data, sort_keys=True).encode("utf-8"))
+
+def hash_file(path):
+    """Return the content hash of a file, or None if it does not exist."""
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        return hash_bytes(f.read())
+
+def generator_version():
+    """
+    Return a hash of the generator scripts.
+    
+    Any edit to the pipeline code changes the version, which invalidates
+    every entry built with the previous code.
+    """
+    global _generator_version
+    
+    if _generator_version is None:
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        # The JSON output mode changes every generated file, like a code change, and
+        # the JSON backend can change how floats are written
+        parts = [str(CACHE_FORMAT).encode("utf-8"), get_mode().encode("utf-8"), backend_name().encode("utf-8")]
+        for script in GENERATOR_SCRIPTS:
+            with open(os.path.join(script_dir, script), "rb") as f:
+                parts.append(f.read())
+        _generator_version = hash_bytes(*parts)
+    
+    return _generator_version
+
+def workbook_sheet_hashes(excel_file):
+    """
+    Hash each sheet of an .xlsx workbook without parsing it.
+    
+    The hash of a sheet covers its worksheet XML plus the parts shared by
+    all sheets (shared strings and styles), so editing any text in the
+    workbook conservatively invalidates every sheet.
+    
+    Args:
+        excel_file (str): Path to the Excel file
+    
+    Returns:
+        dict: Sheet name -> content hash, in workbook order
+    """
+    with zipfile.ZipFile(excel_file) as z:
+        names = set(z.namelist())
+        workbook_xml = z.read("xl/workbook.xml").decode("utf-8")
+        rels_xml = z.read("xl/_rels/workbook.xml.rels").decode("utf-8")
+        shared = [z.read(part) for part in SHARED_WORKBOOK_PARTS if part in names]
+        
+        # Map relationship ids to worksheet paths
+        targets = {}
+        for rel in re.finditer(r'<Relationship\b[^>]*>', rels_xml):
+            rel_id = re.search(r'\bId="([^"]+)"', rel.group(0))
+            target = re.search(r'\bTarget="([^"]+)"', rel.group(0))
+            if rel_id and target:
+                path = target.group(1)
+                path = path.lstrip("/") if path.startswith("/") else posixpath.normpath(posixpath.join("xl", path))
+                targets[rel_id.group(1)] = path
+        
+        hashes = {}
+        for sheet in re.finditer(r'<sheet\b[^>]*>', workbook_xml):
+            name = re.search(r'\bname="([^"]+)"', sheet.group(0))
+            rel_id = re.search(r'\br:id="([^"]+)"', sheet.group(0))
+            if not name or not rel_id or targets.get(rel_id.group(1)) not in names:
+                continue
+            sheet_name = unescape_xml(name.group(1))
+            hashes[sheet_name] = hash_bytes(z.read(targets[rel_id.group(1)]), *shared)
+    
+    return hashes
+
+def unescape_xml(text):
+    """Unescape the XML entities that can appear in a sheet name."""
+    return (text.replace("&lt;", "<").replace("&gt;", ">")
+            .replace("&quot;", '"').replace("&apos;", "'").replace("&amp;", "&"))
+
+def load_cache(cache_file=CACHE_FILE):
+    """
+    Load the build cache, discarding it if it was written by other generator code.
+    
+    Returns:
+        dict: Cache with "version" and "entries" keys
+    """
+    version = generator_version()
+    
+    try:
+        with open(cache_file, "r") as f:
+            cache = json.load(f)
+        if cache.get("version") == version and isinstance(cache.get("entries"), dict):
+            return cache
+    except (OSError, ValueError):
+        pass
+    
+    return {"version": version, "entries": {}}
+
+def save_cache(cache, cache_file=CACHE_FILE):
+    """Write the build cache to disk."""
+    tmp_file = cache_file + ".tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(cache, f)
+    os.replace(tmp_file, cache_file)
+
+def get_fresh_entry(cache, key, digest):
+    """
+    Return the cache entry for key if it is still valid.
+    
+    An entry is valid when its input hash equals digest and every output
+    it recorded still exists with the recorded content.
+    
+    Returns:
+        dict: The cache entry, or None if the outputs must be rebuilt
+    """
+    entry = cache["entries"].get(key)
+    if not entry or entry.get("hash") != digest:
+        return None
+    
+    for path, output_hash in entry.get("outputs", {}).items():
+        if hash_file(path) != output_hash:
+            return None
+    
+    return entry
+
+def record_entry(cache, key, digest, outputs=(), data=None):
+    """
+    Record that the outputs for key were built from an input with the given hash.
+    
+    Args:
+        cache (dict): Build cache
+        key (str): Cache key of the input
+        digest (str): Content hash of the input
+        outputs (iterable): Paths of the files generated from the input
+        data: Optional JSON-serializable value to keep with the entry
+    """
+    entry = {
+        "hash": digest,
+        "outputs": {path: hash_file(path) for path in outputs}
+    }
+    if data is not None:
+        entry["data"] = data
+    cache["entries"][key] = entry
+
+def remove_entry(cache, key):
+    """
+    Drop a cache entry and delete the outputs it recorded.
+    
+    Returns:
+        list: Paths of the deleted output files
+    """
+    entry = cache["entries"].pop(key, None)
+    removed = []
+    
+    if entry:
+        for path in entry.get("outputs", {}):
+            if os.path.exists(path):
+                os.remove(path)
+                removed.append(path)
+    
+    return removed
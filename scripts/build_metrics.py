@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Stage timers, counters and a JSON metrics report shared by the build scripts.
+
+Each script times its stages with metrics.stage(), counts what it processed
+with metrics.count() and prints per-row progress with detail(). Quiet mode
+drops the detail() lines, so no console I/O happens per row; summaries are
+still printed.
+
+Quiet mode and the metrics report are enabled with --quiet / --metrics on
+the command line, or with the PPL_QUIET and PPL_METRICS environment
+variables, which also reach scripts started by other scripts.
+
+With --profile the run is also profiled, see profiling.py.
+
+Usage:
+    python extract_workout_data.py --quiet --metrics extract-metrics.json
+    PPL_QUIET=1 PPL_METRICS=metrics.json python generate_workout_json.py
+"""
+
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from json_io import write_json
+
+# Environment variables that enable quiet mode and the metrics report
+QUIET_VARIABLE = "PPL_QUIET"
+METRICS_VARIABLE = "PPL_METRICS"
+
+# Environment variables that enable profiling, see profiling.py
+PROFILE_VARIABLE = "PPL_PROFILE"
+PROFILE_STAGE_VARIABLE = "PPL_PROFILE_STAGE"
+
+# Counter names used by the build scripts
+ROWS_SCANNED = "rows_scanned"
+EXERCISES_EMITTED = "exercises_emitted"
+FILES_WRITTEN = "files_written"
+BYTES_WRITTEN = "bytes_written"
+
+_quiet = None
+
+def is_quiet():
+    """Return whether per-row console output is suppressed."""
+    global _quiet
+    if _quiet is None:
+        _quiet = os.environ.get(QUIET_VARIABLE, "").lower() not in ("", "0", "false", "no")
+    return _quiet
+
+def set_quiet(quiet=True):
+    """
+    Enable or disable quiet mode for every later detail() call.
+    
+    The setting is also exported to the environment, so worker processes
+    and child scripts inherit it.
+    """
+    global _quiet
+    _quiet = bool(quiet)
+    os.environ[QUIET_VARIABLE] = "1" if _quiet else "0"
+
+def detail(*args, **kwargs):
+    """Print a per-row progress line, unless quiet mode is on."""
+    if not is_quiet():
+        print(*args, **kwargs)
+
+class Metrics:
+    """
+    Named stage timers and counters of one script run.
+    
+    Stages can be entered several times (their time and call count add up)
+    and can be nested; a nested stage is reported under "outer/inner".
+    When profiler is set, it is told about every stage that starts and ends.
+    """
+    
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.counters = {}
+        self.profiler = None
+        self._lock = threading.Lock()
+        self._active = threading.local()
+    
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block under a stage name."""
+        stack = getattr(self._active, "stack", None)
+        if stack is None:
+            stack = self._active.stack = []
+        stack.append(name)
+        path = "/".join(stack)
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.enter_stage(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if profiler is not None:
+                profiler.exit_stage(name)
+            stack.pop()
+            with self._lock:
+                entry = self.stages.setdefault(path, {"seconds": 0.0, "calls": 0})
+                entry["seconds"] += elapsed
+                entry["calls"] += 1
+    
+    def count(self, name, amount=1):
+        """Add amount to a counter."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def report(self, script=None):
+        """
+        Build the metrics report.
+        
+        Returns:
+            dict: "script", "total_seconds", "stages" (name -> seconds and
+                calls, in the order they were first entered) and "counters"
+        """
+        return {
+            "script": script or os.path.basename(sys.argv[0]),
+            "total_seconds": time.perf_counter() - self.started,
+            "stages": {name: dict(entry) for name, entry in self.stages.items()},
+            "counters": dict(sorted(self.counters.items()))
+        }
+    
+    def print_report(self, script=None):
+        """Print the stage timings and counters."""
+        report = self.report(script)
+        print(f"\nTimings ({report['total_seconds'] * 1000:.1f} ms total):")
+        for name, entry in report["stages"].items():
+            calls = f" ({entry['calls']} calls)" if entry["calls"] > 1 else ""
+            print(f"  {name}: {entry['seconds'] * 1000:.1f} ms{calls}")
+        if report["counters"]:
+            print("Counters:")
+            for name, value in report["counters"].items():
+                print(f"  {name}: {value}")
+
+# Metrics of the running script
+metrics = Metrics()
+
+def add_arguments(parser):
+    """Add the --quiet, --metrics and --profile options to an argument parser."""
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help=f"Suppress per-row progress output (or set {QUIET_VARIABLE}=1)")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help=f"Write a JSON metrics report to this file (or set {METRICS_VARIABLE})")
+    parser.add_argument("--profile", metavar="DIR", default=os.environ.get(PROFILE_VARIABLE),
+                        help=f"Profile the run and write pstats, collapsed stacks and a hot function "
+                             f"summary to DIR (or set {PROFILE_VARIABLE})")
+    parser.add_argument("--profile-stage", metavar="STAGE", default=os.environ.get(PROFILE_STAGE_VARIABLE),
+                        help=f"Only profile this stage, e.g. parse_sheet, generate_weeks or render_html "
+                             f"(or set {PROFILE_STAGE_VARIABLE})")
+
+def apply_arguments(args):
+    """Apply the options added by add_arguments(); starts the profiler if requested."""
+    if args.quiet:
+        set_quiet(True)
+    if args.profile:
+        # Imported here so runs without profiling never load cProfile
+        from profiling import Profiler
+        metrics.profiler = Profiler(args.profile, args.profile_stage)
+        metrics.profiler.start()
+
+def finish(metrics_file=None, script=None):
+    """
+    Print the timings of the run, write the metrics report and, when
+    profiling, the profile files.
+    
+    Args:
+        metrics_file (str, optional): Path of the JSON report. Defaults to
+            the PPL_METRICS environment variable; nothing is written if neither is set.
+        script (str, optional): Script name stored in the report
+    
+    Returns:
+        dict: The metrics report
+    """
+    metrics_file = metrics_file or os.environ.get(METRICS_VARIABLE)
+    report = metrics.report(script)
+    metrics.print_report(script)
+    if metrics_file:
+        write_json(metrics_file, report)
+        print(f"Metrics saved to {metrics_file}")
+    if metrics.profiler is not None:
+        metrics.profiler.write(script or sys.argv[0])
+        metrics.profiler = None
+    return report
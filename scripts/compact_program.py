@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Compact, deduplicated program format for the phaseN-weekM.json files.
+All strings are interned once in a string table, each distinct exercise
+(id, name, link, notes and substitutions) is stored once, with the link left
+out when it is the generated YouTube search for the name, each distinct
+[min, max] range and targets tuple is stored once, and each distinct
+prescription row is stored once. Days list the rows they use.
+The reader expands the compact file back into the exact week documents;
+assets/js/compact-program.js is the app-side reader.
+
+Usage:
+    python compact_program.py ppl-workout/dev/exercise-data
+"""
+
+import argparse
+import json
+import os
+import re
+import urllib.parse
+
+from json_io import MINIFIED, load_json, write_json
+from prescriptions import TARGET_FIELDS
+
+# Identifies the compact format and its version
+FORMAT_NAME = "ppl-compact"
+FORMAT_VERSION = 4
+
+# Versions unpack_program() can read; the compact file is always rewritten
+# from the week files, so older layouts are regenerated instead of read
+READABLE_VERSIONS = [4]
+
+# File name of the compact program, written next to the week files
+COMPACT_FILE = "program.compact.json"
+
+# Week files that make up a program
+WEEK_FILE_PATTERN = re.compile(r'^phase(\d+)-week(\d+)\.json$')
+
+# Top-level keys of a week document, in file order
+WEEK_KEYS = ["phase", "week", "description", "deload", "derived", "base_week", "days"]
+
+# Week keys with plain JSON values, stored as they are
+WEEK_VALUE_KEYS = ["phase", "week", "deload", "derived", "base_week"]
+
+# Keys of an exercise in a week document, in file order
+EXERCISE_KEYS = ["id", "name", "warmup_sets", "working_sets", "reps", "rpe", "rest", "link", "notes", "substitutions"]
+
+# Optional last key of an exercise with the numeric targets (see prescriptions.py)
+TARGETS_KEY = "targets"
+
+# Exercise keys that change from week to week, stored in the prescription rows
+ENTRY_FIELDS = ["warmup_sets", "working_sets", "reps", "rpe", "rest"]
+
+# Exercise keys shared by every occurrence of an exercise definition
+DEFINITION_FIELDS = ["id", "name", "link", "notes"]
+
+# Text around the quoted exercise name in a generated link (see
+# generate_exercise_link() in generate_workout_json.py); other links are stored
+LINK_TEMPLATE = ["https://www.youtube.com/results?search_query=how%20to%20do%20", "%20exercise%20form"]
+
+def template_link(name):
+    """Return the link LINK_TEMPLATE generates for an exercise name."""
+    return LINK_TEMPLATE[0] + urllib.parse.quote(name) + LINK_TEMPLATE[1]
+
+def load_week_files(directory):
+    """
+    Load the phaseN-weekM.json files of a directory.
+    
+    Args:
+        directory (str): Directory containing the week files
+    
+    Returns:
+        dict: File stem (e.g. "phase1-week1") -> week document, ordered by phase and week
+    """
+    matches = []
+    for filename in os.listdir(directory):
+        match = WEEK_FILE_PATTERN.match(filename)
+        if match:
+            matches.append((int(match.group(1)), int(match.group(2)), filename))
+    
+    weeks = {}
+    for _, _, filename in sorted(matches):
+        weeks[os.path.splitext(filename)[0]] = load_json(os.path.join(directory, filename))
+    
+    return weeks
+
+def pack_program(weeks):
+    """
+    Convert week documents to the compact format.
+    
+    Args:
+        weeks (dict): File stem -> week document, as returned by load_week_files()
+    
+    Returns:
+        dict: Compact program
+    
+    Raises:
+        ValueError: If a document has keys the compact format cannot represent
+    """
+    strings = []
+    string_index = {}
+    
+    def intern(value):
+        if value not in string_index:
+            string_index[value] = len(strings)
+            strings.append(value)
+        return string_index[value]
+    
+    # Each table stores a distinct value once; the index maps it to its position
+    tables = {"exercises": [], "ranges": [], "targets": [], "rows": []}
+    indexes = {name: {} for name in tables}
+    
+    def add(table, value):
+        key = json.dumps(value)
+        if key not in indexes[table]:
+            indexes[table][key] = len(tables[table])
+            tables[table].append(value)
+        return indexes[table][key]
+    
+    def pack_targets(targets):
+        if list(targets) != list(TARGET_FIELDS):
+            raise ValueError(f"unsupported target keys {list(targets)}")
+        packed = []
+        for value in targets.values():
+            if value is not None and list(value) != ["min", "max"]:
+                raise ValueError(f"unsupported target value {value}")
+            packed.append(add("ranges", [value["min"], value["max"]]) if value is not None else None)
+        return add("targets", packed)
+    
+    packed_weeks = []
+    
+    for name, doc in weeks.items():
+        if list(doc) != [key for key in WEEK_KEYS if key in doc]:
+            raise ValueError(f"{name}: unsupported week keys {list(doc)}")
+        
+        packed = {"name": name}
+        for key in WEEK_VALUE_KEYS:
+            if key in doc:
+                packed[key] = doc[key]
+        if "description" in doc:
+            packed["description"] = intern(doc["description"])
+        
+        # Each day is [key, title, [row, ...]]
+        days = []
+        for day_key, day in doc.get("days", {}).items():
+            if list(day) != ["title", "exercises"]:
+                raise ValueError(f"{name}/{day_key}: unsupported day keys {list(day)}")
+            
+            rows = []
+            for exercise in day["exercises"]:
+                keys = list(exercise)
+                if keys != EXERCISE_KEYS and keys != EXERCISE_KEYS + [TARGETS_KEY]:
+                    raise ValueError(f"{name}/{day_key}: unsupported exercise keys {list(exercise)}")
+                
+                # A null link is the generated search link for the name
+                link = exercise["link"]
+                definition = [
+                    intern(exercise["id"]),
+                    intern(exercise["name"]),
+                    intern(link) if link != template_link(exercise["name"]) else None,
+                    intern(exercise["notes"]),
+                    [intern(sub) for sub in exercise["substitutions"]]
+                ]
+                
+                # A row is [exercise, warmup_sets, working_sets, reps, rpe, rest, targets or null]
+                row = [add("exercises", definition)]
+                row.extend(intern(exercise[field]) for field in ENTRY_FIELDS)
+                try:
+                    row.append(pack_targets(exercise[TARGETS_KEY]) if TARGETS_KEY in exercise else None)
+                except ValueError as e:
+                    raise ValueError(f"{name}/{day_key}: {e}") from None
+                rows.append(add("rows", row))
+                
+            days.append([intern(day_key), intern(day["title"]), rows])
+        
+        if "days" in doc:
+            packed["days"] = days
+        packed_weeks.append(packed)
+    
+    return {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "linkTemplate": LINK_TEMPLATE,
+        "targetFields": list(TARGET_FIELDS),
+        "strings": strings,
+        **tables,
+        "weeks": packed_weeks
+    }
+
+def unpack_program(compact):
+    """
+    Expand a compact program back into week documents.
+    
+    Args:
+        compact (dict): Compact program as returned by pack_program()
+    
+    Returns:
+        dict: File stem -> week document in the phaseN-weekM.json schema
+    
+    Raises:
+        ValueError: If the data is not a supported compact program
+    """
+    if compact.get("format") != FORMAT_NAME or compact.get("version") not in READABLE_VERSIONS:
+        raise ValueError(f"Unsupported compact format: {compact.get('format')} v{compact.get('version')}")
+    
+    strings = compact["strings"]
+    prefix, suffix = compact["linkTemplate"]
+    target_fields = compact["targetFields"]
+    ranges = compact["ranges"]
+    targets = compact["targets"]
+    definitions = compact["exercises"]
+    rows = compact["rows"]
+    weeks = {}
+    
+    def expand_row(row):
+        exercise_id, name, link, notes, substitutions = definitions[row[0]]
+        name = strings[name]
+        exercise = {"id": strings[exercise_id], "name": name}
+        for field, value in zip(ENTRY_FIELDS, row[1:6]):
+            exercise[field] = strings[value]
+        exercise["link"] = strings[link] if link is not None else prefix + urllib.parse.quote(name) + suffix
+        exercise["notes"] = strings[notes]
+        exercise["substitutions"] = [strings[sub] for sub in substitutions]
+        if row[6] is not None:
+            exercise[TARGETS_KEY] = {
+                field: {"min": ranges[value][0], "max": ranges[value][1]} if value is not None else None
+                for field, value in zip(target_fields, targets[row[6]])
+            }
+        return exercise
+    
+    for packed in compact["weeks"]:
+        doc = {}
+        for key in WEEK_KEYS[:-1]:
+            if key == "description" and key in packed:
+                doc[key] = strings[packed[key]]
+            elif key in packed:
+                doc[key] = packed[key]
+        
+        if "days" in packed:
+            doc["days"] = {}
+            for day_key, title, day_rows in packed["days"]:
+                exercises = [expand_row(rows[row]) for row in day_rows]
+                doc["days"][strings[day_key]] = {"title": strings[title], "exercises": exercises}
+        
+        weeks[packed["name"]] = doc
+    
+    return weeks
+
+def validate_compact(compact, weeks):
+    """
+    Check that a compact program expands to exactly the given week documents.
+    
+    Args:
+        compact (dict): Compact program
+        weeks (dict): File stem -> expected week document
+    
+    Returns:
+        list: Problems found, empty if the round trip is exact
+    """
+    try:
+        unpacked = unpack_program(compact)
+    except (KeyError, IndexError, TypeError, ValueError) as e:
+        return [f"Could not read compact program: {e}"]
+    
+    problems = []
+    for name in weeks.keys() - unpacked.keys():
+        problems.append(f"{name}: missing from compact program")
+    for name in unpacked.keys() - weeks.keys():
+        problems.append(f"{name}: not in the week files")
+    
+    # Compare serialized documents so key order differences are caught too
+    for name in weeks.keys() & unpacked.keys():
+        if json.dumps(weeks[name]) != json.dumps(unpacked[name]):
+            problems.append(f"{name}: round trip does not match")
+    
+    return sorted(problems)
+
+def write_compact(weeks, output_file):
+    """
+    Pack week documents, verify the round trip and write the compact file.
+    
+    Args:
+        weeks (dict): File stem -> week document
+        output_file (str): Path of the compact file
+    
+    Returns:
+        int: Size of the compact file in bytes
+    
+    Raises:
+        ValueError: If the compact program does not round-trip
+    """
+    compact = pack_program(weeks)
+    problems = validate_compact(compact, weeks)
+    if problems:
+        raise ValueError("Compact program does not round-trip: " + "; ".join(problems))
+    
+    write_json(output_file, compact, MINIFIED)
+    
+    return os.path.getsize(output_file)
+
+def main():
+    parser = argparse.ArgumentParser(description="Write or check the compact program file for a directory of week files.")
+    parser.add_argument("directory", help="Directory containing the phaseN-weekM.json files")
+    parser.add_argument("--check", action="store_true",
+                        help=f"Validate the existing {COMPACT_FILE} instead of writing it")
+    args = parser.parse_args()
+    
+    weeks = load_week_files(args.directory)
+    output_file = os.path.join(args.directory, COMPACT_FILE)
+    
+    if args.check:
+        problems = validate_compact(load_json(output_file), weeks)
+        for problem in problems:
+            print(f"  {problem}")
+        print(f"{output_file}: {'OK' if not problems else f'{len(problems)} problems'}")
+        return
+    
+    source_bytes = sum(os.path.getsize(os.path.join(args.directory, f"{name}.json")) for name in weeks)
+    compact_bytes = write_compact(weeks, output_file)
+    print(f"Wrote {output_file}: {compact_bytes} bytes for {len(weeks)} week files ({source_bytes} bytes)")
+
+if __name__ == "__main__":
+    main()
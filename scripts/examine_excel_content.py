@@ -1,10 +1,107 @@
 #!/usr/bin/env python3
 
+import argparse
 import pandas as pd
+import numpy as np
 import json
 import os
 import re
 
+from build_metrics import ROWS_SCANNED, add_arguments, apply_arguments, detail, finish, metrics
+
+# Patterns that indicate workout days and weeks
+DAY_PATTERNS = [
+    re.compile(r'push\s*day', re.IGNORECASE),
+    re.compile(r'pull\s*day', re.IGNORECASE),
+    re.compile(r'legs?\s*day', re.IGNORECASE),
+    re.compile(r'week\s*\d+', re.IGNORECASE)
+]
+
+# Patterns for exercise-related terms
+EXERCISE_PATTERNS = [
+    re.compile(r'bench\s*press', re.IGNORECASE),
+    re.compile(r'squat', re.IGNORECASE),
+    re.compile(r'deadlift', re.IGNORECASE),
+    re.compile(r'curl', re.IGNORECASE),
+    re.compile(r'press', re.IGNORECASE)
+]
+
+# Numeric patterns that might indicate sets/reps; a cell counts once if any of them match
+SET_REP_PATTERNS = [
+    re.compile(r'^\d+$'),  # Just a number
+    re.compile(r'^\d+[-x]\d+$'),  # Like "3-5" or "3x5"
+    re.compile(r'^\d+\s*sets?', re.IGNORECASE),  # Like "3 sets"
+    re.compile(r'^\d+\s*reps?', re.IGNORECASE)   # Like "8 reps"
+]
+
+def _scoped(pattern):
+    """Return the source of a compiled pattern with its IGNORECASE flag scoped to it."""
+    if pattern.flags & re.IGNORECASE:
+        return f"(?i:{pattern.pattern})"
+    return f"(?:{pattern.pattern})"
+
+def compile_scanner(pattern_groups):
+    """
+    Combine several groups of patterns into one regex with a named group per group.
+    
+    Each group becomes an optional lookahead anchored at the start of the
+    cell, so a single match attempt reports every group that occurs anywhere
+    in the cell, just like running re.search once per group.
+    
+    Args:
+        pattern_groups (dict): Group name -> list of compiled patterns; a cell
+            matches the group if any of its patterns match
+        
+    Returns:
+        re.Pattern: Combined scanner
+    """
+    parts = []
+    for name, patterns in pattern_groups.items():
+        alternation = "|".join(_scoped(pattern) for pattern in patterns)
+        parts.append(f"(?:(?=(?P<{name}>)[\\s\\S]*?(?:{alternation})))?")
+    return re.compile("".join(parts))
+
+def scan_cells(df, pattern_groups):
+    """
+    Test every string cell of a sheet against all pattern groups in one pass.
+    
+    Args:
+        df (DataFrame): Sheet as read from the Excel file
+        pattern_groups (dict): Group name -> list of compiled patterns
+        
+    Returns:
+        dict: Group name -> list of (row index, column, value) matches in
+            row-major order
+    """
+    names = {name: f"g{i}" for i, name in enumerate(pattern_groups)}
+    scanner = compile_scanner({names[name]: patterns for name, patterns in pattern_groups.items()})
+    matches = {name: [] for name in pattern_groups}
+    
+    # Collect the string cells in row-major order with their coordinates
+    values = df.to_numpy(dtype=object)
+    is_text = df.map(lambda value: isinstance(value, str)).to_numpy(dtype=bool)
+    rows, cols = np.nonzero(is_text)
+    if not len(rows):
+        return matches
+    
+    cells = pd.Series(values[rows, cols], dtype=object)
+    found = cells.str.extract(scanner).notna().to_numpy()
+    
+    for i, name in enumerate(pattern_groups):
+        for position in np.flatnonzero(found[:, i]):
+            matches[name].append((df.index[rows[position]], df.columns[cols[position]], cells.iloc[position]))
+    
+    return matches
+
+def print_matches(matches, label, limit=5):
+    """Print the first matches of a pattern, followed by a count of the rest."""
+    if matches:
+        print(f"\nFound {len(matches)} {label}:")
+        for i, (row_idx, col, value) in enumerate(matches[:limit]):
+            detail(f"  Match {i+1}: Row {row_idx}, Column '{col}', Value: '{value}'")
+        if len(matches) > limit:
+            detail(f"  ... and {len(matches) - limit} more matches")
+
 def examine_excel_content(excel_file):
     """
     Examine the actual content of the Excel file to understand its structure.
@@ -14,138 +111,82 @@ def examine_excel_content(excel_file):
     """
     print(f"Examining Excel file: {excel_file}")
     
+    # Every pattern group is tested in the same pass over the cells
+    pattern_groups = {}
+    for pattern in DAY_PATTERNS + EXERCISE_PATTERNS:
+        pattern_groups[pattern.pattern] = [pattern]
+    pattern_groups["sets_reps"] = SET_REP_PATTERNS
+    
     try:
         # Load all sheets
-        xl = pd.ExcelFile(excel_file)
-        sheet_names = xl.sheet_names
-        
-        print(f"Found {len(sheet_names)} sheets: {', '.join(sheet_names)}")
-        
-        # Process each sheet
-        for sheet_name in sheet_names:
-            print(f"\n{'='*50}")
-            print(f"SHEET: {sheet_name}")
-            print(f"{'='*50}")
-            
-            # Read the sheet
-            df = pd.read_excel(excel_file, sheet_name=sheet_name)
-            
-            # Print basic info
-            print(f"Shape: {df.shape[0]} rows x {df.shape[1]} columns")
+        with pd.ExcelFile(excel_file) as xl:
+            sheet_names = xl.sheet_names
             
-            # Print the first few rows to see the structure
-            print("\nFirst 10 rows:")
-            pd.set_option('display.max_columns', None)  # Show all columns
-            pd.set_option('display.width', 1000)  # Wide display
-            print(df.head(10).to_string())
+            print(f"Found {len(sheet_names)} sheets: {', '.join(sheet_names)}")
             
-            # Look for specific patterns in the data
-            print("\nSearching for workout day patterns...")
-            
-            # Patterns to look for
-            day_patterns = [
-                re.compile(r'push\s*day', re.IGNORECASE),
-                re.compile(r'pull\s*day', re.IGNORECASE),
-                re.compile(r'legs?\s*day', re.IGNORECASE),
-                re.compile(r'week\s*\d+', re.IGNORECASE)
-            ]
-            
-            # Search all cells for these patterns
-            for pattern in day_patterns:
-                pattern_name = pattern.pattern
-                matches = []
+            # Process each sheet
+            for sheet_name in sheet_names:
+                print(f"\n{'='*50}")
+                print(f"SHEET: {sheet_name}")
+                print(f"{'='*50}")
                 
-                # Search each cell in the DataFrame
-                for i, row in df.iterrows():
-                    for col, value in row.items():
-                        if isinstance(value, str) and pattern.search(value):
-                            matches.append((i, col, value))
+                # Read the sheet
+                with metrics.stage("parse_sheet"):
+                    df = xl.parse(sheet_name)
+                metrics.count(ROWS_SCANNED, len(df))
                 
-                if matches:
-                    print(f"\nFound {len(matches)} matches for pattern '{pattern_name}':")
-                    for i, (row_idx, col, value) in enumerate(matches[:5]):  # Show first 5 matches
-                        print(f"  Match {i+1}: Row {row_idx}, Column '{col}', Value: '{value}'")
-                    if len(matches) > 5:
-                        print(f"  ... and {len(matches) - 5} more matches")
-            
-            # Look for exercise-related terms
-            exercise_patterns = [
-                re.compile(r'bench\s*press', re.IGNORECASE),
-                re.compile(r'squat', re.IGNORECASE),
-                re.compile(r'deadlift', re.IGNORECASE),
-                re.compile(r'curl', re.IGNORECASE),
-                re.compile(r'press', re.IGNORECASE)
-            ]
-            
-            print("\nSearching for exercise patterns...")
-            for pattern in exercise_patterns:
-                pattern_name = pattern.pattern
-                matches = []
+                # Print basic info
+                print(f"Shape: {df.shape[0]} rows x {df.shape[1]} columns")
                 
-                # Search each cell in the DataFrame
-                for i, row in df.iterrows():
-                    for col, value in row.items():
-                        if isinstance(value, str) and pattern.search(value):
-                            matches.append((i, col, value))
+                # Print the first few rows to see the structure
+                detail("\nFirst 10 rows:")
+                pd.set_option('display.max_columns', None)  # Show all columns
+                pd.set_option('display.width', 1000)  # Wide display
+                detail(df.head(10).to_string())
                 
-                if matches:
-                    print(f"\nFound {len(matches)} matches for exercise '{pattern_name}':")
-                    for i, (row_idx, col, value) in enumerate(matches[:5]):  # Show first 5 matches
-                        print(f"  Match {i+1}: Row {row_idx}, Column '{col}', Value: '{value}'")
-                    if len(matches) > 5:
-                        print(f"  ... and {len(matches) - 5} more matches")
-            
-            # Look for numeric patterns that might indicate sets/reps
-            print("\nSearching for potential sets/reps patterns...")
-            set_rep_patterns = [
-                re.compile(r'^\d+$'),  # Just a number
-                re.compile(r'^\d+[-x]\d+$'),  # Like "3-5" or "3x5"
-                re.compile(r'^\d+\s*sets?', re.IGNORECASE),  # Like "3 sets"
-                re.compile(r'^\d+\s*reps?', re.IGNORECASE)   # Like "8 reps"
-            ]
-            
-            set_rep_matches = []
-            for i, row in df.iterrows():
-                for col, value in row.items():
-                    if isinstance(value, str):
-                        for pattern in set_rep_patterns:
-                            if pattern.search(value):
-                                set_rep_matches.append((i, col, value))
-                                break
-            
-            if set_rep_matches:
-                print(f"\nFound {len(set_rep_matches)} potential sets/reps indicators:")
-                for i, (row_idx, col, value) in enumerate(set_rep_matches[:10]):  # Show first 10 matches
-                    print(f"  Match {i+1}: Row {row_idx}, Column '{col}', Value: '{value}'")
-                if len(set_rep_matches) > 10:
-                    print(f"  ... and {len(set_rep_matches) - 10} more matches")
-            
-            # Try to identify the structure based on the first few rows with content
-            print("\nAttempting to identify table structure...")
-            
-            # Find the first few non-empty rows
-            non_empty_rows = []
-            for i, row in df.iterrows():
-                if not row.isna().all() and len(non_empty_rows) < 5:
-                    non_empty_rows.append((i, row))
-            
-            for i, (row_idx, row) in enumerate(non_empty_rows):
-                print(f"\nContent Row {i+1} (Excel row {row_idx+1}):")
-                for col, value in row.items():
-                    if not pd.isna(value):
-                        print(f"  Column '{col}': '{value}'")
-            
-            # Break after examining the first sheet to keep output manageable
-            if sheet_name == sheet_names[0]:
-                print("\nExamining only the first sheet for brevity. Run again without the break to examine all sheets.")
-                break
+                # Scan every string cell once for all patterns
+                with metrics.stage("scan_cells"):
+                    matches = scan_cells(df, pattern_groups)
+                metrics.count("cells_day", sum(len(matches[pattern.pattern]) for pattern in DAY_PATTERNS))
+                metrics.count("cells_exercise", sum(len(matches[pattern.pattern]) for pattern in EXERCISE_PATTERNS))
+                metrics.count("cells_sets_reps", len(matches["sets_reps"]))
+                
+                print("\nSearching for workout day patterns...")
+                for pattern in DAY_PATTERNS:
+                    print_matches(matches[pattern.pattern], f"matches for pattern '{pattern.pattern}'")
+                
+                print("\nSearching for exercise patterns...")
+                for pattern in EXERCISE_PATTERNS:
+                    print_matches(matches[pattern.pattern], f"matches for exercise '{pattern.pattern}'")
+                
+                print("\nSearching for potential sets/reps patterns...")
+                print_matches(matches["sets_reps"], "potential sets/reps indicators", limit=10)
+                
+                # Try to identify the structure based on the first few rows with content
+                print("\nAttempting to identify table structure...")
+                
+                # Find the first few non-empty rows
+                non_empty_rows = df.dropna(how='all').head(5)
+                
+                for i, (row_idx, row) in enumerate(non_empty_rows.iterrows()):
+                    detail(f"\nContent Row {i+1} (Excel row {row_idx+1}):")
+                    for col, value in row.items():
+                        if not pd.isna(value):
+                            detail(f"  Column '{col}': '{value}'")
         
     except Exception as e:
         print(f"Error examining Excel file: {str(e)}")
 
 def main():
-    excel_file = "The Ultimate Push Pull Legs System - 6x (2).xlsx"
-    examine_excel_content(excel_file)
+    parser = argparse.ArgumentParser(description="Print the structure of the workout workbook.")
+    parser.add_argument("excel_file", nargs="?", default="The Ultimate Push Pull Legs System - 6x (2).xlsx",
+                        help="Path to the Excel file")
+    add_arguments(parser)
+    args = parser.parse_args()
+    apply_arguments(args)
+    
+    examine_excel_content(args.excel_file)
+    finish(args.metrics)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -1,18 +1,159 @@
 #!/usr/bin/env python3
 
+import argparse
 import pandas as pd
-import json
 import os
 import re
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
-def extract_excel_overview(excel_file):
+from build_metrics import BYTES_WRITTEN, EXERCISES_EMITTED, FILES_WRITTEN, ROWS_SCANNED, add_arguments, apply_arguments, detail, finish, metrics
+from json_io import write_json
+
+# Patterns for workout day headers, with the day type each one detects
+DAY_PATTERNS = [
+    (re.compile(r'push\s*day\s*[#]?\s*(\d+)', re.IGNORECASE), "push"),
+    (re.compile(r'pull\s*day\s*[#]?\s*(\d+)', re.IGNORECASE), "pull"),
+    (re.compile(r'legs?\s*day\s*[#]?\s*(\d+)', re.IGNORECASE), "legs")
+]
+
+# Maximum number of days stored in sample_data, across all sheets
+MAX_SAMPLES = 3
+
+def build_row_text(df):
+    """
+    Join the string cells of every row with single spaces, column-wise.
+    
+    Equivalent to ' '.join(x for x in row if isinstance(x, str)) for each
+    row, but built with one vectorized concatenation per column.
+    
+    Args:
+        df (DataFrame): Sheet as read from the Excel file
+    
+    Returns:
+        Series: Row text per row
+    """
+    text = pd.Series("", index=df.index, dtype=object)
+    for _, column in df.items():
+        is_text = column.map(lambda value: isinstance(value, str))
+        text = text + column.astype(object).where(is_text, None).radd(" ").fillna("")
+    
+    # Every string cell was prefixed with a separator; drop the first one
+    return text.str[1:]
+
+def _cell_text(df, position):
+    """Return column position of df as stripped strings, with missing cells as ""."""
+    if df.shape[1] <= position:
+        return pd.Series("", index=df.index, dtype=object)
+    column = df.iloc[:, position]
+    return column.astype(object).where(column.notna(), "").map(str).str.strip()
+
+def analyze_sheet(sheet_name, df):
+    """
+    Analyze one sheet for the overview.
+    
+    Args:
+        sheet_name (str): Name of the sheet
+        df (DataFrame): Sheet as read from the Excel file
+    
+    Returns:
+        dict: "summary" (the sheet_summary entry), "workout_days",
+            "exercises" (names in order) and "samples" ((key, exercises)
+            candidates for sample_data, in order)
+    """
+    detail(f"\nAnalyzing sheet: {sheet_name}")
+    
+    # Try to determine phase and week from sheet name
+    phase_match = re.search(r'phase\s*(\d+)', sheet_name, re.IGNORECASE)
+    week_match = re.search(r'week\s*(\d+)', sheet_name, re.IGNORECASE)
+    
+    phase = int(phase_match.group(1)) if phase_match else None
+    week = int(week_match.group(1)) if week_match else None
+    
+    result = {"workout_days": [], "exercises": [], "samples": []}
+    
+    # Skip empty sheets
+    if df.empty:
+        result["summary"] = {
+            "rows": 0,
+            "columns": 0,
+            "phase": phase,
+            "week": week,
+            "is_empty": True
+        }
+        return result
+    
+    # Basic sheet info
+    result["summary"] = {
+        "rows": len(df),
+        "columns": len(df.columns),
+        "phase": phase,
+        "week": week,
+        "is_empty": False,
+        "column_headers": list(df.columns)
+    }
+    
+    # Day header numbers per pattern, for all rows at once
+    row_text = build_row_text(df)
+    day_numbers = [row_text.str.extract(pattern)[0].tolist() for pattern, _ in DAY_PATTERNS]
+    
+    # Exercise candidates: text in the first column and a set count in the second
+    first_col = _cell_text(df, 0)
+    second_col = _cell_text(df, 1)
+    is_exercise = (first_col != "") & second_col.str.isdigit() & (len(df.columns) > 2)
+    exercise_columns = list(zip(first_col, second_col, _cell_text(df, 2), _cell_text(df, 3), _cell_text(df, 4)))
+    
+    # Detect workout days and exercises
+    workout_days = result["workout_days"]
+    current_day = None
+    exercises = []
+    
+    for i, exercise_row in enumerate(is_exercise.tolist()):
+        # Check for day headers
+        for (pattern, day_type), numbers in zip(DAY_PATTERNS, day_numbers):
+            day_num = numbers[i]
+            if isinstance(day_num, str):
+                current_day = f"{day_type}{day_num}"
+                
+                if current_day not in workout_days:
+                    workout_days.append(current_day)
+                    detail(f"  Found workout day: {current_day}")
+                
+                # If we found a new day, store previous exercises
+                if exercises:
+                    day_key = f"{sheet_name}_{workout_days[-2]}" if len(workout_days) > 1 else f"{sheet_name}_{workout_days[0]}"
+                    result["samples"].append((day_key, exercises[:5]))  # Store up to 5 exercises
+                    exercises = []
+        
+        # Try to detect exercises
+        if current_day and exercise_row:
+            name, sets, reps, rest, rpe = exercise_columns[i]
+            exercises.append({
+                "name": name,
+                "sets": sets,
+                "reps": reps,
+                "rest": rest,
+                "rpe": rpe
+            })
+            result["exercises"].append(name)
+    
+    return result
+
+def _analyze_sheet_from_file(excel_file, sheet_name):
+    """Read one sheet and analyze it; runs in a worker process in parallel mode."""
+    df = pd.read_excel(excel_file, sheet_name=sheet_name)
+    return analyze_sheet(sheet_name, df)
+
+def extract_excel_overview(excel_file, workers=None):
     """
     Extract an overview of the Excel file content to understand its structure.
     
     Args:
         excel_file (str): Path to the Excel file
-        
+        workers (int, optional): Number of worker processes. With more than one
+            worker the sheets are read and analyzed in parallel; results are
+            merged in sheet order either way.
+    
     Returns:
         dict: Overview of the Excel content
     """
@@ -28,126 +169,71 @@ def extract_excel_overview(excel_file):
     
     try:
         # Load all sheets
-        xl = pd.ExcelFile(excel_file)
-        sheet_names = xl.sheet_names
-        
-        print(f"Found {len(sheet_names)} sheets: {', '.join(sheet_names)}")
-        
-        # Process each sheet
-        for sheet_name in sheet_names:
-            print(f"\nAnalyzing sheet: {sheet_name}")
-            
-            # Try to determine phase and week from sheet name
-            phase_match = re.search(r'phase\s*(\d+)', sheet_name, re.IGNORECASE)
-            week_match = re.search(r'week\s*(\d+)', sheet_name, re.IGNORECASE)
-            
-            phase = int(phase_match.group(1)) if phase_match else None
-            week = int(week_match.group(1)) if week_match else None
-            
-            # Read the sheet
-            df = pd.read_excel(excel_file, sheet_name=sheet_name)
-            
-            # Skip empty sheets
-            if df.empty:
-                overview["sheet_summary"][sheet_name] = {
-                    "rows": 0,
-                    "columns": 0,
-                    "phase": phase,
-                    "week": week,
-                    "is_empty": True
-                }
-                continue
-            
-            # Basic sheet info
-            overview["sheet_summary"][sheet_name] = {
-                "rows": len(df),
-                "columns": len(df.columns),
-                "phase": phase,
-                "week": week,
-                "is_empty": False,
-                "column_headers": list(df.columns)
-            }
+        with pd.ExcelFile(excel_file) as xl:
+            sheet_names = xl.sheet_names
             
-            # Look for workout day headers
-            day_patterns = [
-                re.compile(r'push\s*day\s*[#]?\s*(\d+)', re.IGNORECASE),
-                re.compile(r'pull\s*day\s*[#]?\s*(\d+)', re.IGNORECASE),
-                re.compile(r'legs?\s*day\s*[#]?\s*(\d+)', re.IGNORECASE)
-            ]
+            print(f"Found {len(sheet_names)} sheets: {', '.join(sheet_names)}")
             
-            # Detect workout days and exercises
-            workout_days = []
-            current_day = None
-            exercises = []
+            if workers and workers > 1:
+                with metrics.stage("analyze_sheets_parallel"):
+                    with ProcessPoolExecutor(max_workers=workers) as executor:
+                        results = list(executor.map(_analyze_sheet_from_file, [excel_file] * len(sheet_names), sheet_names))
+            else:
+                results = []
+                for sheet_name in sheet_names:
+                    with metrics.stage("parse_sheet"):
+                        df = xl.parse(sheet_name)
+                    with metrics.stage("analyze_sheet"):
+                        results.append(analyze_sheet(sheet_name, df))
+        
+        # Merge the per-sheet results in sheet order
+        for sheet_name, result in zip(sheet_names, results):
+            overview["sheet_summary"][sheet_name] = result["summary"]
+            metrics.count(ROWS_SCANNED, result["summary"]["rows"])
+            metrics.count("rows_day", len(result["workout_days"]))
+            metrics.count("rows_exercise", len(result["exercises"]))
+            overview["exercise_list"].update(result["exercises"])
             
-            for i, row in df.iterrows():
-                row_text = ' '.join([str(x) for x in row if isinstance(x, str)])
-                
-                # Check for day headers
-                for pattern in day_patterns:
-                    match = pattern.search(row_text)
-                    if match:
-                        day_type = pattern.pattern.split('\\')[0].replace('?', '').split('day')[0].strip()
-                        day_num = match.group(1)
-                        current_day = f"{day_type.lower()}{day_num}"
-                        
-                        if current_day not in workout_days:
-                            workout_days.append(current_day)
-                            print(f"  Found workout day: {current_day}")
-                        
-                        # If we found a new day, store previous exercises
-                        if exercises:
-                            # Store sample data for the previous day
-                            if len(overview["sample_data"]) < 3:  # Limit to 3 samples
-                                day_key = f"{sheet_name}_{workout_days[-2]}" if len(workout_days) > 1 else f"{sheet_name}_{workout_days[0]}"
-                                overview["sample_data"][day_key] = exercises[:5]  # Store up to 5 exercises
-                            
-                            exercises = []
-                
-                # Try to detect exercises
-                if current_day and len(row) > 2:
-                    # Simple heuristic: if first column has text and second column looks like a number
-                    # it might be an exercise with sets
-                    first_col = str(row.iloc[0]).strip() if not pd.isna(row.iloc[0]) else ""
-                    second_col = str(row.iloc[1]).strip() if len(row) > 1 and not pd.isna(row.iloc[1]) else ""
-                    
-                    if first_col and (second_col.isdigit() or second_col in ['1', '2', '3', '4', '5']):
-                        exercise = {
-                            "name": first_col,
-                            "sets": second_col,
-                            "reps": str(row.iloc[2]).strip() if len(row) > 2 and not pd.isna(row.iloc[2]) else "",
-                            "rest": str(row.iloc[3]).strip() if len(row) > 3 and not pd.isna(row.iloc[3]) else "",
-                            "rpe": str(row.iloc[4]).strip() if len(row) > 4 and not pd.isna(row.iloc[4]) else ""
-                        }
-                        
-                        exercises.append(exercise)
-                        overview["exercise_list"].add(first_col)
+            for day_key, exercises in result["samples"]:
+                if len(overview["sample_data"]) < MAX_SAMPLES:  # Limit to MAX_SAMPLES samples
+                    overview["sample_data"][day_key] = exercises
             
             # Add workout days to the overview
-            if workout_days:
-                overview["detected_workout_days"].extend(workout_days)
+            if result["workout_days"]:
+                overview["detected_workout_days"].extend(result["workout_days"])
         
         # Convert exercise_list to a sorted list
         overview["exercise_list"] = sorted(list(overview["exercise_list"]))
         
         # Save the overview to a JSON file
         output_file = os.path.splitext(excel_file)[0] + "_overview.json"
-        with open(output_file, 'w') as f:
-            json.dump(overview, f, indent=2)
+        with metrics.stage("write_json"):
+            metrics.count(BYTES_WRITTEN, write_json(output_file, overview))
+        metrics.count(FILES_WRITTEN)
+        metrics.count(EXERCISES_EMITTED, len(overview["exercise_list"]))
         
         print(f"\nOverview saved to {output_file}")
         print(f"Found {len(overview['exercise_list'])} unique exercises")
         print(f"Detected workout days: {', '.join(sorted(set(overview['detected_workout_days'])))}")
         
         return overview
-        
+    
     except Exception as e:
         print(f"Error analyzing Excel file: {str(e)}")
         return None
 
 def main():
-    excel_file = "The Ultimate Push Pull Legs System - 6x (2).xlsx"
-    extract_excel_overview(excel_file)
+    parser = argparse.ArgumentParser(description="Write an overview of the workout workbook structure.")
+    parser.add_argument("excel_file", nargs="?", default="The Ultimate Push Pull Legs System - 6x (2).xlsx",
+                        help="Path to the Excel file")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="Analyze sheets in this many worker processes (default: sequential)")
+    add_arguments(parser)
+    args = parser.parse_args()
+    apply_arguments(args)
+    
+    extract_excel_overview(args.excel_file, workers=args.workers)
+    finish(args.metrics)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
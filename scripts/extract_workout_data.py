@@ -1,23 +1,412 @@
 #!/usr/bin/env python3
 
+import argparse
+import datetime
 import pandas as pd
-import json
+import numpy as np
 import os
 import re
+import time
 from collections import defaultdict
 
-def extract_workout_data(excel_file):
+from json_io import load_json, write_json
+from build_cache import get_fresh_entry, hash_file, load_cache, record_entry, save_cache, workbook_sheet_hashes
+from build_metrics import BYTES_WRITTEN, EXERCISES_EMITTED, FILES_WRITTEN, ROWS_SCANNED, add_arguments, apply_arguments, detail, finish, metrics
+
+# Day header patterns, tested in order against the first column
+DAY_PATTERNS = {
+    "push1": r'push\s*#?\s*1',
+    "push2": r'push\s*#?\s*2',
+    "pull1": r'pull\s*#?\s*1',
+    "pull2": r'pull\s*#?\s*2',
+    "legs1": r'legs?\s*#?\s*1',
+    "legs2": r'legs?\s*#?\s*2'
+}
+
+# Exercise fields, read from columns 2-10 of an exercise row
+EXERCISE_FIELDS = [
+    "warmup_sets", "working_sets", "reps", "load", "rpe",
+    "rest", "substitution1", "substitution2", "notes"
+]
+
+# Defaults for cells that pandas parsed as dates (e.g. "2-3" read as 2022-03-04),
+# used only when the workbook is read with pandas type inference
+DATE_DEFAULTS = {
+    "warmup_sets": "2",
+    "working_sets": "3",
+    "rpe": "8-9"
+}
+
+# Cell texts treated as empty, like the pandas default missing-value markers
+NA_TEXT = {"", "#N/A", "#N/A N/A", "#NA", "-NaN", "-nan", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"}
+
+# Tokens of an Excel date number format such as "m\\-d" or "dd/mm/yyyy"
+DATE_FORMAT_TOKEN = re.compile(r'"[^"]*"|\\.|\[[^\]]*\]|yyyy|yy|mmmm|mmm|mm|m|dddd|ddd|dd|d|.', re.IGNORECASE)
+
+# Row types assigned by classify_rows()
+ROW_WEEK = "week"
+ROW_DAY = "day"
+ROW_HEADER = "header"
+ROW_EXERCISE = "exercise"
+ROW_OTHER = "other"
+
+# First-column text of the banner row above a deload week
+DELOAD_PATTERN = re.compile(r'deload', re.IGNORECASE)
+
+def _text_cells(column):
+    """Return the string cells of a column as an object Series, other cells as NaN."""
+    is_text = column.map(lambda value: isinstance(value, str))
+    return column.astype(object).where(is_text)
+
+def classify_rows(df):
+    """
+    Tag every row of a phase sheet in one column-wise pass.
+    
+    Args:
+        df (DataFrame): Phase sheet as read from the Excel file
+        
+    Returns:
+        DataFrame: One row per sheet row with the columns
+            kind (week/day/header/exercise/other), week, day,
+            current_week, current_day, segment and deload (True on
+            week headers announced by a deload banner)
+    """
+    first = _text_cells(df.iloc[:, 0])
+    second = _text_cells(df.iloc[:, 1])
+    
+    # Deload banners ("FULL DELOAD WEEK: ...") announce the week header below them;
+    # they can mention other weeks, so they are never week headers themselves
+    is_banner = first.str.contains(DELOAD_PATTERN, regex=True).fillna(False).astype(bool)
+    
+    # Week headers take precedence over everything else on the row
+    week = pd.to_numeric(first.str.extract(r'week\s*(\d+)', flags=re.IGNORECASE)[0]).where(~is_banner)
+    is_week = week.notna()
+    
+    # A week is a deload when a banner appeared since the previous week header
+    banners_seen = is_banner.cumsum()
+    banners_at_week = banners_seen[is_week]
+    is_deload = pd.Series(False, index=df.index)
+    is_deload[is_week] = banners_at_week.diff().fillna(banners_at_week) > 0
+    
+    # The first matching day pattern wins
+    day_matches = [first.str.contains(pattern, flags=re.IGNORECASE, regex=True).fillna(False).to_numpy(dtype=bool)
+                   for pattern in DAY_PATTERNS.values()]
+    day = pd.Series(np.select(day_matches, list(DAY_PATTERNS), default=None), index=df.index, dtype=object)
+    day = day.where(~is_week)
+    is_day = day.notna()
+    
+    # Week and day carry forward until the next header of the same kind
+    current_week = week.ffill()
+    current_day = day.ffill()
+    in_day = current_week.notna() & (current_week != 0) & current_day.notna() & ~is_week
+    
+    names = second.str.strip()
+    has_name = in_day & names.notna()
+    is_header = has_name & (names.str.lower() == "exercise")
+    is_exercise = has_name & ~is_header
+    
+    kind = np.select(
+        [is_week.to_numpy(), is_header.to_numpy(), is_exercise.to_numpy(), is_day.to_numpy()],
+        [ROW_WEEK, ROW_HEADER, ROW_EXERCISE, ROW_DAY],
+        default=ROW_OTHER
+    )
+    
+    return pd.DataFrame({
+        "kind": kind,
+        "week": week,
+        "day": day,
+        "current_week": current_week,
+        "current_day": current_day,
+        "segment": is_day.cumsum(),
+        "deload": is_deload
+    }, index=df.index)
+
+def build_exercise_columns(df, mask, repair_dates=False):
+    """
+    Read the exercise fields of the rows of a phase sheet selected by mask.
+    
+    Args:
+        df (DataFrame): Phase sheet as read from the Excel file
+        mask (Series): Boolean mask of exercise rows
+        repair_dates (bool): Replace values that pandas parsed as dates with
+            DATE_DEFAULTS; only needed for sheets read with type inference
+        
+    Returns:
+        dict: Field name ("name" and EXERCISE_FIELDS) -> list of cleaned
+            string values in sheet order
+    """
+    rows = df.loc[mask]
+    columns = {"name": rows.iloc[:, 1].str.strip()}
+    
+    for position, field in enumerate(EXERCISE_FIELDS, start=2):
+        cells = rows.iloc[:, position]
+        text = cells.astype(object).where(cells.notna(), "").map(str).str.strip()
+        
+        # Clean up date values that might have been parsed incorrectly
+        if repair_dates and field in DATE_DEFAULTS:
+            is_date = text.str.contains(r'\d{4}-\d{2}-\d{2}', regex=True)
+            text = text.mask(is_date, DATE_DEFAULTS[field])
+        
+        columns[field] = text.tolist()
+    
+    columns["name"] = columns["name"].tolist()
+    return columns
+
+def build_exercises(df, mask, repair_dates=False):
+    """
+    Build exercise dicts from the rows of a phase sheet selected by mask.
+    
+    Use workout_model.Exercise.from_columns(build_exercise_columns(df, mask))
+    to build typed exercises from the same rows.
+    
+    Args:
+        df (DataFrame): Phase sheet as read from the Excel file
+        mask (Series): Boolean mask of exercise rows
+        repair_dates (bool): See build_exercise_columns()
+        
+    Returns:
+        list: Exercise dicts in sheet order
+    """
+    columns = build_exercise_columns(df, mask, repair_dates)
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+def build_phase_weeks(df, weeks, repair_dates=False):
+    """
+    Fill the weeks dict of a phase from a phase sheet.
+    
+    A day's exercises are stored when the next day header is reached (or at
+    the end of the sheet), under the week that is current at that point.
+    
+    Args:
+        df (DataFrame): Phase sheet as read from the Excel file
+        weeks (dict): Weeks dict of the phase, updated in place
+        repair_dates (bool): See build_exercise_columns()
+        
+    Returns:
+        list: Numbers of the weeks marked as deload weeks in the sheet
+    """
+    if df.empty:
+        return []
+    
+    with metrics.stage("classify_rows"):
+        rows = classify_rows(df)
+    
+    with metrics.stage("build_exercises"):
+        is_exercise = rows["kind"] == ROW_EXERCISE
+        exercises = build_exercises(df, is_exercise, repair_dates) if is_exercise.any() else []
+    
+    metrics.count(ROWS_SCANNED, len(rows))
+    for kind, count in rows["kind"].value_counts().items():
+        metrics.count(f"rows_{kind}", int(count))
+    metrics.count("day_headers", int(rows["day"].notna().sum()))
+    
+    # Day headers can share their row with the first exercise of the day
+    detail(f"  Classified {len(rows)} rows: {(rows['kind'] == ROW_WEEK).sum()} weeks, "
+          f"{rows['day'].notna().sum()} days, {len(exercises)} exercise rows")
+    
+    # Initialize week data in the order the week headers appear
+    for week in rows.loc[rows["kind"] == ROW_WEEK, "week"]:
+        weeks.setdefault(f"week{int(week)}", {})
+    
+    # Group exercises by the day header they follow
+    segments = {}
+    for segment, exercise in zip(rows.loc[is_exercise, "segment"], exercises):
+        segments.setdefault(segment, []).append(exercise)
+    
+    # Each day is saved under the week current at the next day header
+    day_rows = rows.loc[rows["day"].notna()]
+    save_weeks = day_rows["current_week"].iloc[1:].tolist() + rows["current_week"].iloc[-1:].tolist()
+    
+    for segment, day, save_week in zip(day_rows["segment"], day_rows["day"], save_weeks):
+        day_exercises = segments.get(segment)
+        if day_exercises and not pd.isna(save_week) and save_week:
+            weeks[f"week{int(save_week)}"][day] = day_exercises
+    
+    deload_rows = rows.loc[rows["deload"], "week"]
+    return sorted({int(week) for week in deload_rows})
+
+def format_date_cell(value, number_format):
+    """
+    Return the text Excel displays for a date cell.
+    
+    Values such as "2-3" or "8-9" typed into a sheet are stored by Excel as
+    dates with a number format like "m-d"; rendering the date with its
+    format gives back the text that was typed.
+    
+    Args:
+        value (datetime): Cell value
+        number_format (str): Excel number format of the cell
+        
+    Returns:
+        str: Displayed text, or the ISO date if the format has no date parts
+    """
+    parts = []
+    has_date = False
+    for token in DATE_FORMAT_TOKEN.findall(number_format or ""):
+        lower = token.lower()
+        if token.startswith('"'):
+            parts.append(token[1:-1])
+        elif token.startswith("\\"):
+            parts.append(token[1:])
+        elif token.startswith("["):
+            continue
+        elif token == ";":
+            # Later sections format negative numbers, zero and text, never a date
+            break
+        elif lower[0] in "ymd" and lower == lower[0] * len(lower):
+            has_date = True
+            if lower[0] == "y":
+                parts.append(f"{value.year:04d}" if len(lower) == 4 else f"{value.year % 100:02d}")
+            elif lower[0] == "m":
+                parts.append([f"{value.month}", f"{value.month:02d}", value.strftime("%b"), value.strftime("%B")][len(lower) - 1])
+            else:
+                parts.append([f"{value.day}", f"{value.day:02d}", value.strftime("%a"), value.strftime("%A")][len(lower) - 1])
+        else:
+            parts.append(token)
+    
+    if not has_date:
+        return value.date().isoformat() if isinstance(value, datetime.datetime) else value.isoformat()
+    return "".join(parts)
+
+def cell_value(cell):
+    """Convert a cell like pandas does: whole floats become ints, empty cells None."""
+    value = cell.value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+def cell_text(cell):
+    """Convert a cell to the text shown in Excel, without any type inference."""
+    value = cell.value
+    if isinstance(value, str):
+        # Missing-value markers stay empty, as with pandas
+        return None if value in NA_TEXT else value
+    if value is None:
+        return None
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return format_date_cell(value, cell.number_format)
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+# Converter per column position; the exercise fields are read as text
+COLUMN_CONVERTERS = {position: cell_text for position in range(2, 2 + len(EXERCISE_FIELDS))}
+
+def read_sheet_typed(worksheet, converters=COLUMN_CONVERTERS):
+    """
+    Read a worksheet into a DataFrame, converting every cell by its column.
+    
+    The frame has the same layout as xl.parse(): the first row is the
+    header and all columns have object dtype. Columns without a converter
+    use cell_value().
+    
+    Args:
+        worksheet: openpyxl worksheet
+        converters (dict): Column position -> function(cell) -> value
+        
+    Returns:
+        DataFrame: Sheet content
+    """
+    rows = []
+    width = 0
+    for cells in worksheet.iter_rows():
+        row = [converters.get(position, cell_value)(cell) for position, cell in enumerate(cells)]
+        # Trim trailing empty cells like pandas
+        while row and row[-1] is None:
+            row.pop()
+        rows.append(row)
+        width = max(width, len(row))
+    
+    # Trailing empty rows are dropped, empty rows inside the sheet are kept
+    while rows and not rows[-1]:
+        rows.pop()
+    if not rows:
+        return pd.DataFrame()
+    
+    header = rows[0] + [None] * (width - len(rows[0]))
+    columns = [name if name is not None else f"Unnamed: {i}" for i, name in enumerate(header)]
+    data = [row + [None] * (width - len(row)) for row in rows[1:]]
+    return pd.DataFrame(data, columns=columns, dtype=object)
+
+def iter_phase_sheets(excel_file, skip_sheets=(), typed=True):
+    """
+    Stream the phase sheets of an Excel file, opening the workbook only once.
+    
+    The workbook is loaded a single time and each phase sheet is parsed from
+    the already open file, instead of re-reading the whole .xlsx per sheet.
+    
+    Args:
+        excel_file (str): Path to the Excel file
+        skip_sheets (iterable): Sheet names that should not be parsed; they are
+            yielded with df set to None
+        typed (bool): Read the exercise columns as the text shown in Excel
+            with read_sheet_typed(). When False, pandas infers the cell types.
+        
+    Yields:
+        tuple: (sheet_name, phase, df, parse_seconds) for every phase sheet
+    """
+    with pd.ExcelFile(excel_file) as xl:
+        sheet_names = xl.sheet_names
+        
+        print(f"Found {len(sheet_names)} sheets: {', '.join(sheet_names)}")
+        
+        for sheet_name in sheet_names:
+            detail(f"\nProcessing sheet: {sheet_name}")
+            
+            # Extract phase number from sheet name
+            phase_match = re.search(r'phase\s*(\d+)', sheet_name, re.IGNORECASE)
+            phase = int(phase_match.group(1)) if phase_match else None
+            
+            if not phase:
+                print(f"  Could not determine phase number for sheet: {sheet_name}")
+                continue
+            
+            if sheet_name in skip_sheets:
+                yield sheet_name, phase, None, 0.0
+                continue
+            
+            # Parse the sheet from the open workbook
+            start = time.perf_counter()
+            with metrics.stage("parse_sheet"):
+                df = read_sheet_typed(xl.book[sheet_name]) if typed else xl.parse(sheet_name)
+            parse_seconds = time.perf_counter() - start
+            
+            detail(f"  Parsed sheet in {parse_seconds * 1000:.1f} ms")
+            yield sheet_name, phase, df, parse_seconds
+
+def sheet_cache_key(excel_file, sheet_name):
+    """Return the build cache key for one sheet of a workbook."""
+    return f"sheet:{os.path.abspath(excel_file)}:{sheet_name}"
+
+def extract_workout_data(excel_file, output_file=None, cache=None, typed=True):
     """
     Extract workout data from the Excel file with a targeted approach based on the known structure.
     
     Args:
         excel_file (str): Path to the Excel file
+        output_file (str, optional): Path of the JSON file to write. Defaults to
+            the Excel file path with a "_workout_data.json" suffix.
+        cache (dict, optional): Build cache from build_cache.load_cache(). When
+            given, an unchanged workbook is not read at all and only the sheets
+            whose content changed are parsed.
+        typed (bool): Read the exercise columns as the text shown in Excel.
+            When False, pandas infers the cell types and cells that came back
+            as dates are replaced with DATE_DEFAULTS.
         
     Returns:
         dict: Structured workout data
     """
     print(f"Extracting workout data from: {excel_file}")
     
+    if output_file is None:
+        output_file = os.path.splitext(excel_file)[0] + "_workout_data.json"
+    
+    workbook_key = f"workbook:{os.path.abspath(excel_file)}"
+    workbook_hash = None
+    read_mode = "typed" if typed else "inferred"
+    sheet_hashes = {}
+    cached_phases = {}
+    
     # Initialize the workout data structure
     workout_data = {
         "program_info": {
@@ -29,129 +418,65 @@ def extract_workout_data(excel_file):
         "phases": {}
     }
     
+    # Per-sheet parse timings in seconds
+    sheet_timings = {}
+    
     try:
-        # Load all sheets
-        xl = pd.ExcelFile(excel_file)
-        sheet_names = xl.sheet_names
-        
-        print(f"Found {len(sheet_names)} sheets: {', '.join(sheet_names)}")
-        
-        # Process each sheet (each sheet is a phase)
-        for sheet_name in sheet_names:
-            print(f"\nProcessing sheet: {sheet_name}")
+        if cache is not None:
+            # Reuse the previous output if neither the workbook nor the generators changed
+            with metrics.stage("hash_workbook"):
+                workbook_hash = f"{hash_file(excel_file)}:{read_mode}"
+            if get_fresh_entry(cache, workbook_key, workbook_hash):
+                print(f"Workbook unchanged, using {output_file}")
+                return load_json(output_file)
             
-            # Extract phase number from sheet name
-            phase_match = re.search(r'phase\s*(\d+)', sheet_name, re.IGNORECASE)
-            phase = int(phase_match.group(1)) if phase_match else None
+            # Otherwise only parse the sheets whose content changed
+            with metrics.stage("hash_sheets"):
+                sheet_hashes = {name: f"{sheet_hash}:{read_mode}"
+                                for name, sheet_hash in workbook_sheet_hashes(excel_file).items()}
+            for sheet_name, sheet_hash in sheet_hashes.items():
+                entry = get_fresh_entry(cache, sheet_cache_key(excel_file, sheet_name), sheet_hash)
+                if entry:
+                    cached_phases[sheet_name] = entry["data"]
+        
+        # Process each sheet (each sheet is a phase), opening the workbook once
+        for sheet_name, phase, df, parse_seconds in iter_phase_sheets(excel_file, skip_sheets=cached_phases, typed=typed):
+            phase_key = f"phase{phase}"
             
-            if not phase:
-                print(f"  Could not determine phase number for sheet: {sheet_name}")
+            if df is None:
+                workout_data["phases"][phase_key] = cached_phases[sheet_name]
+                detail("  Sheet unchanged, using cached phase data")
                 continue
             
-            phase_key = f"phase{phase}"
+            sheet_timings[sheet_name] = parse_seconds
+            
             workout_data["phases"][phase_key] = {
                 "description": "",
                 "weeks": {}
             }
             
-            # Read the sheet
-            df = pd.read_excel(excel_file, sheet_name=sheet_name)
-            
             # Get phase description from first row, first column
             if not df.empty and not pd.isna(df.columns[0]):
                 workout_data["phases"][phase_key]["description"] = df.columns[0]
-                print(f"  Phase description: {df.columns[0]}")
-            
-            # Initialize variables for tracking current week and day
-            current_week = None
-            current_day = None
-            current_exercises = []
+                detail(f"  Phase description: {df.columns[0]}")
             
-            # Process each row
-            for i, row in df.iterrows():
-                # Check if this row indicates a new week
-                if not pd.isna(row.iloc[0]) and isinstance(row.iloc[0], str) and re.search(r'week\s*(\d+)', row.iloc[0], re.IGNORECASE):
-                    week_match = re.search(r'week\s*(\d+)', row.iloc[0], re.IGNORECASE)
-                    current_week = int(week_match.group(1))
-                    week_key = f"week{current_week}"
-                    
-                    # Initialize week data if it doesn't exist
-                    if week_key not in workout_data["phases"][phase_key]["weeks"]:
-                        workout_data["phases"][phase_key]["weeks"][week_key] = {}
-                    
-                    print(f"  Found Week {current_week}")
-                    continue
-                
-                # Check if this row indicates a new workout day
-                day_patterns = {
-                    "push1": re.compile(r'push\s*#?\s*1', re.IGNORECASE),
-                    "push2": re.compile(r'push\s*#?\s*2', re.IGNORECASE),
-                    "pull1": re.compile(r'pull\s*#?\s*1', re.IGNORECASE),
-                    "pull2": re.compile(r'pull\s*#?\s*2', re.IGNORECASE),
-                    "legs1": re.compile(r'legs?\s*#?\s*1', re.IGNORECASE),
-                    "legs2": re.compile(r'legs?\s*#?\s*2', re.IGNORECASE)
-                }
-                
-                if not pd.isna(row.iloc[0]):
-                    for day_key, pattern in day_patterns.items():
-                        if isinstance(row.iloc[0], str) and pattern.search(row.iloc[0]):
-                            # If we were processing a previous day, save its exercises
-                            if current_day and current_exercises and current_week:
-                                week_key = f"week{current_week}"
-                                workout_data["phases"][phase_key]["weeks"][week_key][current_day] = current_exercises
-                            
-                            # Start a new day
-                            current_day = day_key
-                            current_exercises = []
-                            print(f"  Found workout day: {current_day}")
-                            break
-                
-                # If we have a current week and day, and this row has an exercise name
-                if current_week and current_day and not pd.isna(row.iloc[1]) and isinstance(row.iloc[1], str):
-                    # This row contains exercise data
-                    exercise_name = row.iloc[1].strip()
-                    
-                    # Skip if this is a header row
-                    if exercise_name.lower() == "exercise":
-                        continue
-                    
-                    # Extract exercise data
-                    exercise = {
-                        "name": exercise_name,
-                        "warmup_sets": str(row.iloc[2]).strip() if not pd.isna(row.iloc[2]) else "",
-                        "working_sets": str(row.iloc[3]).strip() if not pd.isna(row.iloc[3]) else "",
-                        "reps": str(row.iloc[4]).strip() if not pd.isna(row.iloc[4]) else "",
-                        "load": str(row.iloc[5]).strip() if not pd.isna(row.iloc[5]) else "",
-                        "rpe": str(row.iloc[6]).strip() if not pd.isna(row.iloc[6]) else "",
-                        "rest": str(row.iloc[7]).strip() if not pd.isna(row.iloc[7]) else "",
-                        "substitution1": str(row.iloc[8]).strip() if not pd.isna(row.iloc[8]) else "",
-                        "substitution2": str(row.iloc[9]).strip() if not pd.isna(row.iloc[9]) else "",
-                        "notes": str(row.iloc[10]).strip() if not pd.isna(row.iloc[10]) else ""
-                    }
-                    
-                    # Clean up date values that might have been parsed incorrectly
-                    for key in ["warmup_sets", "working_sets", "rpe"]:
-                        if exercise[key] and re.search(r'\d{4}-\d{2}-\d{2}', exercise[key]):
-                            # This is likely a date that was parsed incorrectly
-                            if key == "warmup_sets":
-                                exercise[key] = "2"  # Default value
-                            elif key == "working_sets":
-                                exercise[key] = "3"  # Default value
-                            elif key == "rpe":
-                                exercise[key] = "8-9"  # Default value
-                    
-                    current_exercises.append(exercise)
-                    print(f"    Added exercise: {exercise_name}")
+            # Classify all rows at once, then assemble the weeks
+            deload_weeks = build_phase_weeks(df, workout_data["phases"][phase_key]["weeks"], repair_dates=not typed)
+            if deload_weeks:
+                workout_data["phases"][phase_key]["deload_weeks"] = deload_weeks
+                detail(f"  Deload weeks: {', '.join(map(str, deload_weeks))}")
             
-            # Save the last set of exercises
-            if current_day and current_exercises and current_week:
-                week_key = f"week{current_week}"
-                workout_data["phases"][phase_key]["weeks"][week_key][current_day] = current_exercises
+            if sheet_name in sheet_hashes:
+                record_entry(cache, sheet_cache_key(excel_file, sheet_name),
+                             sheet_hashes[sheet_name], data=workout_data["phases"][phase_key])
         
         # Save the workout data to a JSON file
-        output_file = os.path.splitext(excel_file)[0] + "_workout_data.json"
-        with open(output_file, 'w') as f:
-            json.dump(workout_data, f, indent=2)
+        with metrics.stage("write_json"):
+            metrics.count(BYTES_WRITTEN, write_json(output_file, workout_data))
+        metrics.count(FILES_WRITTEN)
+        
+        if cache is not None:
+            record_entry(cache, workbook_key, workbook_hash, outputs=[output_file])
         
         print(f"\nWorkout data saved to {output_file}")
         
@@ -162,8 +487,15 @@ def extract_workout_data(excel_file):
                 for day_key, exercises in week_data.items():
                     total_exercises += len(exercises)
         
+        metrics.count(EXERCISES_EMITTED, total_exercises)
         print(f"Extracted {total_exercises} exercises across {len(workout_data['phases'])} phases")
         
+        # Print sheet parse timings
+        print("Sheet parse timings:")
+        for sheet_name, parse_seconds in sheet_timings.items():
+            detail(f"  {sheet_name}: {parse_seconds * 1000:.1f} ms")
+        print(f"  Total: {sum(sheet_timings.values()) * 1000:.1f} ms")
+        
         return workout_data
         
     except Exception as e:
@@ -173,8 +505,20 @@ def extract_workout_data(excel_file):
         return None
 
 def main():
-    excel_file = "The Ultimate Push Pull Legs System - 6x (2).xlsx"
-    extract_workout_data(excel_file)
+    parser = argparse.ArgumentParser(description="Extract the workout program from the Excel workbook.")
+    parser.add_argument("excel_file", nargs="?", default="The Ultimate Push Pull Legs System - 6x (2).xlsx",
+                        help="Path to the Excel file")
+    parser.add_argument("--infer-types", action="store_true",
+                        help="Let pandas infer cell types and replace cells read as dates with defaults "
+                             "(the previous behavior)")
+    add_arguments(parser)
+    args = parser.parse_args()
+    apply_arguments(args)
+    
+    cache = load_cache()
+    extract_workout_data(args.excel_file, cache=cache, typed=not args.infer_types)
+    save_cache(cache)
+    finish(args.metrics)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
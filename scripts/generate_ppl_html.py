@@ -1,18 +1,35 @@
 #!/usr/bin/env python3
 
+import argparse
 import json
 import os
 import re
+from functools import lru_cache
 from html import escape
 
+from build_cache import get_fresh_entry, hash_json, load_cache, record_entry, remove_entry, save_cache
+from build_metrics import BYTES_WRITTEN, EXERCISES_EMITTED, FILES_WRITTEN, add_arguments, apply_arguments, finish, metrics
+from precompress import find_artifacts, precompress, print_summary, remove_orphans
+from json_io import load_json, write_json
+from progression import add_derive_arguments, fill_missing_weeks
+
+# Output file for the generated page
+HTML_FILE = "ppl-workout-html.html"
+
+# Default output directory for the split bundle (shell page + week fragments)
+SPLIT_OUTPUT_DIR = "ppl-workout-split"
+
 def load_workout_data(json_file):
     """Load workout data from JSON file"""
-    with open(json_file, 'r') as f:
-        return json.load(f)
+    return load_json(json_file)
 
-def generate_html(workout_data):
-    """Generate HTML from workout data"""
-    html = """<!DOCTYPE html>
+# Slot syntax used by the page templates: {{name}}
+SLOT_PATTERN = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+
+# Templates for the generated page, keyed by fragment name. Pass a dict with
+# some of these keys to iter_html() to render a different page variant.
+PAGE_TEMPLATES = {
+    "head": """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -100,6 +117,13 @@ def generate_html(workout_data):
             text-align: center;
         }
         
+        .derived-note {
+            padding: 10px 15px;
+            margin-bottom: 15px;
+            border-left: 4px solid var(--primary-color);
+            font-style: italic;
+        }
+        
         .week-selector {
             display: flex;
             flex-wrap: wrap;
@@ -277,65 +301,37 @@ def generate_html(workout_data):
     <header>
         <h1>The Ultimate Push Pull Legs System</h1>
         <div class="phase-selector">
-            <button class="phase-btn active" onclick="showPhase('phase1')">Phase 1</button>
-            <button class="phase-btn" onclick="showPhase('phase2')">Phase 2</button>
-            <button class="phase-btn" onclick="showPhase('phase3')">Phase 3</button>
-        </div>
+""",
+    "phase_button": """            <button class="phase-btn{{active_class}}" onclick="showPhase('{{phase_key}}')">Phase {{phase_num}}</button>
+""",
+    "header_end": """        </div>
     </header>
     
     <div class="container">
-"""
-
-    # Generate content for each phase
-    for phase_num in range(1, 4):
-        phase_key = f"phase{phase_num}"
-        phase_data = workout_data["phases"].get(phase_key, {})
-        phase_description = phase_data.get("description", f"Phase {phase_num}")
-        
-        # Phase content div
-        active_class = "active" if phase_num == 1 else ""
-        html += f"""
-        <!-- PHASE {phase_num} -->
-        <div id="{phase_key}" class="phase-content {active_class}">
-            <div class="phase-description">{phase_description}</div>
+""",
+    "phase_start": """
+        <!-- PHASE {{phase_num}} -->
+        <div id="{{phase_key}}" class="phase-content {{active_class}}">
+            <div class="phase-description">{{description}}</div>
             
             <div class="week-selector">
-"""
-        
-        # Week buttons
-        for week_num in range(1, 7):
-            week_key = f"week{week_num}"
-            active_class = "active" if week_num == 1 else ""
-            html += f"""                <button class="week-btn {active_class}" onclick="showWeek('{phase_key}', '{week_key}')">Week {week_num}</button>
-"""
-        
-        html += """            </div>
-            
-"""
-        
-        # Week content
-        for week_num in range(1, 7):
-            week_key = f"week{week_num}"
-            week_data = phase_data.get("weeks", {}).get(week_key, {})
-            active_class = "active" if week_num == 1 else ""
-            
-            html += f"""            <!-- Week {week_num} Content -->
-            <div id="{phase_key}-{week_key}" class="week-content {active_class}">
-"""
+""",
+    "week_button": """                <button class="week-btn {{active_class}}" onclick="showWeek('{{phase_key}}', '{{week_key}}')">Week {{week_num}}</button>
+""",
+    "week_selector_end": """            </div>
             
-            # If we have data for this week
-            if week_data:
-                # Generate workout days
-                for day_type in ["push1", "pull1", "legs1", "push2", "pull2", "legs2"]:
-                    day_data = week_data.get(day_type, [])
-                    if day_data:
-                        day_name = day_type.replace("1", " #1").replace("2", " #2").title()
-                        
-                        html += f"""                <!-- {day_name} -->
+""",
+    "week_start": """            <!-- Week {{week_num}} Content -->
+            <div id="{{phase_key}}-{{week_key}}" class="week-content {{active_class}}">
+""",
+    "derived_note": """                <p class="derived-note">Week {{week_num}} is not part of the source program: it is derived from Week {{base_week}}.</p>
+""",
+    "day_start": """                <!-- {{day_name}} -->
                 <div class="workout-day">
-                    <div class="day-header">{day_name}</div>
+                    <div class="day-header">{{day_name}}</div>
                     <table class="exercise-table">
-                        <tr>
+""",
+    "table_header": """                        <tr>
                             <th class="table-header" style="width: 35%;">Exercise</th>
                             <th class="table-header" style="width: 15%;">Warm-up</th>
                             <th class="table-header" style="width: 15%;">Working</th>
@@ -344,77 +340,51 @@ def generate_html(workout_data):
                             <th class="table-header" style="width: 10%;">Rest</th>
                         </tr>
                         
-"""
-                        
-                        # Generate exercises
-                        for i, exercise in enumerate(day_data):
-                            exercise_id = f"{phase_key}-{week_key}-{day_type}-ex{i}"
-                            notes_id = f"{exercise_id}-notes"
-                            subs_id = f"{exercise_id}-subs"
-                            
-                            # Clean up exercise name for ID
-                            clean_name = re.sub(r'[^a-zA-Z0-9]', '-', exercise["name"].lower())
-                            
-                            # Exercise row
-                            html += f"""                        <tr class="exercise-row">
+""",
+    "exercise": """                        <tr class="exercise-row">
                             <td class="exercise-name">
-                                <a href="#" class="exercise-link">{exercise["name"]}</a>
-                                <span class="info-icon" onclick="toggleNotes('{notes_id}')">i</span>
+                                <a href="#" class="exercise-link">{{name}}</a>
+                                <span class="info-icon" onclick="toggleNotes('{{notes_id}}')">i</span>
                             </td>
-                            <td class="exercise-data">{exercise["warmup_sets"]}</td>
-                            <td class="exercise-data">{exercise["working_sets"]}</td>
-                            <td class="exercise-data">{exercise["reps"]}</td>
-                            <td class="exercise-data">{exercise["rpe"]}</td>
-                            <td class="exercise-data">{exercise["rest"]}</td>
+                            <td class="exercise-data">{{warmup_sets}}</td>
+                            <td class="exercise-data">{{working_sets}}</td>
+                            <td class="exercise-data">{{reps}}</td>
+                            <td class="exercise-data">{{rpe}}</td>
+                            <td class="exercise-data">{{rest}}</td>
                         </tr>
-                        <tr id="{notes_id}" class="exercise-notes">
+                        <tr id="{{notes_id}}" class="exercise-notes">
                             <td colspan="6">
-                                <strong>Notes:</strong> {exercise["notes"]}
-"""
-                            
-                            # Add substitutions if available
-                            if exercise["substitution1"] or exercise["substitution2"]:
-                                html += f"""                                <br><br>
-                                <button class="sub-btn" onclick="toggleSubs('{subs_id}')">Show Substitutions</button>
-                                <div id="{subs_id}" class="substitutions">
+                                <strong>Notes:</strong> {{notes}}
+""",
+    "substitutions_start": """                                <br><br>
+                                <button class="sub-btn" onclick="toggleSubs('{{subs_id}}')">Show Substitutions</button>
+                                <div id="{{subs_id}}" class="substitutions">
                                     <strong>Substitution Options:</strong>
-"""
-                                if exercise["substitution1"]:
-                                    html += f"""                                    <br>1. {exercise["substitution1"]}
-"""
-                                if exercise["substitution2"]:
-                                    html += f"""                                    <br>2. {exercise["substitution2"]}
-"""
-                                html += """                                </div>
-"""
-                            
-                            html += """                            </td>
+""",
+    "substitution": """                                    <br>{{number}}. {{substitution}}
+""",
+    "substitutions_end": """                                </div>
+""",
+    "exercise_end": """                            </td>
                         </tr>
                         
-"""
-                        
-                        html += """                    </table>
+""",
+    "day_end": """                    </table>
                 </div>
                 
-"""
-            else:
-                # Placeholder for weeks without data
-                html += f"""                <div class="workout-day">
-                    <div class="day-header">Week {week_num}</div>
-                    <p style="padding: 20px; text-align: center;">Week {week_num} content would follow the same structure as Week 1, with progressive overload applied.</p>
+""",
+    "week_placeholder": """                <div class="workout-day">
+                    <div class="day-header">Week {{week_num}}</div>
+                    <p style="padding: 20px; text-align: center;">Week {{week_num}} content would follow the same structure as Week 1, with progressive overload applied.</p>
                 </div>
-"""
+""",
+    "week_end": """            </div>
             
-            html += """            </div>
-            
-"""
+""",
+    "phase_end": """        </div>
         
-        html += """        </div>
-        
-"""
-    
-    # Footer and JavaScript
-    html += """    </div>
+""",
+    "footer": """    </div>
     
     <footer>
         <p>The Ultimate Push Pull Legs System - Save this page for offline use</p>
@@ -535,25 +505,389 @@ def generate_html(workout_data):
             localStorage.setItem('pplWorkoutData', JSON.stringify(workoutData));
         }
     </script>
-</body>
+""",
+    "document_end": """</body>
 </html>
 """
+}
+
+# Directory of the per-week fragments in a split bundle, relative to the shell page
+FRAGMENT_DIR = "fragments"
+
+# Manifest listing the fragment file of every week, inside FRAGMENT_DIR
+FRAGMENT_MANIFEST = "manifest.json"
+
+# Script appended to the shell page of a split bundle. It wraps showWeek()
+# so each week container is filled from its fragment the first time it is shown.
+# The manifest URL is filled in from FRAGMENT_DIR and FRAGMENT_MANIFEST.
+FRAGMENT_LOADER = """    <script>
+        // Load pre-rendered week fragments listed in the manifest on demand
+        const fragmentManifest = fetch({{manifest_url}}).then(response => response.json());
+        
+        function loadWeekFragment(phaseId, weekId) {
+            const container = document.getElementById(`${phaseId}-${weekId}`);
+            if (!container || container.dataset.loaded || container.children.length) {
+                return;
+            }
+            container.dataset.loaded = 'true';
+            
+            fragmentManifest
+                .then(manifest => fetch(manifest.fragments[`${phaseId}-${weekId}`]))
+                .then(response => response.text())
+                .then(html => {
+                    container.innerHTML = html;
+                })
+                .catch(() => {
+                    delete container.dataset.loaded;
+                });
+        }
+        
+        const showWeekInline = showWeek;
+        showWeek = function(phaseId, weekId) {
+            showWeekInline(phaseId, weekId);
+            loadWeekFragment(phaseId, weekId);
+        };
+    </script>
+""".replace("{{manifest_url}}", json.dumps(f"{FRAGMENT_DIR}/{FRAGMENT_MANIFEST}"))
+
+@lru_cache(maxsize=None)
+def compile_template(text):
+    """
+    Parse a template into its literal parts and slot names.
+    
+    Results are cached by template text, so each distinct template is only
+    parsed once no matter how many page variants use it.
+    
+    Args:
+        text (str): Template text with {{name}} slots
+        
+    Returns:
+        tuple: (literals, slots), where literals has one more item than slots
+    """
+    parts = SLOT_PATTERN.split(text)
+    return tuple(parts[0::2]), tuple(parts[1::2])
+
+def compile_templates(templates=None):
+    """
+    Compile the page templates, with optional overrides for a page variant.
+    
+    Args:
+        templates (dict, optional): Fragment name -> template text, replacing
+            the matching entries of PAGE_TEMPLATES
+        
+    Returns:
+        dict: Fragment name -> renderer. Static fragments map to their text,
+            other fragments to a function taking the slot values as keywords.
+    """
+    merged = dict(PAGE_TEMPLATES)
+    if templates:
+        merged.update(templates)
+    
+    return {name: _make_renderer(*compile_template(text)) for name, text in merged.items()}
+
+@lru_cache(maxsize=None)
+def _make_renderer(literals, slots):
+    """Return the static text of a fragment, or a function that fills its slots."""
+    if not slots:
+        return literals[0]
+    
+    def render(**values):
+        parts = [literals[0]]
+        for slot, literal in zip(slots, literals[1:]):
+            parts.append(str(values[slot]))
+            parts.append(literal)
+        return "".join(parts)
+    
+    return render
+
+def iter_week_html(t, phase_key, week_key, week_num, week_data, derived=None):
+    """
+    Render the content of one week container.
+    
+    Args:
+        t (dict): Compiled templates from compile_templates()
+        phase_key (str): Phase key, e.g. "phase1"
+        week_key (str): Week key, e.g. "week1"
+        week_num (int): Week number
+        week_data (dict): Day key -> exercises of the week, may be empty
+        derived (dict, optional): The week's "derived_weeks" entry when it was
+            derived by progression.fill_missing_weeks(); the week is labelled
+        
+    Yields:
+        str: Consecutive pieces of the week's HTML
+    """
+    if derived:
+        yield t["derived_note"](week_num=week_num, base_week=derived["base_week"])
+    
+    # If we have data for this week
+    if week_data:
+        # Generate workout days
+        for day_type in ["push1", "pull1", "legs1", "push2", "pull2", "legs2"]:
+            day_data = week_data.get(day_type, [])
+            if day_data:
+                day_name = day_type.replace("1", " #1").replace("2", " #2").title()
+                
+                yield t["day_start"](day_name=day_name)
+                yield t["table_header"]
+                metrics.count(EXERCISES_EMITTED, len(day_data))
+                
+                # Generate exercises
+                for i, exercise in enumerate(day_data):
+                    exercise_id = f"{phase_key}-{week_key}-{day_type}-ex{i}"
+                    
+                    # Exercise row
+                    yield t["exercise"](notes_id=f"{exercise_id}-notes", **exercise)
+                    
+                    # Add substitutions if available
+                    if exercise["substitution1"] or exercise["substitution2"]:
+                        yield t["substitutions_start"](subs_id=f"{exercise_id}-subs")
+                        if exercise["substitution1"]:
+                            yield t["substitution"](number=1, substitution=exercise["substitution1"])
+                        if exercise["substitution2"]:
+                            yield t["substitution"](number=2, substitution=exercise["substitution2"])
+                        yield t["substitutions_end"]
+                    
+                    yield t["exercise_end"]
+                
+                yield t["day_end"]
+    else:
+        # Placeholder for weeks without data
+        yield t["week_placeholder"](week_num=week_num)
+
+def iter_html(workout_data, templates=None, inline_weeks=None):
+    """
+    Render the HTML page for the workout data as a stream of chunks.
+    
+    Chunks are yielded in document order, so the page can be written out
+    without holding the whole document in memory.
+    
+    Args:
+        workout_data (dict): Workout data as loaded by load_workout_data()
+        templates (dict, optional): Template overrides, see compile_templates()
+        inline_weeks (set, optional): "{phase_key}-{week_key}" ids of the weeks
+            to render; other week containers are left empty. Defaults to all weeks.
+        
+    Yields:
+        str: Consecutive pieces of the HTML document
+    """
+    t = compile_templates(templates)
+    num_phases = workout_data.get("program_info", {}).get("phases", 3)
+    weeks_per_phase = workout_data.get("program_info", {}).get("weeks_per_phase", 6)
+    
+    yield t["head"]
+    
+    # Phase buttons
+    for phase_num in range(1, num_phases + 1):
+        active_class = " active" if phase_num == 1 else ""
+        yield t["phase_button"](active_class=active_class, phase_key=f"phase{phase_num}", phase_num=phase_num)
+    
+    yield t["header_end"]
+
+    # Generate content for each phase
+    for phase_num in range(1, num_phases + 1):
+        phase_key = f"phase{phase_num}"
+        phase_data = workout_data["phases"].get(phase_key, {})
+        phase_description = phase_data.get("description", f"Phase {phase_num}")
+        
+        # Phase content div
+        active_class = "active" if phase_num == 1 else ""
+        yield t["phase_start"](phase_num=phase_num, phase_key=phase_key,
+                               active_class=active_class, description=phase_description)
+        
+        # Week buttons
+        for week_num in range(1, weeks_per_phase + 1):
+            active_class = "active" if week_num == 1 else ""
+            yield t["week_button"](active_class=active_class, phase_key=phase_key,
+                                   week_key=f"week{week_num}", week_num=week_num)
+        
+        yield t["week_selector_end"]
+        
+        # Week content
+        for week_num in range(1, weeks_per_phase + 1):
+            week_key = f"week{week_num}"
+            week_data = phase_data.get("weeks", {}).get(week_key, {})
+            active_class = "active" if week_num == 1 else ""
+            
+            yield t["week_start"](week_num=week_num, phase_key=phase_key,
+                                  week_key=week_key, active_class=active_class)
+            
+            # Weeks left out of inline_weeks stay empty and are loaded as fragments
+            if inline_weeks is None or f"{phase_key}-{week_key}" in inline_weeks:
+                yield from iter_week_html(t, phase_key, week_key, week_num, week_data,
+                                          phase_data.get("derived_weeks", {}).get(week_key))
+            
+            yield t["week_end"]
+        
+        yield t["phase_end"]
+    
+    # Footer and JavaScript
+    yield t["footer"]
+    yield t["document_end"]
+
+def write_html(workout_data, f, templates=None, inline_weeks=None):
+    """
+    Stream the HTML page for the workout data into a file-like object.
+    
+    Args:
+        workout_data (dict): Workout data as loaded by load_workout_data()
+        f: Writable text file-like object
+        templates (dict, optional): Template overrides, see compile_templates()
+        inline_weeks (set, optional): Weeks to render, see iter_html()
+        
+    Returns:
+        int: Number of characters written
+    """
+    written = 0
+    for chunk in iter_html(workout_data, templates, inline_weeks):
+        f.write(chunk)
+        written += len(chunk)
+    return written
+
+def generate_html(workout_data, templates=None):
+    """Generate HTML from workout data"""
+    return "".join(iter_html(workout_data, templates))
+
+def write_split_bundle(workout_data, output_dir, templates=None, cache=None):
+    """
+    Write the page as a small shell plus one pre-rendered fragment per week.
+    
+    The shell contains the full page chrome with only the first week of the
+    first phase rendered; every other week container is filled on demand
+    from FRAGMENT_DIR/{phase_key}-{week_key}.html, as listed in the manifest.
+    
+    Args:
+        workout_data (dict): Workout data as loaded by load_workout_data()
+        output_dir (str): Directory for the shell page and the fragments
+        templates (dict, optional): Template overrides, see compile_templates()
+        cache (dict, optional): Build cache; unchanged fragments are not rewritten
+            and fragments of weeks that no longer exist are deleted
+        
+    Returns:
+        dict: Bytes of the shell page and of all fragments, and the number of
+            fragments written and skipped
+    """
+    t = compile_templates(templates)
+    fragment_dir = os.path.join(output_dir, FRAGMENT_DIR)
+    os.makedirs(fragment_dir, exist_ok=True)
+    
+    num_phases = workout_data.get("program_info", {}).get("phases", 3)
+    weeks_per_phase = workout_data.get("program_info", {}).get("weeks_per_phase", 6)
+    
+    manifest = {"fragments": {}}
+    summary = {"shell_bytes": 0, "fragment_bytes": 0, "written": 0, "skipped": 0}
+    fragment_keys = set()
+    
+    # One fragment per phase/week, named after the week container id
+    for phase_num in range(1, num_phases + 1):
+        phase_key = f"phase{phase_num}"
+        phase_data = workout_data["phases"].get(phase_key, {})
+        
+        for week_num in range(1, weeks_per_phase + 1):
+            week_key = f"week{week_num}"
+            week_id = f"{phase_key}-{week_key}"
+            week_data = phase_data.get("weeks", {}).get(week_key, {})
+            derived = phase_data.get("derived_weeks", {}).get(week_key)
+            path = os.path.join(fragment_dir, f"{week_id}.html")
+            manifest["fragments"][week_id] = f"{FRAGMENT_DIR}/{week_id}.html"
+            
+            key = f"fragment:{path}"
+            digest = hash_json({"week_id": week_id, "week": week_data, "derived": derived, "templates": templates})
+            fragment_keys.add(key)
+            
+            if cache is not None and get_fresh_entry(cache, key, digest):
+                summary["skipped"] += 1
+            else:
+                with open(path, "w", encoding="utf-8") as f:
+                    for chunk in iter_week_html(t, phase_key, week_key, week_num, week_data, derived):
+                        f.write(chunk)
+                summary["written"] += 1
+                metrics.count(FILES_WRITTEN)
+                metrics.count(BYTES_WRITTEN, os.path.getsize(path))
+                if cache is not None:
+                    record_entry(cache, key, digest, outputs=[path])
+            
+            summary["fragment_bytes"] += os.path.getsize(path)
+    
+    # Drop fragments of weeks that are no longer part of the program
+    if cache is not None:
+        prefix = f"fragment:{fragment_dir}{os.sep}"
+        for key in [key for key in cache["entries"] if key.startswith(prefix) and key not in fragment_keys]:
+            for path in remove_entry(cache, key):
+                print(f"Removed stale fragment: {path}")
+    
+    metrics.count(BYTES_WRITTEN, write_json(os.path.join(fragment_dir, FRAGMENT_MANIFEST), manifest))
+    metrics.count(FILES_WRITTEN)
+    
+    # Shell page with the loader script in front of </body>
+    shell_templates = dict(templates or {})
+    shell_templates["document_end"] = FRAGMENT_LOADER + shell_templates.get("document_end", PAGE_TEMPLATES["document_end"])
     
-    return html
+    shell_file = os.path.join(output_dir, HTML_FILE)
+    with open(shell_file, "w", encoding="utf-8") as f:
+        write_html(workout_data, f, shell_templates, inline_weeks={"phase1-week1"})
+    summary["shell_bytes"] = os.path.getsize(shell_file)
+    metrics.count(FILES_WRITTEN)
+    metrics.count(BYTES_WRITTEN, summary["shell_bytes"])
+    
+    return summary
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate the workout HTML page.")
+    parser.add_argument("--split", nargs="?", const=SPLIT_OUTPUT_DIR, metavar="DIR",
+                        help=f"Write a shell page plus lazy-loaded week fragments to DIR (default: {SPLIT_OUTPUT_DIR})")
+    add_derive_arguments(parser)
+    add_arguments(parser)
+    args = parser.parse_args()
+    apply_arguments(args)
+    
     # Load workout data
     json_file = "The Ultimate Push Pull Legs System - 6x (2)_workout_data.json"
-    workout_data = load_workout_data(json_file)
+    with metrics.stage("load_source"):
+        workout_data = load_workout_data(json_file)
+    if args.derive_missing_weeks:
+        with metrics.stage("derive_weeks"):
+            workout_data, derived = fill_missing_weeks(workout_data)
+        if derived:
+            print(f"Derived {len(derived)} missing weeks from the existing ones")
     
-    # Generate HTML
-    html = generate_html(workout_data)
+    cache = load_cache()
     
-    # Write HTML to file
-    with open("ppl-workout-html.html", "w") as f:
-        f.write(html)
+    if args.split:
+        with metrics.stage("render_split"):
+            summary = write_split_bundle(workout_data, args.split, cache=cache)
+        with metrics.stage("precompress"):
+            for path in remove_orphans([args.split], cache):
+                print(f"Removed orphaned sibling: {path}")
+            print_summary(precompress(find_artifacts([args.split]), cache))
+        save_cache(cache)
+        
+        print(f"Split bundle generated in {args.split}: {summary['written']} fragments written, "
+              f"{summary['skipped']} unchanged")
+        print(f"Shell page: {summary['shell_bytes']} bytes, fragments: {summary['fragment_bytes']} bytes")
+    else:
+        # Skip the page if the workout data and the generators are unchanged
+        key = f"html:{HTML_FILE}"
+        digest = hash_json(workout_data)
+        if get_fresh_entry(cache, key, digest):
+            print(f"HTML file unchanged: {HTML_FILE}")
+        else:
+            # Stream the HTML straight to the file
+            with metrics.stage("render_html"):
+                with open(HTML_FILE, "w", encoding="utf-8") as f:
+                    write_html(workout_data, f)
+            # Count the encoded size on disk; write_html() returns characters
+            metrics.count(BYTES_WRITTEN, os.path.getsize(HTML_FILE))
+            metrics.count(FILES_WRITTEN)
+            
+            record_entry(cache, key, digest, outputs=[HTML_FILE])
+            print(f"HTML file generated: {HTML_FILE}")
+        
+        # Write .gz/.br siblings of the page for the static host
+        with metrics.stage("precompress"):
+            print_summary(precompress([HTML_FILE], cache))
+        save_cache(cache)
     
-    print(f"HTML file generated: ppl-workout-html.html")
+    finish(args.metrics)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -5,9 +5,22 @@ This script reads the workout data from the source JSON file and
 transforms it into the format required by the app.
 """
 
-import json
+import argparse
 import os
+import time
 import urllib.parse
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from build_cache import get_fresh_entry, hash_json, load_cache, record_entry, remove_entry, save_cache
+from build_metrics import BYTES_WRITTEN, EXERCISES_EMITTED, FILES_WRITTEN, add_arguments, apply_arguments, detail, finish, metrics
+from json_io import load_json, loads, write_json
+from compact_program import COMPACT_FILE, WEEK_FILE_PATTERN, load_week_files, write_compact
+from precache_manifest import MANIFEST_FILE, write_manifest
+from precompress import find_artifacts, precompress, print_summary, remove_orphans
+from prescriptions import add_targets
+from progression import add_derive_arguments, fill_missing_weeks
 
 # Source file containing all workout data
 SOURCE_FILE = "The Ultimate Push Pull Legs System - 6x (2)_workout_data.json"
@@ -15,14 +28,16 @@ SOURCE_FILE = "The Ultimate Push Pull Legs System - 6x (2)_workout_data.json"
 # Output directory for the generated JSON files
 OUTPUT_DIR = "ppl-workout/dev/exercise-data"
 
-# Ensure output directory exists
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+# Exercise library file, written to OUTPUT_DIR
+LIBRARY_FILE = "exercise-library.json"
 
+@lru_cache(maxsize=None)
 def generate_exercise_id(name):
     """Generate a kebab-case ID from an exercise name."""
     # Convert to lowercase and replace spaces with hyphens
     return name.lower().replace(" ", "-").replace("(", "").replace(")", "").replace(",", "")
 
+@lru_cache(maxsize=None)
 def generate_exercise_link(name):
     """Generate a YouTube search link for the exercise."""
     # Create a search query for "how to do [exercise name]"
@@ -32,44 +47,157 @@ def generate_exercise_link(name):
     # Return the YouTube search URL
     return f"https://www.youtube.com/results?search_query={encoded_query}"
 
-def transform_exercise(exercise):
-    """Transform an exercise from the source format to the app format."""
-    # Create a unique ID for the exercise
-    exercise_id = generate_exercise_id(exercise["name"])
-    
-    # Format the rest time (remove ~ and convert to shorter format)
-    rest = exercise.get("rest", "")
-    if rest:
-        rest = rest.replace("~", "").replace(" min", "m")
-    
-    # Create substitutions array from substitution1 and substitution2
+def exercise_substitutions(exercise):
+    """Return the substitutions array of an exercise from substitution1 and substitution2."""
     substitutions = []
     if "substitution1" in exercise and exercise["substitution1"]:
         substitutions.append(exercise["substitution1"])
     if "substitution2" in exercise and exercise["substitution2"]:
         substitutions.append(exercise["substitution2"])
+    return substitutions
+
+def transform_exercise(exercise, shared=None):
+    """
+    Transform an exercise from the source format to the app format.
+    
+    Args:
+        exercise (dict): Exercise in the source format
+        shared (dict, optional): The id and link of the exercise, as
+            returned by library_fields(); derived from its name when not
+            given. Notes and substitutions always come from the exercise.
+    """
+    if shared is None:
+        shared = {
+            # Create a unique ID for the exercise
+            "id": generate_exercise_id(exercise["name"]),
+            # Generate a YouTube search link for the exercise
+            "link": generate_exercise_link(exercise["name"])
+        }
     
-    # Generate a YouTube search link for the exercise
-    link = generate_exercise_link(exercise["name"])
+    # Format the rest time (remove ~ and convert to shorter format)
+    rest = exercise.get("rest", "")
+    if rest:
+        rest = rest.replace("~", "").replace(" min", "m")
     
     # Create the transformed exercise
     transformed = {
-        "id": exercise_id,
+        "id": shared["id"],
         "name": exercise["name"],
         "warmup_sets": exercise.get("warmup_sets", ""),
         "working_sets": exercise.get("working_sets", ""),
         "reps": exercise.get("reps", ""),
         "rpe": exercise.get("rpe", ""),
         "rest": rest,
-        "link": link,
+        "link": shared["link"],
         "notes": exercise.get("notes", ""),
-        "substitutions": substitutions
+        "substitutions": exercise_substitutions(exercise)
     }
     
     return transformed
 
-def generate_workout_file(phase, week, data):
-    """Generate a workout JSON file for a specific phase and week."""
+def build_exercise_library(data):
+    """
+    Build an index of the unique exercises in the source data, in one pass.
+    
+    Exercises are keyed by the same id used in the week files, so a week
+    exercise can be looked up with library["exercises"][exercise["id"]].
+    An entry holds only what every occurrence shares: the name and link of
+    the first occurrence, and the notes and substitutions used by most
+    occurrences as defaults. The text of a particular week stays in its
+    week file.
+    
+    Args:
+        data (dict): Source workout data
+        
+    Returns:
+        dict: Library with an "exercises" map of id -> name, link, notes
+            and substitutions
+    """
+    exercises = {}
+    variants = {}
+    
+    for phase_data in data["phases"].values():
+        for week_data in phase_data["weeks"].values():
+            for day_exercises in week_data.values():
+                if not isinstance(day_exercises, list):
+                    continue
+                
+                for exercise in day_exercises:
+                    exercise_id = generate_exercise_id(exercise["name"])
+                    if exercise_id not in exercises:
+                        exercises[exercise_id] = {
+                            "name": exercise["name"],
+                            "link": generate_exercise_link(exercise["name"])
+                        }
+                        variants[exercise_id] = Counter()
+                    variants[exercise_id][(exercise.get("notes", ""), tuple(exercise_substitutions(exercise)))] += 1
+                    
+    # Ties go to the variant seen first
+    for exercise_id, entry in exercises.items():
+        notes, substitutions = variants[exercise_id].most_common(1)[0][0]
+        entry["notes"] = notes
+        entry["substitutions"] = list(substitutions)
+    
+    return {"exercises": exercises}
+
+def library_fields(library, exercise):
+    """
+    Return the id and link of an exercise from the library.
+    
+    Names that only differ in spaces and hyphens share an id; an exercise
+    whose name differs from its library entry gets the link of its own name.
+    
+    Returns:
+        dict: "id" and "link"
+    """
+    exercise_id = generate_exercise_id(exercise["name"])
+    entry = library["exercises"][exercise_id]
+    link = entry["link"] if exercise["name"] == entry["name"] else generate_exercise_link(exercise["name"])
+    return {"id": exercise_id, "link": link}
+
+def write_exercise_library(library, output_dir=OUTPUT_DIR):
+    """Write the exercise library to output_dir and return its path."""
+    os.makedirs(output_dir, exist_ok=True)
+    filename = os.path.join(output_dir, LIBRARY_FILE)
+    metrics.count(BYTES_WRITTEN, write_json(filename, library))
+    metrics.count(FILES_WRITTEN)
+    return filename
+
+def week_metadata(phase_data, week):
+    """
+    Return the week file keys that mark deload weeks and weeks derived by
+    progression.fill_missing_weeks(), so the app can label them.
+    
+    Args:
+        phase_data (dict): Phase of the source data
+        week (int): Week number
+    
+    Returns:
+        dict: "deload": true for deload weeks, "derived": true and the
+            "base_week" it was derived from for derived weeks; empty for
+            ordinary weeks of the source program
+    """
+    metadata = {}
+    if week in phase_data.get("deload_weeks", []):
+        metadata["deload"] = True
+    derived = phase_data.get("derived_weeks", {}).get(f"week{week}")
+    if derived:
+        metadata["derived"] = True
+        metadata["base_week"] = derived["base_week"]
+    return metadata
+
+def generate_workout_file(phase, week, data, output_dir=OUTPUT_DIR, library=None):
+    """
+    Generate a workout JSON file for a specific phase and week.
+    
+    The id and link of every exercise are taken from library, built once
+    for the whole program by main(); without one, the library is built
+    from data for this call. Notes and substitutions are those of the
+    week, which may differ from the library's defaults.
+    """
+    if library is None:
+        library = build_exercise_library(data)
+    
     # Get the phase description
     phase_data = data["phases"][f"phase{phase}"]
     phase_description = phase_data["description"]
@@ -87,6 +215,7 @@ def generate_workout_file(phase, week, data):
         "phase": phase,
         "week": week,
         "description": phase_description,
+        **week_metadata(phase_data, week),
         "days": {}
     }
     
@@ -105,8 +234,9 @@ def generate_workout_file(phase, week, data):
         elif day.startswith("legs"):
             day_title = f"Legs #{day[-1]}"
         
-        # Transform exercises
-        transformed_exercises = [transform_exercise(ex) for ex in exercises]
+        # Transform exercises, with the shared fields from the library
+        transformed_exercises = [transform_exercise(ex, library_fields(library, ex)) for ex in exercises]
+        metrics.count(EXERCISES_EMITTED, len(transformed_exercises))
         
         # Add to output
         output["days"][day] = {
@@ -114,81 +244,230 @@ def generate_workout_file(phase, week, data):
             "exercises": transformed_exercises
         }
     
+    # Add numeric targets for the prescriptions of the whole week in one pass
+    add_targets(exercise for day in output["days"].values() for exercise in day["exercises"])
+    
+    # Ensure output directory exists
+    os.makedirs(output_dir, exist_ok=True)
+    
     # Write to file
-    filename = f"{OUTPUT_DIR}/phase{phase}-week{week}.json"
-    with open(filename, "w") as f:
-        json.dump(output, f, indent=2)
+    filename = f"{output_dir}/phase{phase}-week{week}.json"
+    metrics.count(BYTES_WRITTEN, write_json(filename, output))
+    metrics.count(FILES_WRITTEN)
     
-    print(f"Generated {filename}")
+    detail(f"Generated {filename}")
     return True
 
-def update_existing_files_with_links():
-    """Update existing JSON files with exercise links."""
-    # Get a list of all JSON files in the output directory
-    json_files = [f for f in os.listdir(OUTPUT_DIR) if f.endswith('.json')]
+def file_signature(path):
+    """Return a cheap change signature of a file: its mtime in ns and its size."""
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+def add_missing_links(filepath):
+    """
+    Fill in the empty exercise links of one week file.
     
-    updated_count = 0
+    Returns:
+        tuple: (whether the file was rewritten, bytes read, bytes written)
+    """
+    with open(filepath, 'rb') as f:
+        raw = f.read()
+    data = loads(raw)
+    
+    # Flag to track if the file needs to be updated
+    needs_update = False
+    
+    # Update links for each exercise in each day
+    for day_key, day_data in data['days'].items():
+        for exercise in day_data['exercises']:
+            # If the link is empty, generate a new one
+            if not exercise['link']:
+                exercise['link'] = generate_exercise_link(exercise['name'])
+                needs_update = True
+    
+    # If the file needs to be updated, replace it atomically
+    if needs_update:
+        return True, len(raw), write_json(filepath, data)
+    return False, len(raw), 0
+
+def update_existing_files_with_links(output_dir=OUTPUT_DIR, cache=None, workers=None):
+    """
+    Update existing JSON files with exercise links.
     
+    Files are checked in a thread pool. With a build cache, files whose
+    mtime and size match the last check are skipped without being read.
+    
+    Args:
+        output_dir (str): Directory containing the week files
+        cache (dict, optional): Build cache with the signatures of checked files
+        workers (int, optional): Number of threads. Defaults to the executor default.
+    
+    Returns:
+        dict: Counts of updated, checked and skipped files, bytes read and
+            written, and elapsed seconds
+    """
+    start = time.perf_counter()
+    
+    # Get a list of all week JSON files in the output directory
+    json_files = sorted(f for f in os.listdir(output_dir) if WEEK_FILE_PATTERN.match(f))
+    summary = {"updated": 0, "checked": 0, "skipped": 0, "bytes_read": 0, "bytes_written": 0}
+    
+    # Forget the signatures of files that were removed
+    if cache is not None:
+        prefix = f"links:{os.path.join(output_dir, '')}"
+        current = {f"links:{os.path.join(output_dir, filename)}" for filename in json_files}
+        for key in [key for key in cache["entries"] if key.startswith(prefix) and key not in current]:
+            remove_entry(cache, key)
+    
+    # Skip files that have not changed since they were last found complete
+    pending = []
     for filename in json_files:
-        filepath = os.path.join(OUTPUT_DIR, filename)
-        
-        # Read the file
-        with open(filepath, 'r') as f:
-            data = json.load(f)
-        
-        # Flag to track if the file needs to be updated
-        needs_update = False
-        
-        # Update links for each exercise in each day
-        for day_key, day_data in data['days'].items():
-            for exercise in day_data['exercises']:
-                # If the link is empty, generate a new one
-                if not exercise['link']:
-                    exercise['link'] = generate_exercise_link(exercise['name'])
-                    needs_update = True
-        
-        # If the file needs to be updated, write the changes
-        if needs_update:
-            with open(filepath, 'w') as f:
-                json.dump(data, f, indent=2)
-            updated_count += 1
-            print(f"Updated links in {filename}")
+        filepath = os.path.join(output_dir, filename)
+        if cache is not None and get_fresh_entry(cache, f"links:{filepath}", file_signature(filepath)):
+            summary["skipped"] += 1
+        else:
+            pending.append(filepath)
     
-    print(f"\nUpdated links in {updated_count} existing files.")
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for filepath, (updated, bytes_read, bytes_written) in zip(pending, executor.map(add_missing_links, pending)):
+            summary["checked"] += 1
+            summary["bytes_read"] += bytes_read
+            summary["bytes_written"] += bytes_written
+            if updated:
+                summary["updated"] += 1
+                detail(f"Updated links in {os.path.basename(filepath)}")
+            if cache is not None:
+                record_entry(cache, f"links:{filepath}", file_signature(filepath))
+    
+    summary["seconds"] = time.perf_counter() - start
+    metrics.count(BYTES_WRITTEN, summary["bytes_written"])
+    metrics.count(FILES_WRITTEN, summary["updated"])
+    rate = summary["checked"] / summary["seconds"] if summary["seconds"] else 0
+    print(f"\nUpdated links in {summary['updated']} existing files "
+          f"({summary['checked']} checked at {rate:.0f} files/s, {summary['skipped']} unchanged skipped).")
+    return summary
 
 def main():
     """Main function to generate all workout files."""
+    parser = argparse.ArgumentParser(description="Generate the workout JSON files for the app.")
+    add_derive_arguments(parser)
+    add_arguments(parser)
+    args = parser.parse_args()
+    apply_arguments(args)
+    
+    # Ensure output directory exists
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    
     # Load the source data
-    with open(SOURCE_FILE, "r") as f:
-        data = json.load(f)
+    with metrics.stage("load_source"):
+        data = load_json(SOURCE_FILE)
+    
+    # Derive the weeks missing from the source file from the existing ones, if asked
+    if args.derive_missing_weeks:
+        with metrics.stage("derive_weeks"):
+            data, derived = fill_missing_weeks(data)
+        for phase_key, week_key, base_key, kind in derived:
+            detail(f"Derived {phase_key}-{week_key} from {base_key} ({kind})")
     
     # Get the number of phases and weeks per phase
     num_phases = data["program_info"]["phases"]
     weeks_per_phase = data["program_info"]["weeks_per_phase"]
     
+    # Index the unique exercises once; the week files take their shared fields from it
+    with metrics.stage("exercise_library"):
+        library = build_exercise_library(data)
+    
+    # Build cache of the week slices each file was generated from
+    cache = load_cache()
+    
     # Count of generated files
     generated_count = 0
     skipped_count = 0
+    generated = []
+    week_keys = set()
     
     # Generate files for each phase and week
-    for phase in range(1, num_phases + 1):
-        for week in range(1, weeks_per_phase + 1):
-            # Skip files that already exist
-            filename = f"{OUTPUT_DIR}/phase{phase}-week{week}.json"
-            if os.path.exists(filename):
-                print(f"Skipping existing file: {filename}")
-                skipped_count += 1
-                continue
+    with metrics.stage("generate_weeks"):
+        for phase in range(1, num_phases + 1):
+            phase_data = data["phases"].get(f"phase{phase}", {})
             
-            # Generate the file
-            if generate_workout_file(phase, week, data):
-                generated_count += 1
+            for week in range(1, weeks_per_phase + 1):
+                filename = f"{OUTPUT_DIR}/phase{phase}-week{week}.json"
+                key = f"week:{filename}"
+                week_keys.add(key)
+                week_data = phase_data.get("weeks", {}).get(f"week{week}")
+                
+                # Remove files generated from a week that no longer exists
+                if week_data is None:
+                    for path in remove_entry(cache, key):
+                        print(f"Removed stale file: {path}")
+                    print(f"Skipping phase{phase}-week{week}.json - data not found in source file")
+                    continue
+                
+                # Skip files whose week slice is unchanged
+                digest = hash_json({"description": phase_data["description"], "week": week_data,
+                                    "metadata": week_metadata(phase_data, week)})
+                if get_fresh_entry(cache, key, digest):
+                    detail(f"Skipping unchanged file: {filename}")
+                    skipped_count += 1
+                    continue
+                
+                # Generate the file
+                if generate_workout_file(phase, week, data, library=library):
+                    generated_count += 1
+                    generated.append((key, digest, filename))
+    
+    # Remove files of weeks and phases that are no longer part of the program
+    prefix = f"week:{OUTPUT_DIR}/"
+    for key in [key for key in cache["entries"] if key.startswith(prefix) and key not in week_keys]:
+        for path in remove_entry(cache, key):
+            print(f"Removed stale file: {path}")
     
     # Update existing files with links
-    update_existing_files_with_links()
+    with metrics.stage("update_links"):
+        update_existing_files_with_links(cache=cache)
+    
+    # Record the generated files once their content is final
+    for key, digest, filename in generated:
+        record_entry(cache, key, digest, outputs=[filename])
+    
+    # Write the index of unique exercises referenced by id from the week files
+    library_file = write_exercise_library(library)
+    print(f"Generated {library_file} ({len(library['exercises'])} exercises)")
+    
+    # Write the deduplicated program alongside the week files, unless the week files are unchanged
+    compact_file = os.path.join(OUTPUT_DIR, COMPACT_FILE)
+    with metrics.stage("compact_program"):
+        weeks = load_week_files(OUTPUT_DIR)
+        compact_key = f"compact:{compact_file}"
+        compact_digest = hash_json(weeks)
+        if get_fresh_entry(cache, compact_key, compact_digest):
+            detail(f"Skipping unchanged file: {compact_file}")
+        else:
+            compact_bytes = write_compact(weeks, compact_file)
+            record_entry(cache, compact_key, compact_digest, outputs=[compact_file])
+            metrics.count(BYTES_WRITTEN, compact_bytes)
+            metrics.count(FILES_WRITTEN)
+            print(f"Generated {compact_file} ({compact_bytes} bytes)")
+    
+    # List the final files with their hashes for the service worker
+    with metrics.stage("precache_manifest"):
+        manifest = write_manifest(OUTPUT_DIR)
+    metrics.count(FILES_WRITTEN)
+    print(f"Generated {os.path.join(OUTPUT_DIR, MANIFEST_FILE)} ({len(manifest['assets'])} assets)")
+    
+    # Write .gz/.br siblings of every changed JSON file for the static host
+    with metrics.stage("precompress"):
+        for path in remove_orphans([OUTPUT_DIR], cache):
+            print(f"Removed orphaned sibling: {path}")
+        compressed = precompress(find_artifacts([OUTPUT_DIR]), cache)
+    metrics.count("files_precompressed", compressed["compressed"])
+    print_summary(compressed)
+    save_cache(cache)
     
     print(f"\nSummary: {generated_count} files generated, {skipped_count} files skipped.")
     print("All workout files generated successfully!")
+    finish(args.metrics)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
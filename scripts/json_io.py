@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Shared JSON serialization for the generator scripts.
+Two output modes are available: "pretty" (indent=2, the default, for
+readable diffs) and "minified" (no whitespace, for production). The mode
+is taken from the PPL_JSON_MODE environment variable or set_mode().
+
+When orjson is installed it is used for encoding and decoding; otherwise
+the stdlib json module is used. Both backends write UTF-8 without
+escaping non-ASCII characters and both reject NaN and infinity, so their
+output is the same except for floats that repr() writes in exponent
+notation: orjson writes 1e16 and 0.00001 where the stdlib writes 1e+16
+and 1e-05. Both parse to the same value; since the bytes can differ, the
+backend is part of the build cache's generator version.
+
+Usage:
+    python json_io.py --benchmark
+    PPL_JSON_MODE=minified python generate_workout_json.py
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Output modes
+PRETTY = "pretty"
+MINIFIED = "minified"
+MODES = [PRETTY, MINIFIED]
+
+# Environment variable that selects the output mode
+MODE_VARIABLE = "PPL_JSON_MODE"
+
+# Files used by the benchmark, relative to the scripts directory
+BENCHMARK_FILES = [
+    "The Ultimate Push Pull Legs System - 6x (2)_workout_data.json",
+    "../dev/exercise-data/phase1-week1.json"
+]
+
+_mode = None
+
+def get_mode():
+    """Return the current output mode."""
+    global _mode
+    if _mode is None:
+        set_mode(os.environ.get(MODE_VARIABLE, PRETTY))
+    return _mode
+
+def set_mode(mode):
+    """
+    Select the output mode for every later dump.
+    
+    Raises:
+        ValueError: If mode is not one of MODES
+    """
+    global _mode
+    if mode not in MODES:
+        raise ValueError(f"Unknown JSON mode '{mode}', expected one of: {', '.join(MODES)}")
+    _mode = mode
+
+def backend_name():
+    """Return the name of the encoder in use."""
+    return "orjson" if orjson is not None else "json"
+
+def _check_finite(data):
+    """Raise ValueError for NaN or infinity anywhere in data, as json.dumps(allow_nan=False) does."""
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+        elif isinstance(value, float) and (value != value or value in (float("inf"), float("-inf"))):
+            raise ValueError(f"Out of range float values are not JSON compliant: {value!r}")
+
+def _dump_stdlib(data, mode):
+    if mode == MINIFIED:
+        text = json.dumps(data, separators=(',', ':'), ensure_ascii=False, allow_nan=False)
+    else:
+        text = json.dumps(data, indent=2, ensure_ascii=False, allow_nan=False)
+    return text.encode("utf-8")
+
+def _dump_orjson(data, mode):
+    raw = orjson.dumps(data, option=orjson.OPT_INDENT_2 if mode == PRETTY else 0)
+    # orjson writes NaN and infinity as null; only output with a null can hold one
+    if b"null" in raw:
+        _check_finite([data])
+    return raw
+
+def dump_bytes(data, mode=None, backend=None):
+    """
+    Serialize data to UTF-8 encoded JSON.
+    
+    Args:
+        data: JSON-serializable value
+        mode (str, optional): Output mode. Defaults to get_mode().
+        backend (str, optional): "json" or "orjson". Defaults to backend_name().
+    
+    Returns:
+        bytes: JSON text encoded as UTF-8
+    
+    Raises:
+        ValueError: If data holds NaN or infinity
+    """
+    mode = mode or get_mode()
+    if (backend or backend_name()) == "orjson":
+        try:
+            return _dump_orjson(data, mode)
+        except TypeError:
+            # Values orjson rejects (non-string keys, huge ints, ...) go through the stdlib
+            pass
+    return _dump_stdlib(data, mode)
+
+def dumps(data, mode=None, backend=None):
+    """Serialize data to a JSON string, see dump_bytes()."""
+    return dump_bytes(data, mode, backend).decode("utf-8")
+
+def write_json(path, data, mode=None):
+    """
+    Write data as a JSON file.
+    
+    The file is written next to its destination and renamed into place,
+    so readers never see a partially written file.
+    
+    Returns:
+        int: Number of bytes written
+    """
+    raw = dump_bytes(data, mode)
+    tmp_file = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_file, 'wb') as f:
+            f.write(raw)
+        os.replace(tmp_file, path)
+    except BaseException:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+    return len(raw)
+
+def loads(text):
+    """Parse JSON text or bytes."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+def load_json(path):
+    """Read and parse a JSON file."""
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+def benchmark(paths, repeat=20):
+    """
+    Time every backend and mode on the given files.
+    
+    Returns:
+        list: Dicts with file, backend, mode, bytes, dump_ms and load_ms
+    """
+    backends = ["json"] + (["orjson"] if orjson is not None else [])
+    results = []
+    
+    for path in paths:
+        with open(path, 'rb') as f:
+            data = json.loads(f.read())
+        
+        for backend in backends:
+            for mode in MODES:
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    raw = dump_bytes(data, mode, backend)
+                dump_ms = (time.perf_counter() - start) * 1000 / repeat
+                
+                parse = orjson.loads if backend == "orjson" else json.loads
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    parse(raw)
+                load_ms = (time.perf_counter() - start) * 1000 / repeat
+                
+                results.append({
+                    "file": os.path.basename(path),
+                    "backend": backend,
+                    "mode": mode,
+                    "bytes": len(raw),
+                    "dump_ms": dump_ms,
+                    "load_ms": load_ms
+                })
+    
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the JSON backends and output modes on the workout data.")
+    parser.add_argument("--benchmark", nargs="*", metavar="FILE",
+                        help="JSON files to benchmark (default: the workout data and a week file)")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per measurement (default: 20)")
+    args = parser.parse_args()
+    
+    if args.benchmark is None:
+        parser.print_help()
+        return
+    
+    paths = args.benchmark or [path for path in BENCHMARK_FILES if os.path.exists(path)]
+    print(f"{'file':<40} {'backend':<8} {'mode':<9} {'bytes':>9} {'dump ms':>9} {'load ms':>9}")
+    for result in benchmark(paths, args.repeat):
+        print(f"{result['file'][:40]:<40} {result['backend']:<8} {result['mode']:<9} {result['bytes']:>9} "
+              f"{result['dump_ms']:>9.2f} {result['load_ms']:>9.2f}")
+
+if __name__ == "__main__":
+    main()
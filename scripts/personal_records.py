@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Personal-record engine with the same rules as checkPersonalRecord() in
+assets/js/workout-storage.js. A set is a new PR for its exercise when there
+is no PR yet, when it is heavier, when it has the same weight and more reps,
+or when its volume (weight x reps) beats the volume of the current PR.
+
+PersonalRecordIndex applies the rules incrementally as sets stream in, and
+rebuild_history() replays a whole set table (see workout_analytics.py).
+
+Both engines and the JS function are checked against the same fixture
+cases, personal-record-fixtures.json; --check-fixtures runs the Python
+side and, when Node.js is installed, dev scripts/check-personal-records.js.
+
+Usage:
+    python personal_records.py exports/ppl-workout-data-2024-05-01.json --athlete alex
+    python personal_records.py --check-fixtures
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from workout_analytics import EXERCISE_KEYS, add_athlete_arguments, find_exports, iter_sessions, load_sets
+
+# Columns of a PR history, in order
+HISTORY_COLUMNS = ["athlete", "exerciseId", "date", "phase", "week", "day", "setIndex", "weight", "reps", "volume"]
+
+# Fixture cases shared with the JS check, next to this script
+FIXTURE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "personal-record-fixtures.json")
+
+# Node.js script that runs the fixture cases through checkPersonalRecord()
+JS_CHECK_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "dev scripts",
+                               "check-personal-records.js")
+
+def is_personal_record(current, weight, reps):
+    """
+    Check a set against the current PR of its exercise.
+    
+    Args:
+        current (dict): Current PR with "weight" and "reps", or None
+        weight (float): Weight of the set
+        reps (int): Reps of the set
+    
+    Returns:
+        bool: Whether the set is a new PR
+    """
+    # Missing, zero or NaN weight or reps never count
+    if not weight or not reps or weight != weight or reps != reps:
+        return False
+    
+    if not current or weight > current["weight"]:
+        return True
+    if weight == current["weight"] and reps > current["reps"]:
+        return True
+    return weight * reps > current["weight"] * current["reps"]
+
+def today():
+    """Return today's UTC date as YYYY-MM-DD, like new Date().toISOString().split('T')[0]."""
+    return datetime.now(timezone.utc).date().isoformat()
+
+class PersonalRecordIndex:
+    """
+    Per-exercise PR index, updated in O(1) per set.
+    
+    records has the personalRecords layout of pplWorkoutData:
+    exerciseId -> {"weight", "reps", "date", "volume"}.
+    """
+    
+    def __init__(self, records=None):
+        self.records = dict(records or {})
+    
+    def update(self, exercise_id, weight, reps, date=None):
+        """
+        Record a set and return whether it is a new PR.
+        
+        Args:
+            exercise_id (str): Exercise identifier
+            weight (float): Weight of the set
+            reps (int): Reps of the set; fractions are truncated like parseInt()
+            date (str, optional): Date stored with a new PR. Defaults to today.
+        
+        Returns:
+            bool: Whether the set is a new PR
+        """
+        if reps and reps == reps:
+            reps = int(reps)
+        if not is_personal_record(self.records.get(exercise_id), weight, reps):
+            return False
+        
+        self.records[exercise_id] = {
+            "weight": weight,
+            "reps": reps,
+            "date": date or today(),
+            "volume": weight * reps
+        }
+        return True
+    
+    def update_day(self, exercises, date=None):
+        """
+        Record every set of a logged day, like checkForPersonalRecords().
+        
+        Args:
+            exercises (dict): exerciseId -> {"sets": [...]} as stored in progress
+            date (str, optional): Date stored with new PRs
+        
+        Returns:
+            list: Exercise ids that got a new PR
+        """
+        improved = []
+        for exercise_id, exercise in exercises.items():
+            for s in exercise.get("sets") or []:
+                if s.get("weight") and s.get("reps") and self.update(exercise_id, s["weight"], s["reps"], date):
+                    if exercise_id not in improved:
+                        improved.append(exercise_id)
+        return improved
+
+def replay_export(data, index=None):
+    """
+    Rebuild the personal records of an export from its logged sets.
+    
+    Days are replayed in date order (undated days last), and each new PR
+    is stored with the date of the day it was logged on.
+    
+    Args:
+        data (dict): Parsed pplWorkoutData export
+        index (PersonalRecordIndex, optional): Index to update. Defaults to a new one.
+    
+    Returns:
+        PersonalRecordIndex: The updated index
+    """
+    index = index if index is not None else PersonalRecordIndex()
+    sessions = sorted(iter_sessions(data), key=lambda session: (session[4].get("date") is None,
+                                                                session[4].get("date") or "",
+                                                                session[0], session[1], session[2]))
+    for _, _, _, _, day_data in sessions:
+        index.update_day(day_data.get("exercises") or {}, day_data.get("date"))
+    return index
+
+def rebuild_history(sets):
+    """
+    Replay a set table and return every set that was a PR when it was logged.
+    
+    Validity, rep truncation and grouping are computed for the whole table
+    with NumPy; the PR rules themselves are applied in one pass over the
+    remaining sets, since whether a set is a PR depends on the PR it meets.
+    
+    Args:
+        sets (DataFrame): Set table from workout_analytics.load_sets(),
+            in chronological order per athlete
+    
+    Returns:
+        DataFrame: PR history with the HISTORY_COLUMNS columns, in
+            chronological order per athlete and exercise
+    """
+    weight = sets["weight"].to_numpy(dtype=np.float64)
+    reps = np.trunc(sets["reps"].to_numpy(dtype=np.float64))
+    valid = (weight != 0) & ~np.isnan(weight) & (reps != 0) & ~np.isnan(reps)
+    
+    # Group the valid sets by athlete and exercise, keeping chronological order inside each group
+    candidates = sets[valid].assign(reps=reps[valid])
+    candidates = candidates.sort_values(EXERCISE_KEYS, kind="stable")
+    group = candidates.groupby(EXERCISE_KEYS, observed=True, sort=False).ngroup().to_numpy()
+    starts = np.ones(len(group), dtype=bool)
+    starts[1:] = group[1:] != group[:-1]
+    
+    is_record = np.zeros(len(candidates), dtype=bool)
+    current = None
+    for i, (start, w, r) in enumerate(zip(starts.tolist(), candidates["weight"].tolist(), candidates["reps"].tolist())):
+        if start:
+            current = None
+        if is_personal_record(current, w, r):
+            current = {"weight": w, "reps": r}
+            is_record[i] = True
+    
+    history = candidates[is_record].copy()
+    history["reps"] = history["reps"].astype(np.int64)
+    history["volume"] = history["weight"] * history["reps"]
+    return history[HISTORY_COLUMNS].reset_index(drop=True)
+
+def current_records(history):
+    """
+    Return the final PR of every athlete and exercise from a PR history.
+    
+    Returns:
+        dict: athlete -> personalRecords dict (exerciseId -> weight, reps, date, volume)
+    """
+    latest = history.groupby(EXERCISE_KEYS, observed=True, sort=True).tail(1)
+    records = {}
+    for row in latest.itertuples(index=False):
+        records.setdefault(row.athlete, {})[row.exerciseId] = {
+            "weight": row.weight,
+            "reps": int(row.reps),
+            "date": row.date.strftime("%Y-%m-%d") if not pd.isna(row.date) else None,
+            "volume": row.volume
+        }
+    return records
+
+def _records_without_dates(records):
+    """Return personalRecords entries as (exerciseId, weight, reps, volume) tuples, sorted."""
+    return sorted((exercise_id, pr["weight"], pr["reps"], pr["volume"]) for exercise_id, pr in records.items())
+
+def fixture_set_table(sets):
+    """
+    Build a set table for rebuild_history() from the sets of a fixture case.
+    
+    Every set gets its position in the case as setIndex, so PR history
+    rows can be matched back to the sets.
+    """
+    return pd.DataFrame({
+        "athlete": pd.Categorical(["fixture"] * len(sets)),
+        "date": pd.to_datetime(pd.Series([None] * len(sets), dtype=object)),
+        "phase": 1,
+        "week": 1,
+        "day": "push1",
+        "exerciseId": pd.Categorical([exercise_id for exercise_id, _, _ in sets]),
+        "setIndex": range(len(sets)),
+        "weight": np.array([np.nan if weight is None else weight for _, weight, _ in sets], dtype=np.float64),
+        "reps": np.array([np.nan if reps is None else reps for _, _, reps in sets], dtype=np.float64),
+        "completed": True
+    })
+
+def check_fixtures(fixture_file=FIXTURE_FILE):
+    """
+    Run the fixture cases through PersonalRecordIndex and rebuild_history().
+    
+    Args:
+        fixture_file (str): Fixture file with "cases" of sets, the expected
+            outcome of every set and the final records
+    
+    Returns:
+        list: Problems found, empty if both engines match every case
+    """
+    with open(fixture_file, 'r') as f:
+        cases = json.load(f)["cases"]
+    
+    problems = []
+    for case in cases:
+        expected_records = _records_without_dates(case["records"])
+        
+        index = PersonalRecordIndex()
+        outcomes = [index.update(exercise_id, weight, reps, "fixture") for exercise_id, weight, reps in case["sets"]]
+        if outcomes != case["expected"]:
+            problems.append(f"{case['name']}: PersonalRecordIndex outcomes {outcomes}, expected {case['expected']}")
+        if _records_without_dates(index.records) != expected_records:
+            problems.append(f"{case['name']}: PersonalRecordIndex records {index.records}")
+        
+        history = rebuild_history(fixture_set_table(case["sets"]))
+        records = set(history["setIndex"].tolist())
+        outcomes = [position in records for position in range(len(case["sets"]))]
+        if outcomes != case["expected"]:
+            problems.append(f"{case['name']}: rebuild_history outcomes {outcomes}, expected {case['expected']}")
+        final = current_records(history).get("fixture", {})
+        if _records_without_dates(final) != expected_records:
+            problems.append(f"{case['name']}: rebuild_history records {final}")
+    
+    return problems
+
+def check_js_fixtures(fixture_file=FIXTURE_FILE):
+    """
+    Run the fixture cases through checkPersonalRecord() with Node.js.
+    
+    Returns:
+        bool: Whether the JS side matches every case, or None if Node.js is not installed
+    """
+    node = shutil.which("node")
+    if node is None:
+        return None
+    return subprocess.run([node, JS_CHECK_SCRIPT, fixture_file]).returncode == 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild personal records from exported pplWorkoutData backups.")
+    parser.add_argument("sources", nargs="*", help="Directories, glob patterns or export files")
+    parser.add_argument("--history", metavar="CSV", help="Write the full PR history to this CSV file")
+    parser.add_argument("--check-fixtures", nargs="?", const=FIXTURE_FILE, metavar="FILE",
+                        help="Check the Python engines and checkPersonalRecord() against the shared fixture cases")
+    add_athlete_arguments(parser)
+    args = parser.parse_args()
+    
+    if args.check_fixtures:
+        problems = check_fixtures(args.check_fixtures)
+        for problem in problems:
+            print(f"FAIL {problem}")
+        with open(args.check_fixtures, 'r') as f:
+            count = len(json.load(f)["cases"])
+        print(f"Python engines: {'all' if not problems else 'not all'} of {count} fixture cases match")
+        
+        js_ok = check_js_fixtures(args.check_fixtures)
+        if js_ok is None:
+            print("Node.js not found: checkPersonalRecord() was not checked")
+        sys.exit(0 if not problems and js_ok is not False else 1)
+    
+    if not args.sources:
+        parser.error("the following arguments are required: sources")
+    
+    paths = find_exports(args.sources)
+    if not paths:
+        print("No export files found.")
+        return
+    
+    try:
+        sets = load_sets(paths, args.athlete, args.athlete_from_dir)
+    except ValueError as e:
+        parser.error(str(e))
+    
+    history = rebuild_history(sets)
+    print(f"Found {len(history)} PR events")
+    
+    if args.history:
+        history.to_csv(args.history, index=False)
+        print(f"Saved {args.history}")
+    
+    print(json.dumps(current_records(history), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Precache manifest for service-worker.js. Lists every generated exercise
+data file with its URL, a content hash and its size, so the service worker
+only downloads the files whose hash changed since the last install.
+
+Usage:
+    python precache_manifest.py ../dev/exercise-data
+"""
+
+import argparse
+import os
+
+from build_cache import hash_bytes, hash_json
+from build_metrics import FILES_WRITTEN, add_arguments, apply_arguments, finish, metrics
+from json_io import write_json
+
+# File name of the manifest, written next to the files it lists
+MANIFEST_FILE = "precache-manifest.json"
+
+# URL of the exercise data directory, relative to the service worker
+ASSET_URL_PREFIX = "./dev/exercise-data/"
+
+# Length of the content hashes in the manifest
+REVISION_LENGTH = 16
+
+def build_manifest(directory, url_prefix=ASSET_URL_PREFIX):
+    """
+    Build the precache manifest of the JSON files in a directory.
+    
+    Args:
+        directory (str): Directory containing the generated files
+        url_prefix (str): URL under which the directory is served
+    
+    Returns:
+        dict: Manifest with a "version" over all entries and an "assets"
+            list of {"url", "revision", "size"}, sorted by URL
+    """
+    assets = []
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith(".json") or filename == MANIFEST_FILE:
+            continue
+        with open(os.path.join(directory, filename), 'rb') as f:
+            content = f.read()
+        assets.append({
+            "url": url_prefix + filename,
+            "revision": hash_bytes(content)[:REVISION_LENGTH],
+            "size": len(content)
+        })
+    
+    return {
+        "version": hash_json(assets)[:REVISION_LENGTH],
+        "assets": assets
+    }
+
+def write_manifest(directory, url_prefix=ASSET_URL_PREFIX):
+    """
+    Write the precache manifest of a directory into that directory.
+    
+    Returns:
+        dict: The manifest that was written
+    """
+    manifest = build_manifest(directory, url_prefix)
+    write_json(os.path.join(directory, MANIFEST_FILE), manifest)
+    return manifest
+
+def main():
+    parser = argparse.ArgumentParser(description="Write the service worker precache manifest for a data directory.")
+    parser.add_argument("directory", help="Directory containing the generated JSON files")
+    parser.add_argument("--url-prefix", default=ASSET_URL_PREFIX,
+                        help=f"URL under which the directory is served (default: {ASSET_URL_PREFIX})")
+    add_arguments(parser)
+    args = parser.parse_args()
+    apply_arguments(args)
+    
+    with metrics.stage("precache_manifest"):
+        manifest = write_manifest(args.directory, args.url_prefix)
+    metrics.count(FILES_WRITTEN)
+    total = sum(asset["size"] for asset in manifest["assets"])
+    print(f"Wrote {os.path.join(args.directory, MANIFEST_FILE)}: {len(manifest['assets'])} assets, "
+          f"{total} bytes, version {manifest['version']}")
+    
+    finish(args.metrics)
+
+if __name__ == "__main__":
+    main()
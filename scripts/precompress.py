@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Write precompressed .gz and .br siblings for generated JSON and HTML files,
+so a static host can serve them without compressing on the fly. Files are
+compressed in parallel at maximum compression, and files whose content is
+unchanged since the last run are skipped using the build cache.
+Siblings whose source file is gone are deleted from the directories
+being compressed, together with their cache entries, and a sibling in a
+format that is no longer written (.br once brotli is not installed) is
+deleted when its source is compressed again.
+
+Brotli output needs the optional "brotli" package; without it only .gz
+siblings are written.
+
+Usage:
+    python precompress.py ppl-workout/dev/exercise-data ppl-workout-html.html
+"""
+
+import argparse
+import gzip
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from build_cache import get_fresh_entry, hash_file, hash_json, load_cache, record_entry, remove_entry, save_cache
+from build_metrics import add_arguments, apply_arguments, detail, finish, metrics
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Extensions of the generated artifacts that are precompressed
+COMPRESSIBLE_EXTENSIONS = (".json", ".html")
+
+# Every sibling extension this module writes, whether or not brotli is installed
+SIBLING_EXTENSIONS = (".gz", ".br")
+
+# Batches up to this many files are compressed in this process; a pool costs more to start
+MAX_SERIAL_FILES = 2
+
+def available_formats():
+    """Return the sibling extensions that can be written in this environment."""
+    return ["gz", "br"] if brotli is not None else ["gz"]
+
+def compress_file(path, formats):
+    """
+    Write compressed siblings of one file.
+    
+    The gzip stream has no file name and a zero timestamp, so identical
+    input always gives identical output. Siblings in the other formats of
+    SIBLING_EXTENSIONS are deleted, so a client never gets one that is
+    older than the file.
+    
+    Args:
+        path (str): File to compress
+        formats (list): Sibling extensions to write ("gz", "br")
+    
+    Returns:
+        dict: Sibling path -> size in bytes
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    
+    sizes = {}
+    for extension in formats:
+        if extension == "gz":
+            compressed = gzip.compress(data, compresslevel=9, mtime=0)
+        elif extension == "br":
+            compressed = brotli.compress(data, quality=11)
+        else:
+            raise ValueError(f"Unsupported compression format: {extension}")
+        
+        sibling = f"{path}.{extension}"
+        tmp_file = sibling + ".tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(compressed)
+        os.replace(tmp_file, sibling)
+        sizes[sibling] = len(compressed)
+    
+    for extension in SIBLING_EXTENSIONS:
+        if extension[1:] not in formats and os.path.exists(path + extension):
+            os.remove(path + extension)
+    
+    return sizes
+
+def find_artifacts(sources):
+    """
+    Resolve files and directories to the compressible files they contain.
+    
+    Returns:
+        list: Sorted paths ending in one of COMPRESSIBLE_EXTENSIONS
+    """
+    paths = set()
+    for source in sources:
+        if os.path.isdir(source):
+            for root, _, files in os.walk(source):
+                paths.update(os.path.join(root, name) for name in files if name.endswith(COMPRESSIBLE_EXTENSIONS))
+        elif source.endswith(COMPRESSIBLE_EXTENSIONS) and os.path.exists(source):
+            paths.add(source)
+    return sorted(paths)
+
+def remove_orphans(directories, cache=None):
+    """
+    Delete compressed siblings whose source file no longer exists.
+    
+    Args:
+        directories (list): Directories to clean up; other sources are ignored
+        cache (dict, optional): Build cache; the "compress:" entries of the
+            missing sources are dropped along with their siblings
+    
+    Returns:
+        list: Paths of the deleted siblings
+    """
+    removed = []
+    for directory in directories:
+        if not os.path.isdir(directory):
+            continue
+        
+        if cache is not None:
+            prefix = f"compress:{os.path.join(directory, '')}"
+            for key in [key for key in cache["entries"] if key.startswith(prefix)]:
+                if not os.path.exists(key[len("compress:"):]):
+                    removed.extend(remove_entry(cache, key))
+        
+        # Siblings the cache does not know about, e.g. after the cache file was deleted
+        for root, _, files in os.walk(directory):
+            for name in files:
+                source, extension = os.path.splitext(name)
+                if (extension in SIBLING_EXTENSIONS and source.endswith(COMPRESSIBLE_EXTENSIONS)
+                        and not os.path.exists(os.path.join(root, source))):
+                    os.remove(os.path.join(root, name))
+                    removed.append(os.path.join(root, name))
+    
+    return removed
+
+def precompress(paths, cache=None, workers=None):
+    """
+    Write the compressed siblings of every path whose content changed.
+    
+    Args:
+        paths (list): Files to compress
+        cache (dict, optional): Build cache used to skip unchanged files
+        workers (int, optional): Number of worker processes. Defaults to the CPU count.
+    
+    Returns:
+        dict: Counts of "compressed" and "skipped" files, and the total
+            "source_bytes" and "compressed_bytes" of the compressed ones
+    """
+    formats = available_formats()
+    summary = {"compressed": 0, "skipped": 0, "source_bytes": 0, "compressed_bytes": 0}
+    
+    # The cache entry covers the file content and the formats written for it
+    pending = []
+    for path in paths:
+        digest = hash_json({"file": hash_file(path), "formats": formats})
+        if cache is not None and get_fresh_entry(cache, f"compress:{path}", digest):
+            summary["skipped"] += 1
+        else:
+            pending.append((path, digest))
+    
+    if not pending:
+        return summary
+    
+    pending_paths = [path for path, _ in pending]
+    if len(pending) <= MAX_SERIAL_FILES:
+        results = [compress_file(path, formats) for path in pending_paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(compress_file, pending_paths, [formats] * len(pending)))
+        
+    for (path, digest), sizes in zip(pending, results):
+        summary["compressed"] += 1
+        summary["source_bytes"] += os.path.getsize(path)
+        summary["compressed_bytes"] += min(sizes.values())
+        if cache is not None:
+            record_entry(cache, f"compress:{path}", digest, outputs=list(sizes))
+    
+    return summary
+
+def print_summary(summary):
+    """Print the result of a precompress() run."""
+    print(f"Precompressed {summary['compressed']} files ({', '.join(available_formats())}), "
+          f"{summary['skipped']} unchanged")
+    if summary["compressed_bytes"]:
+        print(f"  {summary['source_bytes']} bytes -> {summary['compressed_bytes']} bytes smallest siblings "
+              f"({summary['source_bytes'] / summary['compressed_bytes']:.1f}x)")
+    if brotli is None:
+        print("  brotli is not installed, skipped .br files")
+
+def main():
+    parser = argparse.ArgumentParser(description="Write .gz and .br siblings for generated JSON and HTML files.")
+    parser.add_argument("sources", nargs="+", help="Files or directories to compress")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="Number of worker processes (default: CPU count)")
+    add_arguments(parser)
+    args = parser.parse_args()
+    apply_arguments(args)
+    
+    cache = load_cache()
+    with metrics.stage("remove_orphans"):
+        for path in remove_orphans(args.sources, cache):
+            detail(f"Removed orphaned sibling: {path}")
+    with metrics.stage("precompress"):
+        summary = precompress(find_artifacts(args.sources), cache, args.workers)
+    metrics.count("files_precompressed", summary["compressed"])
+    save_cache(cache)
+    print_summary(summary)
+    
+    finish(args.metrics)
+
+if __name__ == "__main__":
+    main()
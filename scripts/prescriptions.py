@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Structured numeric targets for the prescription strings of an exercise.
+
+The week files carry sets, reps, RPE and rest as display text ("3-5",
+"8-9", "~2-3 min", "3-5m"). add_targets() adds a "targets" object next to
+that text with the same values as numbers, so the app and the analytics
+read {"min": 3, "max": 5} instead of parsing the text on every render:
+
+    "targets": {
+        "warmup_sets": {"min": 2, "max": 3},
+        "working_sets": {"min": 2, "max": 2},
+        "reps": {"min": 4, "max": 6},
+        "rpe": {"min": 8, "max": 9},
+        "rest_seconds": {"min": 180, "max": 300}
+    }
+
+A target is null when its text is not a number or range, e.g. "AMRAP",
+"30s HOLD", "8, 5, 12" or "See Notes".
+
+Usage:
+    python prescriptions.py ppl-workout/dev/exercise-data/phase1-week1.json
+"""
+
+import argparse
+import re
+from functools import lru_cache
+
+from json_io import load_json
+
+# A number or a range with an optional "~" in front and an optional unit after it
+RANGE_PATTERN = re.compile(r'^~?\s*(\d+(?:\.\d+)?)(?:\s*-\s*(\d+(?:\.\d+)?))?\s*([a-z]*)\.?$', re.IGNORECASE)
+
+# Rest units in seconds; rest without a unit is in minutes, like the rest of the program
+REST_UNITS = {
+    "": 60, "m": 60, "min": 60, "mins": 60, "minute": 60, "minutes": 60,
+    "s": 1, "sec": 1, "secs": 1, "second": 1, "seconds": 1
+}
+
+# Target name -> (exercise field, seconds per unit or None for plain counts)
+TARGET_FIELDS = {
+    "warmup_sets": ("warmup_sets", None),
+    "working_sets": ("working_sets", None),
+    "reps": ("reps", None),
+    "rpe": ("rpe", None),
+    "rest_seconds": ("rest", REST_UNITS)
+}
+
+def _number(text):
+    """Return a parsed number as an int when it is whole, as JSON writers expect."""
+    value = float(text)
+    return int(value) if value.is_integer() else value
+
+@lru_cache(maxsize=None)
+def parse_range(text, units=None):
+    """
+    Parse a prescription into a numeric range.
+    
+    Args:
+        text (str): Prescription such as "3", "8-9", "~2-3 min" or "15 sec"
+        units (tuple, optional): (unit, multiplier) pairs accepted after the
+            number; the range is multiplied by the unit's value. Without
+            units, only plain numbers are accepted.
+    
+    Returns:
+        tuple: (min, max), or None if the text is not a number or range
+    """
+    match = RANGE_PATTERN.match(text.strip()) if isinstance(text, str) else None
+    if not match:
+        return None
+    
+    low, high, unit = match.groups()
+    multiplier = dict(units or (("", 1),)).get(unit.lower())
+    if multiplier is None:
+        return None
+    
+    low = _number(low) * multiplier
+    high = _number(high) * multiplier if high is not None else low
+    return (low, high) if low <= high else (high, low)
+
+# Units per target as hashable tuples, so parse_range() results are cached
+_TARGET_UNITS = {name: tuple(units.items()) if units else None for name, (_, units) in TARGET_FIELDS.items()}
+
+def exercise_targets(exercise):
+    """
+    Return the numeric targets of one exercise.
+    
+    Args:
+        exercise (dict): Exercise with the prescription fields as text
+    
+    Returns:
+        dict: Target name -> {"min", "max"} or None, in TARGET_FIELDS order
+    """
+    targets = {}
+    for name, (field, _) in TARGET_FIELDS.items():
+        parsed = parse_range(exercise.get(field, ""), _TARGET_UNITS[name])
+        targets[name] = {"min": parsed[0], "max": parsed[1]} if parsed else None
+    return targets
+
+def add_targets(exercises):
+    """
+    Add a "targets" object to every exercise, in one pass over all of them.
+    
+    Each distinct prescription string is parsed once, however many
+    exercises share it; the parsed ranges are cached across calls.
+    
+    Args:
+        exercises (iterable): Exercise dicts, updated in place
+    
+    Returns:
+        int: Number of exercises updated
+    """
+    count = 0
+    for exercise in exercises:
+        exercise["targets"] = exercise_targets(exercise)
+        count += 1
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the numeric targets parsed from a week file.")
+    parser.add_argument("week_file", help="A phaseN-weekM.json file")
+    args = parser.parse_args()
+    
+    week = load_json(args.week_file)
+    for day_key, day in week.get("days", {}).items():
+        print(f"\n{day.get('title', day_key)}")
+        for exercise in day["exercises"]:
+            targets = exercise_targets(exercise)
+            ranges = ", ".join(f"{name} {target['min']}-{target['max']}" if target else f"{name} ?"
+                               for name, target in targets.items())
+            print(f"  {exercise['name']}: {ranges}")
+    
+    info = parse_range.cache_info()
+    print(f"\n{info.currsize} distinct prescriptions parsed, {info.hits} cache hits")
+
+if __name__ == "__main__":
+    main()
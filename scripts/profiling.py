@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Opt-in cProfile profiling for the build scripts.
+
+A profiled run writes three files to the profile directory:
+    {script}.pstats      raw profile, for pstats / snakeviz
+    {script}.collapsed   collapsed stacks for flamegraph.pl or speedscope
+    {script}-top.txt     the hottest functions by own time
+
+The whole run is profiled, or only one stage of build_metrics (for example
+parse_sheet, generate_weeks or render_html). Nothing in this module is
+imported unless profiling is requested, so a normal run has no overhead.
+
+Usage:
+    python generate_workout_json.py --profile profiles
+    python extract_workout_data.py --profile profiles --profile-stage parse_sheet
+    flamegraph.pl profiles/extract_workout_data.collapsed > extract.svg
+
+    # Summarize an existing profile
+    python profiling.py profiles/extract_workout_data.pstats --top 30
+"""
+
+import argparse
+import cProfile
+import io
+import os
+import pstats
+
+# Number of functions listed in the hot function summary
+DEFAULT_TOP = 25
+
+# Deepest call stack written to the collapsed output
+MAX_STACK_DEPTH = 100
+
+# Call paths with less time than this are left out of the collapsed output
+MIN_PATH_SECONDS = 1e-6
+
+def function_label(function):
+    """Return a flamegraph frame label for a pstats function key (file, line, name)."""
+    filename, line, name = function
+    if filename == "~":
+        # Built-ins such as "<method 'join' of 'str' objects>"
+        return name.replace(";", ",")
+    return f"{name} ({os.path.basename(filename)}:{line})".replace(";", ",")
+
+def collapse_stacks(stats):
+    """
+    Turn a profile into collapsed stacks ("a;b;c microseconds" lines).
+    
+    cProfile only records caller -> callee edges, so stacks are rebuilt by
+    walking the call graph from its roots. A function's own time is split
+    over the paths that reach it in proportion to the time of each edge.
+    
+    Args:
+        stats (pstats.Stats): Profile to convert
+    
+    Returns:
+        list: Collapsed stack lines with integer microsecond weights
+    """
+    entries = stats.stats
+    children = {}
+    for function, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            children.setdefault(caller, []).append((function, edge[3]))
+    
+    weights = {}
+    
+    def walk(function, stack, ratio):
+        _, _, own_time, cumulative_time, _ = entries[function]
+        stack = stack + [function_label(function)]
+        key = ";".join(stack)
+        weights[key] = weights.get(key, 0.0) + own_time * ratio
+        if len(stack) >= MAX_STACK_DEPTH:
+            return
+        for child, edge_time in children.get(function, []):
+            child_total = entries[child][3]
+            # Skip recursion and paths under a microsecond
+            if child_total <= 0 or edge_time * ratio < MIN_PATH_SECONDS or function_label(child) in stack:
+                continue
+            walk(child, stack, ratio * min(edge_time / child_total, 1.0))
+    
+    roots = [function for function, entry in entries.items() if not entry[4]]
+    for root in roots:
+        walk(root, [], 1.0)
+    
+    lines = []
+    for key, seconds in weights.items():
+        microseconds = int(seconds * 1_000_000)
+        if microseconds > 0:
+            lines.append(f"{key} {microseconds}")
+    return sorted(lines)
+
+def top_functions(source, top=DEFAULT_TOP):
+    """Return the pstats listing of the top functions by own time, as text."""
+    stream = io.StringIO()
+    pstats.Stats(source, stream=stream).sort_stats("tottime").print_stats(top)
+    return stream.getvalue()
+
+def hot_functions(stats, top=DEFAULT_TOP):
+    """
+    Return the functions with the most own time.
+    
+    Returns:
+        list: (label, calls, own seconds, cumulative seconds) tuples, hottest first
+    """
+    ranked = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)
+    return [(function_label(function), calls, own_time, cumulative_time)
+            for function, (_, calls, own_time, cumulative_time, _) in ranked[:top]]
+
+class Profiler:
+    """
+    cProfile wrapper that profiles a whole run or only one named stage.
+    
+    build_metrics calls enter_stage() and exit_stage() around every stage;
+    with a stage set, the profiler is only enabled inside that stage.
+    """
+    
+    def __init__(self, output_dir, stage=None, top=DEFAULT_TOP):
+        self.output_dir = output_dir
+        self.stage = stage
+        self.top = top
+        self.profile = cProfile.Profile()
+        self._depth = 0
+    
+    def start(self):
+        """Start profiling the whole run, unless only a stage is profiled."""
+        if self.stage is None:
+            self.profile.enable()
+    
+    def enter_stage(self, name):
+        """Enable the profiler when the profiled stage starts."""
+        if name == self.stage:
+            self._depth += 1
+            if self._depth == 1:
+                self.profile.enable()
+    
+    def exit_stage(self, name):
+        """Disable the profiler when the profiled stage ends."""
+        if name == self.stage:
+            self._depth -= 1
+            if self._depth == 0:
+                self.profile.disable()
+    
+    def write(self, script):
+        """
+        Stop profiling and write the pstats, collapsed and top-N files.
+        
+        Args:
+            script (str): Script name used for the file names
+        
+        Returns:
+            list: Paths of the files written, or an empty list if the
+                profiled stage never ran
+        """
+        self.profile.disable()
+        self.profile.create_stats()
+        if not self.profile.stats:
+            print(f"Profile is empty: stage '{self.stage}' did not run")
+            return []
+        
+        os.makedirs(self.output_dir, exist_ok=True)
+        name = os.path.splitext(os.path.basename(script))[0]
+        if self.stage:
+            name = f"{name}-{self.stage}"
+        stats = pstats.Stats(self.profile)
+        
+        pstats_file = os.path.join(self.output_dir, f"{name}.pstats")
+        stats.dump_stats(pstats_file)
+        
+        collapsed_file = os.path.join(self.output_dir, f"{name}.collapsed")
+        with open(collapsed_file, "w") as f:
+            f.write("\n".join(collapse_stacks(stats)) + "\n")
+        
+        top_file = os.path.join(self.output_dir, f"{name}-top.txt")
+        with open(top_file, "w") as f:
+            f.write(top_functions(self.profile, self.top))
+        
+        print(f"\nHottest functions ({self.stage or 'whole run'}):")
+        for label, calls, own_time, cumulative_time in hot_functions(stats, self.top):
+            print(f"  {own_time * 1000:9.1f} ms own {cumulative_time * 1000:9.1f} ms total {calls:>8} calls  {label}")
+        print(f"Profile saved to {pstats_file}, {collapsed_file} and {top_file}")
+        return [pstats_file, collapsed_file, top_file]
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize a saved profile or convert it to collapsed stacks.")
+    parser.add_argument("pstats_file", help="Profile written by a --profile run")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP,
+                        help=f"Number of functions to list (default: {DEFAULT_TOP})")
+    parser.add_argument("--collapsed", metavar="FILE", help="Write collapsed stacks to this file")
+    args = parser.parse_args()
+    
+    print(top_functions(args.pstats_file, args.top))
+    
+    if args.collapsed:
+        with open(args.collapsed, "w") as f:
+            f.write("\n".join(collapse_stacks(pstats.Stats(args.pstats_file))) + "\n")
+        print(f"Saved {args.collapsed}")
+
+if __name__ == "__main__":
+    main()
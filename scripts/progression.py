@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Progression engine that derives missing weeks of a program from the
+weeks that exist. Each missing week copies the closest earlier training
+week of its phase and applies declarative rules to the set, rep and RPE
+prescriptions: a per-week progression, and deload weeks counted from the
+end of the phase.
+
+Deload weeks of the source (the phase's "deload_weeks") are never used
+as a progression base; a missing deload week copies the phase's own
+deload week when it has one. Derived weeks are listed in the phase's
+"derived_weeks" so the generators can mark them as not part of the
+source program.
+
+Usage:
+    python progression.py "The Ultimate Push Pull Legs System - 6x (2)_workout_data.json"
+    python progression.py source.json --rules rules.json --output filled.json
+"""
+
+import argparse
+import copy
+import json
+import re
+from functools import lru_cache
+
+from json_io import load_json, write_json
+
+# Default rules. A field rule changes a numeric prescription ("3", "8-9",
+# "~2-3 min") by step and scale, clamped to min/max; other text is kept.
+DEFAULT_RULES = {
+    # Applied once per "every" weeks after the week a missing week is copied from
+    "progression": {
+        "every": 1,
+        "fields": {
+            "rpe": {"step": 0.5, "max": 10}
+        }
+    },
+    # Missing weeks that are deloads, as positions from the end of the phase (1 = last week).
+    # The program ends its phases with a deload week, like Phase 1 Week 6.
+    "deload": {
+        "weeks_from_end": [1],
+        "fields": {
+            "working_sets": {"scale": 0.5, "min": 1, "integer": True},
+            "rpe": {"step": -2, "min": 5}
+        }
+    }
+}
+
+# Numeric prescription with an optional range and surrounding text
+PRESCRIPTION_PATTERN = re.compile(r'^(\s*~?\s*)(\d+(?:\.\d+)?)(?:(\s*-\s*)(\d+(?:\.\d+)?))?(.*)$', re.DOTALL)
+
+def merge_rules(overrides=None):
+    """
+    Merge partial progression rules over DEFAULT_RULES.
+    
+    Settings of a section ("every", "weeks_from_end") replace the default
+    setting; field rules replace the default rule of the same field and
+    keep the other defaults. An empty field rule ({}) turns a default rule off.
+    
+    Args:
+        overrides (dict, optional): Partial rules, e.g.
+            {"progression": {"fields": {"reps": {"step": 1}}}}
+    
+    Returns:
+        dict: Complete rules
+    """
+    rules = copy.deepcopy(DEFAULT_RULES)
+    for section, settings in (overrides or {}).items():
+        target = rules.setdefault(section, {})
+        for key, value in settings.items():
+            if key == "fields":
+                target.setdefault("fields", {}).update(copy.deepcopy(value))
+            else:
+                target[key] = copy.deepcopy(value)
+    return rules
+
+def load_rules(rules_file=None):
+    """
+    Load progression rules from a JSON file, merged over DEFAULT_RULES
+    with merge_rules().
+    
+    Returns:
+        dict: Rules
+    """
+    if not rules_file:
+        return merge_rules()
+    with open(rules_file, 'r') as f:
+        return merge_rules(json.load(f))
+
+def _format_number(value, integer):
+    """Format a prescription number: whole numbers without decimals, halves as "8.5"."""
+    if integer:
+        return str(int(value + 0.5))
+    value = round(value, 2)
+    return str(int(value)) if value == int(value) else f"{value:g}"
+
+@lru_cache(maxsize=None)
+def adjust_prescription(text, step=0.0, scale=1.0, minimum=None, maximum=None, integer=False, times=1):
+    """
+    Apply a field rule to a prescription string.
+    
+    Each of the times applications computes value * scale + step and clamps
+    the result to [minimum, maximum]. Both ends of a range are adjusted,
+    and a range whose ends meet collapses to a single number.
+    
+    Args:
+        text (str): Prescription such as "3", "8-9" or "~2-3 min"
+        times (int): Number of times to apply the rule
+    
+    Returns:
+        str: Adjusted prescription, or text unchanged if it is not numeric
+    """
+    match = PRESCRIPTION_PATTERN.match(text)
+    if not match or times <= 0:
+        return text
+    
+    prefix, low, separator, high, suffix = match.groups()
+    values = [float(low)] + ([float(high)] if high is not None else [])
+    
+    for _ in range(times):
+        values = [value * scale + step for value in values]
+        if minimum is not None:
+            values = [max(value, minimum) for value in values]
+        if maximum is not None:
+            values = [min(value, maximum) for value in values]
+    
+    formatted = [_format_number(value, integer) for value in values]
+    if len(formatted) == 1 or formatted[0] == formatted[1]:
+        return f"{prefix}{formatted[0]}{suffix}"
+    return f"{prefix}{formatted[0]}{separator}{formatted[1]}{suffix}"
+
+def compile_field_rules(fields, times):
+    """
+    Turn the field rules of a section into (field, adjust) pairs.
+    
+    Args:
+        fields (dict): Field name -> rule with optional step, scale, min, max and integer
+        times (int): Number of times each rule is applied
+    
+    Returns:
+        list: (field, function(text) -> adjusted text) pairs
+    """
+    compiled = []
+    for field, rule in fields.items():
+        options = (float(rule.get("step", 0)), float(rule.get("scale", 1)),
+                   rule.get("min"), rule.get("max"), bool(rule.get("integer", False)), times)
+        compiled.append((field, lambda text, options=options: adjust_prescription(text, *options)))
+    return compiled
+
+def derive_week(base_week, field_rules):
+    """
+    Copy a week and apply compiled field rules to every exercise.
+    
+    Args:
+        base_week (dict): Day key -> list of exercises, in the source schema
+        field_rules (list): (field, adjust) pairs from compile_field_rules()
+    
+    Returns:
+        dict: The derived week
+    """
+    week = {}
+    for day, exercises in base_week.items():
+        if not isinstance(exercises, list):
+            week[day] = exercises
+            continue
+        derived = []
+        for exercise in exercises:
+            exercise = dict(exercise)
+            for field, adjust in field_rules:
+                if isinstance(exercise.get(field), str):
+                    exercise[field] = adjust(exercise[field])
+            derived.append(exercise)
+        week[day] = derived
+    return week
+
+def _closest(weeks, week):
+    """Return the closest week before week, or the first one for gaps at the start."""
+    earlier = [number for number in weeks if number < week]
+    return earlier[-1] if earlier else weeks[0]
+
+def plan_missing_weeks(existing, weeks_per_phase, rules, source_deloads=()):
+    """
+    Decide how each missing week of a phase is derived.
+    
+    Progression weeks are based on the closest earlier training week;
+    source deload weeks are never a base for them. Missing deload weeks
+    copy the closest source deload week unchanged (times 0), or apply the
+    deload rules to the closest earlier training week if the phase has none.
+    
+    Args:
+        existing (list): Week numbers present in the phase
+        weeks_per_phase (int): Number of weeks the phase should have
+        rules (dict): Complete progression rules, see merge_rules()
+        source_deloads (iterable): Week numbers of the phase that are deload weeks
+    
+    Returns:
+        list: (week, base_week, kind, times) tuples, kind being "progression" or "deload"
+    """
+    existing = sorted(existing)
+    deloads = sorted(set(source_deloads) & set(existing))
+    training = [number for number in existing if number not in deloads]
+    if not training:
+        return []
+    
+    deload_weeks = {weeks_per_phase + 1 - position for position in rules["deload"].get("weeks_from_end", [])}
+    every = max(int(rules["progression"].get("every", 1)), 1)
+    plan = []
+    
+    for week in range(1, weeks_per_phase + 1):
+        if week in existing:
+            continue
+        
+        if week in deload_weeks and deloads:
+            plan.append((week, _closest(deloads, week), "deload", 0))
+        elif week in deload_weeks:
+            plan.append((week, _closest(training, week), "deload", 1))
+        else:
+            base = _closest(training, week)
+            plan.append((week, base, "progression", max(week - base, 0) // every))
+    
+    return plan
+
+def fill_missing_weeks(data, rules=None):
+    """
+    Derive every missing week of every phase in one pass.
+    
+    Args:
+        data (dict): Workout data in the _workout_data.json schema
+        rules (dict, optional): Progression rules, merged over DEFAULT_RULES
+            with merge_rules(), so partial rules are enough
+    
+    Returns:
+        tuple: (workout data with all weeks present, list of
+            (phase_key, week_key, base_week_key, kind) for the derived weeks).
+            Phases with derived weeks list them in "derived_weeks" (week key
+            -> base_week and kind); derived deload weeks are added to
+            "deload_weeks". The input data is not modified.
+    """
+    rules = merge_rules(rules)
+    weeks_per_phase = data.get("program_info", {}).get("weeks_per_phase", 6)
+    compiled = {}
+    derived = []
+    
+    filled = dict(data)
+    filled["phases"] = {}
+    
+    for phase_key, phase_data in data.get("phases", {}).items():
+        weeks = phase_data.get("weeks", {})
+        existing = [int(key[4:]) for key in weeks if key.startswith("week") and key[4:].isdigit()]
+        deload_weeks = phase_data.get("deload_weeks", [])
+        plan = plan_missing_weeks(existing, weeks_per_phase, rules, deload_weeks)
+        
+        if not plan:
+            filled["phases"][phase_key] = phase_data
+            continue
+        
+        new_weeks = dict(weeks)
+        derived_weeks = {}
+        for week, base, kind, times in plan:
+            # Field rules are compiled once per kind and step count for the whole program
+            if (kind, times) not in compiled:
+                compiled[(kind, times)] = compile_field_rules(rules[kind].get("fields", {}), times)
+            new_weeks[f"week{week}"] = derive_week(weeks[f"week{base}"], compiled[(kind, times)])
+            derived_weeks[f"week{week}"] = {"base_week": base, "kind": kind}
+            derived.append((phase_key, f"week{week}", f"week{base}", kind))
+        
+        # Keep the weeks in numeric order
+        ordered = sorted(new_weeks, key=lambda key: int(key[4:]) if key[4:].isdigit() else 0)
+        filled["phases"][phase_key] = dict(
+            phase_data,
+            weeks={key: new_weeks[key] for key in ordered},
+            deload_weeks=sorted(set(deload_weeks) | {week for week, _, kind, _ in plan if kind == "deload"}),
+            derived_weeks=derived_weeks
+        )
+    
+    return filled, derived
+
+def add_derive_arguments(parser):
+    """
+    Add the --derive-missing-weeks option of the generators to an argument parser.
+    
+    Derived weeks are not part of the workbook, so the generators only write
+    them when asked.
+    """
+    parser.add_argument("--derive-missing-weeks", action="store_true",
+                        help="Also write the weeks missing from the workbook, derived from the existing "
+                             "ones by the progression rules (default: only the workbook's weeks)")
+
+def generate_variants(data, rule_sets):
+    """
+    Fill the missing weeks of a program once per rule set.
+    
+    Prescription adjustments are memoized across variants, so each distinct
+    (value, rule) pair is computed once.
+    
+    Args:
+        data (dict): Workout data
+        rule_sets (list): Progression rules per variant
+    
+    Returns:
+        list: Filled workout data per variant
+    """
+    return [fill_missing_weeks(data, rules)[0] for rules in rule_sets]
+
+def main():
+    parser = argparse.ArgumentParser(description="Derive the missing weeks of a workout program.")
+    parser.add_argument("source", help="Source workout data JSON file")
+    parser.add_argument("--rules", help="JSON file with progression rules (default: built-in rules)")
+    parser.add_argument("--output", help="Write the completed workout data to this file")
+    args = parser.parse_args()
+    
+    data = load_json(args.source)
+    
+    filled, derived = fill_missing_weeks(data, load_rules(args.rules))
+    for phase_key, week_key, base_key, kind in derived:
+        print(f"Derived {phase_key}-{week_key} from {base_key} ({kind})")
+    print(f"{len(derived)} weeks derived")
+    
+    if args.output:
+        write_json(args.output, filled)
+        print(f"Saved {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+"""
+Shared setup for the script tests: the scripts import each other by module
+name, as when run from the scripts directory.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
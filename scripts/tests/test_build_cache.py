@@ -0,0 +1,27 @@
+import ast
+import os
+
+from build_cache import GENERATOR_SCRIPTS
+
+SCRIPT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def local_imports(script):
+    """Scripts of the scripts directory imported at module level by script."""
+    with open(os.path.join(SCRIPT_DIR, script), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    
+    modules = set()
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            modules.add(node.module)
+    return {f"{module}.py" for module in modules if os.path.exists(os.path.join(SCRIPT_DIR, f"{module}.py"))}
+
+def test_generator_version_covers_every_imported_script():
+    missing = {}
+    for script in GENERATOR_SCRIPTS:
+        imported = local_imports(script) - set(GENERATOR_SCRIPTS)
+        if imported:
+            missing[script] = sorted(imported)
+    assert missing == {}
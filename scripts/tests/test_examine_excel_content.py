@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from examine_excel_content import DAY_PATTERNS, EXERCISE_PATTERNS, SET_REP_PATTERNS, scan_cells
+
+CELLS = [
+    ["Week 1", "Push Day #1", "Bench Press", "3-5"],
+    ["WEEK 12", "pull day", "Barbell Curl", "3x5"],
+    ["Leg Day", "Legs day 2", "Back Squat (paused)", "8 reps"],
+    ["Romanian Deadlift", "Overhead PRESS", "4 sets of 8", "12"],
+    ["notes:\nweek 3 is a deload", "squat\n3 sets", "3-5\n", " 3-5"],
+    [None, 3, np.nan, ""],
+    ["Incline DB Press", "bench  press", "Weekly", "3–5"]
+]
+
+def pattern_groups():
+    """The groups examine_excel_content() scans for."""
+    groups = {pattern.pattern: [pattern] for pattern in DAY_PATTERNS + EXERCISE_PATTERNS}
+    groups["sets_reps"] = SET_REP_PATTERNS
+    return groups
+
+def test_scanner_matches_a_search_per_pattern():
+    df = pd.DataFrame(CELLS, columns=["a", "b", "c", "d"], dtype=object)
+    groups = pattern_groups()
+    
+    expected = {name: [] for name in groups}
+    for row in df.index:
+        for column in df.columns:
+            value = df.at[row, column]
+            if not isinstance(value, str):
+                continue
+            for name, patterns in groups.items():
+                if any(pattern.search(value) for pattern in patterns):
+                    expected[name].append((row, column, value))
+    
+    assert scan_cells(df, groups) == expected
+    # The sample covers every group
+    assert all(expected.values())
+
+def test_scanner_without_string_cells():
+    df = pd.DataFrame([[1, 2.5], [None, 3]], columns=["a", "b"])
+    assert scan_cells(df, pattern_groups()) == {name: [] for name in pattern_groups()}
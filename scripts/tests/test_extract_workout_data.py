@@ -0,0 +1,62 @@
+import datetime
+
+import pytest
+from openpyxl import Workbook
+
+from extract_workout_data import extract_workout_data, format_date_cell
+
+MARCH_4 = datetime.datetime(2024, 3, 4)
+
+# Header row of a week block in the program spreadsheet
+WEEK_HEADER = ["Exercise", "Warm-up Sets", "Working Sets", "Reps", "Load", "RPE", "Rest",
+               "Substitution Option 1", "Substitution Option 2", "Notes"]
+
+@pytest.mark.parametrize("number_format, expected", [
+    ("m-d", "3-4"),
+    ("m\\-d", "3-4"),
+    ('m"-"d', "3-4"),
+    ("[$-409]m-d;@", "3-4"),
+    ("mm/dd", "03/04"),
+    ("d-mmm", "4-Mar"),
+    ("d/m/yyyy", "4/3/2024"),
+    ("General", "2024-03-04")
+])
+def test_date_cells_render_as_displayed(number_format, expected):
+    assert format_date_cell(MARCH_4, number_format) == expected
+
+def write_workbook(path):
+    """One phase sheet whose "3-4" and "8-9" cells Excel stored as dates."""
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "Phase 1"
+    sheet.append(["Phase 1 - Test", None])
+    sheet.append(["Week 1"] + WEEK_HEADER)
+    sheet.append(["Push #1", "Bench Press", MARCH_4, 1, "3-5", None, datetime.datetime(2024, 8, 9), "~3-5 min",
+                  "DB Bench Press", None, "Pause on the chest"])
+    sheet.append([None, "Cable Fly", 2, 3, "10-12", None, 9, "~1-2 min", None, None, "Squeeze"])
+    # Warm-up sets and RPE of the bench press row
+    sheet["C3"].number_format = "m-d"
+    sheet["G3"].number_format = "m-d"
+    workbook.save(path)
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = tmp_path / "program.xlsx"
+    write_workbook(path)
+    return str(path)
+
+def exercises(data):
+    return data["phases"]["phase1"]["weeks"]["week1"]["push1"]
+
+def test_typed_extraction_keeps_date_mangled_ranges(workbook, tmp_path):
+    data = extract_workout_data(workbook, output_file=str(tmp_path / "typed.json"))
+    
+    bench, fly = exercises(data)
+    assert (bench["warmup_sets"], bench["working_sets"], bench["reps"], bench["rpe"]) == ("3-4", "1", "3-5", "8-9")
+    assert (fly["warmup_sets"], fly["working_sets"], fly["rpe"]) == ("2", "3", "9")
+
+def test_inferred_extraction_replaces_dates_with_defaults(workbook, tmp_path):
+    data = extract_workout_data(workbook, output_file=str(tmp_path / "inferred.json"), typed=False)
+    
+    bench, _ = exercises(data)
+    assert (bench["warmup_sets"], bench["rpe"]) == ("2", "8-9")
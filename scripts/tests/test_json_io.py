@@ -0,0 +1,49 @@
+import pytest
+
+from json_io import MINIFIED, PRETTY, dump_bytes, load_json, loads, write_json
+
+pytest.importorskip("orjson")
+
+DATA = {
+    "phase": 1,
+    "description": "Phase 1 – Base Hypertrophy (Café, 1×)",
+    "deload": False,
+    "base_week": None,
+    "targets": {"rpe": {"min": 8, "max": 9.5}, "reps": None},
+    "days": {
+        "push1": {"title": "Push #1", "exercises": [{"id": "bench-press", "substitutions": ["DB Bench Press", "ß ü 日本"]}]},
+        "empty": {"title": "", "exercises": []}
+    },
+    "nested": [[], {}, [1, [2, [3.25]]]],
+    "quote": "a \"quoted\" \\ path\nwith a newline and a tab\t"
+}
+
+@pytest.mark.parametrize("mode", [PRETTY, MINIFIED])
+def test_backends_write_the_same_bytes(mode):
+    assert dump_bytes(DATA, mode, "orjson") == dump_bytes(DATA, mode, "json")
+
+@pytest.mark.parametrize("mode", [PRETTY, MINIFIED])
+def test_output_is_utf8_without_escapes(mode):
+    raw = dump_bytes(DATA, mode, "orjson")
+    assert "Café".encode("utf-8") in raw
+    assert b"\\u" not in raw
+    assert loads(raw) == DATA
+
+@pytest.mark.parametrize("backend", ["orjson", "json"])
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), float("-inf")])
+def test_backends_reject_non_finite_floats(backend, value):
+    with pytest.raises(ValueError):
+        dump_bytes({"weeks": [{"load": value}]}, MINIFIED, backend)
+
+@pytest.mark.parametrize("backend", ["orjson", "json"])
+def test_null_values_are_not_rejected(backend):
+    assert dump_bytes({"load": None}, MINIFIED, backend) == b'{"load":null}'
+
+def test_non_string_keys_fall_back_to_the_stdlib():
+    assert dump_bytes({1: "a"}, MINIFIED, "orjson") == dump_bytes({1: "a"}, MINIFIED, "json")
+
+def test_write_json_round_trip(tmp_path):
+    path = tmp_path / "week.json"
+    size = write_json(str(path), DATA, PRETTY)
+    assert size == path.stat().st_size
+    assert load_json(str(path)) == DATA
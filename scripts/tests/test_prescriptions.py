@@ -0,0 +1,51 @@
+import pytest
+
+from prescriptions import REST_UNITS, exercise_targets, parse_range
+
+REST = tuple(REST_UNITS.items())
+
+@pytest.mark.parametrize("text, expected", [
+    ("3", (3, 3)),
+    ("3-5", (3, 5)),
+    ("8 - 9", (8, 9)),
+    ("~2-3", (2, 3)),
+    ("7.5-8", (7.5, 8)),
+    ("5-3", (3, 5)),
+    (" 10 ", (10, 10)),
+    ("AMRAP", None),
+    ("8, 5, 12", None),
+    ("3-5 reps", None),
+    ("", None),
+    (None, None),
+    (3, None)
+])
+def test_parse_range_counts(text, expected):
+    assert parse_range(text) == expected
+
+@pytest.mark.parametrize("text, expected", [
+    ("~2-3 min", (120, 180)),
+    ("3-5m", (180, 300)),
+    ("2", (120, 120)),
+    ("90 sec", (90, 90)),
+    ("30s", (30, 30)),
+    ("1.5 mins.", (90, 90)),
+    ("30s HOLD", None),
+    ("2 hours", None)
+])
+def test_parse_range_rest_units(text, expected):
+    assert parse_range(text, REST) == expected
+
+def test_whole_numbers_are_ints():
+    low, high = parse_range("3.0-4.5")
+    assert isinstance(low, int) and low == 3
+    assert high == 4.5
+
+def test_exercise_targets():
+    exercise = {"warmup_sets": "2-3", "working_sets": "2", "reps": "AMRAP", "rpe": "8-9", "rest": "~3-5 min"}
+    assert exercise_targets(exercise) == {
+        "warmup_sets": {"min": 2, "max": 3},
+        "working_sets": {"min": 2, "max": 2},
+        "reps": None,
+        "rpe": {"min": 8, "max": 9},
+        "rest_seconds": {"min": 180, "max": 300}
+    }
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from workout_analytics import exercise_summary, load_sets
+
+def session(date, weight, sets=3):
+    """One logged day with a single exercise of identical sets."""
+    return {
+        "date": date,
+        "exercises": {
+            "bench": {"sets": [{"weight": weight, "reps": 8, "completed": True} for _ in range(sets)]}
+        }
+    }
+
+def write_export(path, progress, athlete="alice"):
+    path.write_text(json.dumps({"athlete": athlete, "progress": progress, "personalRecords": {}}))
+    return str(path)
+
+@pytest.fixture
+def overlapping_exports(tmp_path):
+    """Two backups of one athlete; the newer one repeats and corrects the older history."""
+    older = write_export(tmp_path / "ppl-workout-data-2024-01-08.json", {
+        "phase1": {"week1": {
+            "push1": session("2024-01-01", 100),
+            "pull1": session("2024-01-02", 80)
+        }}
+    })
+    newer = write_export(tmp_path / "ppl-workout-data-2024-01-15.json", {
+        "phase1": {"week1": {
+            "push1": session("2024-01-01", 105),
+            "pull1": session("2024-01-02", 80),
+            "legs1": session("2024-01-03", 140)
+        }}
+    })
+    return older, newer
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_overlapping_exports_count_each_session_once(overlapping_exports, workers):
+    # Passed newest first: the load order comes from the export names, not the argument order
+    sets = load_sets(list(reversed(overlapping_exports)), workers=workers)
+    
+    assert len(sets) == 9
+    assert sets.groupby("day", observed=True).size().to_dict() == {"push1": 3, "pull1": 3, "legs1": 3}
+    # The newer export's correction wins
+    assert set(sets.loc[sets["day"] == "push1", "weight"]) == {105.0}
+    
+    summary = exercise_summary(sets)
+    assert summary.loc[0, "tonnage"] == 3 * 8 * (105 + 80 + 140)
+
+def test_second_run_of_a_day_is_kept(tmp_path):
+    first = write_export(tmp_path / "ppl-workout-data-2024-01-08.json", {
+        "phase1": {"week1": {"push1": session("2024-01-01", 100)}}
+    })
+    # The program was restarted: the same day, logged again on a later date
+    second = write_export(tmp_path / "ppl-workout-data-2024-03-08.json", {
+        "phase1": {"week1": {"push1": session("2024-03-01", 110)}}
+    })
+    
+    sets = load_sets([first, second])
+    
+    assert len(sets) == 6
+    assert sorted(set(sets["weight"])) == [100.0, 110.0]
+
+def test_athletes_are_deduplicated_separately(tmp_path):
+    alice = write_export(tmp_path / "alice.json", {"phase1": {"week1": {"push1": session("2024-01-01", 100)}}})
+    bob = write_export(tmp_path / "bob.json", {"phase1": {"week1": {"push1": session("2024-01-01", 100)}}},
+                       athlete="bob")
+    
+    sets = load_sets([alice, bob])
+    
+    assert sets.groupby("athlete", observed=True).size().to_dict() == {"alice": 3, "bob": 3}
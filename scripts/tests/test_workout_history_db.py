@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from workout_history_db import connect, import_export, personal_records
+
+def write_export(path, records, athlete="alice"):
+    path.write_text(json.dumps({"athlete": athlete, "progress": {}, "personalRecords": records}))
+    return str(path)
+
+def record(weight, reps, date):
+    return {"weight": weight, "reps": reps, "volume": weight * reps, "date": date}
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = connect(str(tmp_path / "history.sqlite"))
+    yield conn
+    conn.close()
+
+def test_older_export_does_not_lower_personal_records(conn, tmp_path):
+    newer = write_export(tmp_path / "ppl-workout-data-2024-02-01.json", {
+        "bench": record(100, 5, "2024-01-30"),
+        "squat": record(140, 3, "2024-01-29")
+    })
+    older = write_export(tmp_path / "ppl-workout-data-2024-01-01.json", {
+        "bench": record(90, 5, "2023-12-28"),
+        "squat": record(140, 5, "2023-12-30"),
+        "row": record(70, 8, "2023-12-29")
+    })
+    
+    import_export(conn, newer)
+    import_export(conn, older)
+    
+    records = {row["exercise_id"]: (row["weight"], row["reps"], row["date"]) for row in personal_records(conn, "alice")}
+    assert records == {
+        # Kept: the older export's bench is lighter
+        "bench": (100, 5, "2024-01-30"),
+        # Replaced: same weight, more reps is a PR under the app's rules
+        "squat": (140, 5, "2023-12-30"),
+        # Added: only the older export has it
+        "row": (70, 8, "2023-12-29")
+    }
@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+Analytics over exported pplWorkoutData backups (ppl-workout-data-YYYY-MM-DD.json).
+Exports are flattened into one columnar table with a row per logged set,
+and per-exercise volume, tonnage and estimated 1RM timelines are
+computed from that table with vectorized pandas/NumPy operations. The PR
+timeline follows the app's own PR rules (personal_records.rebuild_history).
+
+Every export must name its athlete, see export_athlete().
+
+Usage:
+    python workout_analytics.py exports/*.json --athlete alex --output analytics
+    python workout_analytics.py exports/ --athlete-from-dir --output analytics
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from build_metrics import FILES_WRITTEN, ROWS_SCANNED, add_arguments, apply_arguments, detail, finish, metrics
+
+# Columns of the set table, in order
+SET_COLUMNS = ["athlete", "date", "phase", "week", "day", "exerciseId", "setIndex", "weight", "reps", "completed"]
+
+# Columns identifying one exercise of one athlete
+EXERCISE_KEYS = ["athlete", "exerciseId"]
+
+# Columns identifying one logged session; every export repeats the whole history
+SESSION_KEYS = ["athlete", "phase", "week", "day", "date"]
+
+# Order of sets within an athlete's history
+CHRONOLOGICAL_ORDER = ["athlete", "date", "phase", "week", "day_order", "exerciseId", "setIndex"]
+
+# Reps above which the Epley estimate is no longer meaningful
+MAX_E1RM_REPS = 12
+
+# Optional top-level key of an export naming the athlete it belongs to.
+# The app's own exports do not name their athlete; see export_athlete().
+ATHLETE_KEY = "athlete"
+
+PHASE_KEY_PATTERN = re.compile(r'^phase(\d+)$')
+WEEK_KEY_PATTERN = re.compile(r'^week(\d+)$')
+
+def _number(value):
+    """Return value as a float, or NaN if it is missing or not numeric (like parseFloat)."""
+    if isinstance(value, bool) or value is None:
+        return np.nan
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+def export_athlete(path, data, athlete=None, from_dir=False):
+    """
+    Return the athlete an export belongs to.
+    
+    Exports downloaded by the app do not say whose they are, and neither
+    their file name (ppl-workout-data-YYYY-MM-DD.json) nor their location
+    can be trusted to, so the athlete must be named explicitly. It is, in
+    order: the athlete given by the caller, the export's "athlete" key, or
+    with from_dir the name of the directory holding the export (for a
+    layout of one directory per athlete, exports/<athlete>/*.json).
+    
+    Args:
+        path (str): Path of the export file
+        data (dict): Parsed pplWorkoutData export
+        athlete (str, optional): Athlete given by the caller
+        from_dir (bool): Fall back to the directory name
+    
+    Returns:
+        str: Athlete name
+    
+    Raises:
+        ValueError: If nothing names the athlete of the export
+    """
+    if athlete:
+        return athlete
+    named = data.get(ATHLETE_KEY) if isinstance(data, dict) else None
+    if isinstance(named, str) and named.strip():
+        return named.strip()
+    if from_dir:
+        return os.path.basename(os.path.dirname(os.path.abspath(path)))
+    raise ValueError("the export does not name its athlete; "
+                     "pass --athlete, or --athlete-from-dir for one directory per athlete")
+
+def add_athlete_arguments(parser):
+    """Add the --athlete and --athlete-from-dir options of export_athlete() to a parser."""
+    parser.add_argument("--athlete", help="Athlete name for all files (default: the export's \"athlete\" key)")
+    parser.add_argument("--athlete-from-dir", action="store_true",
+                        help="Name the athlete of each export after its directory (exports/<athlete>/*.json)")
+
+def iter_sessions(data):
+    """
+    Yield the logged days of an export, in export order.
+    
+    Args:
+        data (dict): Parsed pplWorkoutData export
+    
+    Yields:
+        tuple: (phase, week, day_order, day, day_data), where day_order is
+            the position of the day within its week
+    """
+    for phase_key, phase_data in (data.get("progress") or {}).items():
+        phase_match = PHASE_KEY_PATTERN.match(phase_key)
+        if not phase_match or not isinstance(phase_data, dict):
+            continue
+        phase = int(phase_match.group(1))
+        
+        for week_key, week_data in phase_data.items():
+            week_match = WEEK_KEY_PATTERN.match(week_key)
+            if not week_match or not isinstance(week_data, dict):
+                continue
+            week = int(week_match.group(1))
+            
+            for day_order, (day, day_data) in enumerate(week_data.items()):
+                if isinstance(day_data, dict):
+                    yield phase, week, day_order, day, day_data
+
+def flatten_export(data, athlete, columns):
+    """
+    Append the sets of one export to column lists.
+    
+    Args:
+        data (dict): Parsed pplWorkoutData export
+        athlete (str): Athlete identifier stored with every row
+        columns (dict): Column name -> list, as created by load_sets()
+    
+    Returns:
+        int: Number of rows appended
+    """
+    rows = 0
+    
+    for phase, week, day_order, day, day_data in iter_sessions(data):
+        date = day_data.get("date")
+        
+        for exercise_id, exercise in (day_data.get("exercises") or {}).items():
+            sets = exercise.get("sets") if isinstance(exercise, dict) else None
+            if not sets:
+                continue
+            
+            count = len(sets)
+            columns["athlete"].extend([athlete] * count)
+            columns["date"].extend([date] * count)
+            columns["phase"].extend([phase] * count)
+            columns["week"].extend([week] * count)
+            columns["day"].extend([day] * count)
+            columns["day_order"].extend([day_order] * count)
+            columns["exerciseId"].extend([exercise_id] * count)
+            columns["setIndex"].extend(range(count))
+            for s in sets:
+                s = s if isinstance(s, dict) else {}
+                columns["weight"].append(_number(s.get("weight")))
+                columns["reps"].append(_number(s.get("reps")))
+                columns["completed"].append(bool(s.get("completed")))
+            rows += count
+    
+    return rows
+
+def export_order(paths):
+    """
+    Sort export paths oldest first.
+    
+    App exports are named ppl-workout-data-YYYY-MM-DD.json, so the file
+    name orders them by export date; the full path breaks ties.
+    """
+    return sorted(paths, key=lambda path: (os.path.basename(path), path))
+
+def _flatten_files(paths, athlete=None, from_dir=False, first=0):
+    """
+    Read export files and flatten them into new column lists.
+    
+    The "export" column holds the position of each row's file in the load
+    order, counted from first.
+    """
+    columns = {name: [] for name in SET_COLUMNS + ["day_order", "export"]}
+    
+    for position, path in enumerate(paths, first):
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Skipping {path}: {str(e)}")
+            continue
+        try:
+            named = export_athlete(path, data, athlete, from_dir)
+        except ValueError as e:
+            raise ValueError(f"{path}: {str(e)}") from None
+        rows = flatten_export(data, named, columns)
+        columns["export"].extend([position] * rows)
+    
+    return columns
+
+def load_sets(paths, athlete=None, from_dir=False, workers=None):
+    """
+    Load export files into a set table.
+    
+    Args:
+        paths (list): Paths of pplWorkoutData export files
+        athlete (str, optional): Athlete of every file, see export_athlete()
+        from_dir (bool): Name the athlete of a file after its directory if
+            neither athlete nor the export names one
+        workers (int, optional): Number of worker processes that read and
+            flatten the files. Defaults to reading them in this process.
+    
+    Every export holds the athlete's whole history, so overlapping
+    backups repeat the same sessions. A session (SESSION_KEYS) is kept
+    once, from the newest export that holds it (see export_order()), as
+    workout_history_db does on import.
+    
+    Returns:
+        DataFrame: One row per logged set with the SET_COLUMNS columns,
+            sorted chronologically per athlete
+    
+    Raises:
+        ValueError: If the athlete of an export is not named
+    """
+    paths = export_order(paths)
+    if not workers or workers < 2 or len(paths) < 2:
+        return build_set_frame(_flatten_files(paths, athlete, from_dir))
+    
+    # One contiguous batch of files per worker, so the column lists come back in file order
+    batch_size = -(-len(paths) // workers)
+    firsts = list(range(0, len(paths), batch_size))
+    batches = [paths[i:i + batch_size] for i in firsts]
+    
+    columns = {name: [] for name in SET_COLUMNS + ["day_order", "export"]}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for batch in executor.map(_flatten_files, batches, [athlete] * len(batches), [from_dir] * len(batches),
+                                  firsts):
+            for name, values in batch.items():
+                columns[name].extend(values)
+    
+    return build_set_frame(columns)
+
+def build_set_frame(columns):
+    """
+    Convert column lists into the typed, sorted set table.
+    
+    Args:
+        columns (dict): Column name -> list, with the SET_COLUMNS plus
+            day_order and, optionally, the export position of every row
+    
+    Returns:
+        DataFrame: Set table, with every session taken from the newest
+            export that holds it
+    """
+    df = pd.DataFrame({
+        "athlete": pd.Categorical(columns["athlete"]),
+        "date": pd.to_datetime(pd.Series(columns["date"], dtype=object), errors="coerce"),
+        "phase": np.asarray(columns["phase"], dtype=np.int16),
+        "week": np.asarray(columns["week"], dtype=np.int16),
+        "day": pd.Categorical(columns["day"]),
+        "day_order": np.asarray(columns["day_order"], dtype=np.int16),
+        "exerciseId": pd.Categorical(columns["exerciseId"]),
+        "setIndex": np.asarray(columns["setIndex"], dtype=np.int16),
+        "weight": np.asarray(columns["weight"], dtype=np.float64),
+        "reps": np.asarray(columns["reps"], dtype=np.float64),
+        "completed": np.asarray(columns["completed"], dtype=bool)
+    })
+    
+    # Keep each session from the newest export that holds it
+    if columns.get("export"):
+        export = np.asarray(columns["export"], dtype=np.int32)
+        newest = pd.Series(export).groupby([df[key] for key in SESSION_KEYS], observed=True, dropna=False,
+                                           sort=False).transform("max").to_numpy()
+        df = df[export == newest]
+    
+    # Sessions without a date sort after the dated ones of the same athlete
+    df = df.sort_values(CHRONOLOGICAL_ORDER, kind="stable", na_position="last", ignore_index=True)
+    return df[SET_COLUMNS]
+
+def add_set_metrics(sets):
+    """
+    Add tonnage and estimated 1RM columns to a set table.
+    
+    Tonnage is weight x reps. The estimated 1RM uses the Epley formula,
+    weight x (1 + reps / 30), and equals the weight for single reps. Sets
+    without a positive weight and rep count, or with more than
+    MAX_E1RM_REPS reps, get NaN.
+    
+    Returns:
+        DataFrame: Copy of sets with "tonnage" and "e1rm" columns
+    """
+    sets = sets.copy()
+    weight = sets["weight"].to_numpy()
+    reps = sets["reps"].to_numpy()
+    valid = (weight > 0) & (reps > 0)
+    
+    sets["tonnage"] = np.where(valid, weight * reps, 0.0)
+    e1rm = np.where(reps == 1, weight, weight * (1 + reps / 30))
+    sets["e1rm"] = np.where(valid & (reps <= MAX_E1RM_REPS), e1rm, np.nan)
+    return sets
+
+def exercise_summary(sets):
+    """
+    Aggregate volume, tonnage and estimated 1RM per athlete and exercise.
+    
+    Returns:
+        DataFrame: One row per athlete and exercise with sets, completed_sets,
+            total_reps, tonnage, best_weight, best_e1rm, first_date and last_date
+    """
+    sets = add_set_metrics(sets)
+    logged = sets["tonnage"] > 0
+    sets["logged_reps"] = sets["reps"].where(logged, 0.0)
+    sets["logged_weight"] = sets["weight"].where(logged)
+    sets["is_logged"] = logged
+    
+    summary = sets.groupby(EXERCISE_KEYS, observed=True, sort=True).agg(
+        sets=("is_logged", "sum"),
+        completed_sets=("completed", "sum"),
+        total_reps=("logged_reps", "sum"),
+        tonnage=("tonnage", "sum"),
+        best_weight=("logged_weight", "max"),
+        best_e1rm=("e1rm", "max"),
+        first_date=("date", "min"),
+        last_date=("date", "max")
+    )
+    return summary.reset_index()
+
+def session_volume(sets):
+    """
+    Aggregate tonnage and reps per athlete, phase, week and day.
+    
+    Returns:
+        DataFrame: One row per logged day with date, sets, total_reps and tonnage
+    """
+    sets = add_set_metrics(sets)
+    sets["is_logged"] = sets["tonnage"] > 0
+    sets["logged_reps"] = sets["reps"].where(sets["is_logged"], 0.0)
+    
+    volume = sets.groupby(["athlete", "phase", "week", "day"], observed=True, sort=False).agg(
+        date=("date", "first"),
+        sets=("is_logged", "sum"),
+        total_reps=("logged_reps", "sum"),
+        tonnage=("tonnage", "sum")
+    )
+    return volume.reset_index()
+
+def e1rm_timeline(sets):
+    """
+    Find the sets that raised an athlete's best estimated 1RM for an exercise.
+    
+    Sets are taken in chronological order; a set is part of the timeline
+    when its estimated 1RM is higher than every earlier set of the same
+    exercise. This is not what the app counts as a PR, see pr_timeline().
+    
+    Returns:
+        DataFrame: Timeline rows with the set columns, e1rm and previous_best
+    """
+    sets = add_set_metrics(sets)
+    sets = sets[sets["e1rm"].notna()]
+    
+    best = sets.groupby(EXERCISE_KEYS, observed=True, sort=False)["e1rm"].cummax()
+    previous_best = best.groupby([sets["athlete"], sets["exerciseId"]], observed=True, sort=False).shift(1)
+    
+    improved = previous_best.isna() | (sets["e1rm"] > previous_best)
+    timeline = sets[improved].copy()
+    timeline["previous_best"] = previous_best[improved]
+    return timeline.reset_index(drop=True)
+
+def pr_timeline(sets):
+    """
+    Find the sets that were personal records under the app's rules.
+    
+    The sets are replayed through personal_records.rebuild_history(), so
+    the timeline holds the same PRs as checkPersonalRecord() in the app.
+    
+    Returns:
+        DataFrame: PR history with the personal_records.HISTORY_COLUMNS columns
+    """
+    # personal_records imports this module
+    from personal_records import rebuild_history
+    return rebuild_history(sets)
+
+def find_exports(sources):
+    """
+    Resolve directories, glob patterns and file paths to export files.
+    
+    Returns:
+        list: Sorted, de-duplicated .json paths
+    """
+    paths = set()
+    for source in sources:
+        for match in glob.glob(source):
+            if os.path.isdir(match):
+                paths.update(glob.glob(os.path.join(match, "*.json")))
+            elif match.endswith(".json"):
+                paths.add(match)
+    return sorted(paths)
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze exported pplWorkoutData backups.")
+    parser.add_argument("sources", nargs="+",
+                        help="Directories, glob patterns or export files to analyze")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="Number of worker processes reading the exports (default: none)")
+    parser.add_argument("-o", "--output", default=None,
+                        help="Directory for exercise_summary.csv, session_volume.csv, e1rm_timeline.csv "
+                             "and pr_timeline.csv")
+    add_athlete_arguments(parser)
+    add_arguments(parser)
+    args = parser.parse_args()
+    apply_arguments(args)
+    
+    with metrics.stage("find_exports"):
+        paths = find_exports(args.sources)
+    if not paths:
+        print("No export files found.")
+        return
+    
+    try:
+        with metrics.stage("load_sets"):
+            sets = load_sets(paths, args.athlete, args.athlete_from_dir, workers=args.workers)
+    except ValueError as e:
+        parser.error(str(e))
+    metrics.count(ROWS_SCANNED, len(sets))
+    print(f"Loaded {len(sets)} sets for {sets['athlete'].nunique()} athletes from {len(paths)} exports")
+    
+    with metrics.stage("reports"):
+        summary = exercise_summary(sets)
+        reports = {
+            "exercise_summary": summary,
+            "session_volume": session_volume(sets),
+            "e1rm_timeline": e1rm_timeline(sets),
+            "pr_timeline": pr_timeline(sets)
+        }
+    
+    top = summary.sort_values("tonnage", ascending=False).head(10)
+    print("\nTop exercises by tonnage:")
+    for row in top.itertuples(index=False):
+        print(f"  {row.exerciseId:<40} {row.tonnage:12.1f}  best e1RM {row.best_e1rm:8.1f}  ({row.athlete})")
+    
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+        with metrics.stage("write_csv"):
+            for name, report in reports.items():
+                path = os.path.join(args.output, f"{name}.csv")
+                report.to_csv(path, index=False)
+                metrics.count(FILES_WRITTEN)
+                detail(f"Saved {path}")
+    
+    finish(args.metrics)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+SQLite history store for exported pplWorkoutData backups.
+Exports are bulk-loaded into a normalized schema (athletes, sessions,
+sets, personal_records) and can be queried for the common reports.
+
+Exports do not name their athlete, so every import names it, see
+workout_analytics.export_athlete(). A session is one logged day of the
+program on one date, so a second run through the program adds to the
+history instead of replacing the first. Re-importing an export is
+idempotent: unchanged files are skipped by content hash, within a changed
+file only the sessions whose content changed are rewritten, and only
+sessions that came from the same file can be removed by its re-import.
+
+Usage:
+    python workout_history_db.py import exports/alice/*.json --athlete alice
+    python workout_history_db.py import exports/*/ --athlete-from-dir --db history.sqlite
+    python workout_history_db.py report prs alice
+"""
+
+import argparse
+import json
+import math
+import os
+import sqlite3
+import time
+
+from build_cache import hash_bytes, hash_json
+from build_metrics import ROWS_SCANNED, add_arguments, apply_arguments, detail, finish, metrics
+from personal_records import is_personal_record, replay_export
+from workout_analytics import add_athlete_arguments, export_athlete, export_order, find_exports, iter_sessions
+
+# Default database file, relative to the working directory
+DB_FILE = "workout-history.sqlite"
+
+# Bump when the schema changes; older databases are rejected
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS athletes (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    units TEXT
+);
+
+CREATE TABLE IF NOT EXISTS imports (
+    path TEXT PRIMARY KEY,
+    athlete_id INTEGER NOT NULL REFERENCES athletes(id),
+    file_hash TEXT NOT NULL,
+    imported_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    athlete_id INTEGER NOT NULL REFERENCES athletes(id),
+    phase INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    day TEXT NOT NULL,
+    date TEXT,
+    content_hash TEXT NOT NULL,
+    source TEXT NOT NULL
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS sessions_key ON sessions (athlete_id, phase, week, day, IFNULL(date, ''));
+
+CREATE TABLE IF NOT EXISTS sets (
+    session_id INTEGER NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    athlete_id INTEGER NOT NULL REFERENCES athletes(id),
+    exercise_id TEXT NOT NULL,
+    set_index INTEGER NOT NULL,
+    date TEXT,
+    weight REAL,
+    reps INTEGER,
+    completed INTEGER NOT NULL,
+    PRIMARY KEY (session_id, exercise_id, set_index)
+);
+
+CREATE TABLE IF NOT EXISTS personal_records (
+    athlete_id INTEGER NOT NULL REFERENCES athletes(id),
+    exercise_id TEXT NOT NULL,
+    weight REAL,
+    reps INTEGER,
+    volume REAL,
+    date TEXT,
+    PRIMARY KEY (athlete_id, exercise_id)
+);
+
+CREATE INDEX IF NOT EXISTS sets_exercise_date ON sets (exercise_id, date);
+CREATE INDEX IF NOT EXISTS sessions_athlete_phase_week ON sessions (athlete_id, phase, week);
+"""
+
+def connect(db_file=DB_FILE):
+    """
+    Open the history database, creating the schema if needed.
+    
+    Returns:
+        sqlite3.Connection: Connection with foreign keys enabled
+    
+    Raises:
+        ValueError: If the database was created with another schema version
+    """
+    conn = sqlite3.connect(db_file)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA journal_mode = WAL")
+    
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version == 0:
+        conn.executescript(SCHEMA)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    elif version != SCHEMA_VERSION:
+        conn.close()
+        raise ValueError(f"{db_file}: unsupported schema version {version}, expected {SCHEMA_VERSION}")
+    
+    return conn
+
+def _number(value, convert):
+    """Return value converted with convert(), or None if it is missing or not numeric."""
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        number = convert(value)
+    except (TypeError, ValueError):
+        return None
+    return None if isinstance(number, float) and math.isnan(number) else number
+
+def _reps(value):
+    """Convert reps like parseInt(): "8.5" and 8.5 both become 8."""
+    return int(float(value))
+
+def session_set_rows(session_id, athlete_id, day_data):
+    """Return the sets table rows of one logged day."""
+    rows = []
+    date = day_data.get("date")
+    
+    for exercise_id, exercise in (day_data.get("exercises") or {}).items():
+        sets = exercise.get("sets") if isinstance(exercise, dict) else None
+        for set_index, s in enumerate(sets or []):
+            s = s if isinstance(s, dict) else {}
+            rows.append((session_id, athlete_id, exercise_id, set_index, date,
+                         _number(s.get("weight"), float), _number(s.get("reps"), _reps),
+                         1 if s.get("completed") else 0))
+    
+    return rows
+
+def get_athlete_id(conn, name, units=None):
+    """Return the id of an athlete, creating the athlete if needed."""
+    conn.execute("INSERT INTO athletes (name, units) VALUES (?, ?) "
+                 "ON CONFLICT (name) DO UPDATE SET units = COALESCE(excluded.units, units)", (name, units))
+    return conn.execute("SELECT id FROM athletes WHERE name = ?", (name,)).fetchone()[0]
+
+def import_export(conn, path, athlete=None, force=False, rebuild_prs=False, from_dir=False):
+    """
+    Import one export file for an athlete in a single transaction.
+    
+    Sessions are keyed by phase, week, day and date. Sessions that are new
+    or changed are (re)written; sessions that an earlier import of the same
+    file added and that are no longer in it are deleted. History imported
+    from other files is never removed. The export's personal records, which
+    are the app's running records, are merged per exercise: a stored record
+    is only replaced by a better one under the app's PR rules.
+    
+    Args:
+        conn (sqlite3.Connection): History database
+        path (str): Path of the export file
+        athlete (str, optional): Athlete name, see workout_analytics.export_athlete()
+        force (bool): Import even if the file is unchanged since the last import
+        rebuild_prs (bool): Recompute the personal records from the logged sets
+            instead of storing the export's personalRecords
+        from_dir (bool): Name the athlete after the export's directory if
+            neither athlete nor the export names one
+    
+    Returns:
+        dict: Counts of sessions added, updated, unchanged and removed, and
+            the number of sets written; None if the file was skipped
+    
+    Raises:
+        ValueError: If the athlete of the export is not named
+    """
+    # Files are identified by absolute path, however they were named on the command line
+    source = os.path.abspath(path)
+    with open(path, 'rb') as f:
+        raw = f.read()
+    file_hash = hash_bytes(raw)
+    
+    previous = conn.execute("SELECT file_hash FROM imports WHERE path = ?", (source,)).fetchone()
+    if previous and previous[0] == file_hash and not force:
+        return None
+    
+    data = json.loads(raw)
+    athlete = export_athlete(path, data, athlete, from_dir)
+    counts = {"added": 0, "updated": 0, "unchanged": 0, "removed": 0, "sets": 0}
+    
+    with conn:
+        athlete_id = get_athlete_id(conn, athlete, (data.get("settings") or {}).get("units"))
+        
+        stored = {(phase, week, day, date): (session_id, content_hash, source)
+                  for session_id, phase, week, day, date, content_hash, source in conn.execute(
+                      "SELECT id, phase, week, day, IFNULL(date, ''), content_hash, source "
+                      "FROM sessions WHERE athlete_id = ?", (athlete_id,))}
+        
+        set_rows = []
+        stale_sessions = []
+        seen = set()
+        
+        for phase, week, _, day, day_data in iter_sessions(data):
+            key = (phase, week, day, day_data.get("date") or "")
+            seen.add(key)
+            content_hash = hash_json(day_data)
+            session_id, stored_hash, _ = stored.get(key, (None, None, None))
+            
+            if stored_hash == content_hash:
+                counts["unchanged"] += 1
+                continue
+            
+            if session_id is None:
+                session_id = conn.execute(
+                    "INSERT INTO sessions (athlete_id, phase, week, day, date, content_hash, source) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (athlete_id, phase, week, day, day_data.get("date"), content_hash, source)).lastrowid
+                counts["added"] += 1
+            else:
+                conn.execute("UPDATE sessions SET content_hash = ?, source = ? WHERE id = ?",
+                             (content_hash, source, session_id))
+                stale_sessions.append((session_id,))
+                counts["updated"] += 1
+            
+            set_rows.extend(session_set_rows(session_id, athlete_id, day_data))
+        
+        # Only this file's own sessions can disappear with it
+        removed = [(session_id,) for key, (session_id, _, stored_source) in stored.items()
+                   if stored_source == source and key not in seen]
+        counts["removed"] = len(removed)
+        
+        conn.executemany("DELETE FROM sets WHERE session_id = ?", stale_sessions + removed)
+        conn.executemany("DELETE FROM sessions WHERE id = ?", removed)
+        conn.executemany("INSERT INTO sets (session_id, athlete_id, exercise_id, set_index, date, weight, reps, completed) "
+                         "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", set_rows)
+        counts["sets"] = len(set_rows)
+        
+        # Personal records are merged per exercise with the app's PR rules, so an
+        # older export imported after a newer one cannot lower a record
+        records = replay_export(data).records if rebuild_prs else (data.get("personalRecords") or {})
+        current = {exercise_id: {"weight": weight, "reps": reps}
+                   for exercise_id, weight, reps in conn.execute(
+                       "SELECT exercise_id, weight, reps FROM personal_records WHERE athlete_id = ?", (athlete_id,))
+                   if weight is not None and reps is not None}
+        pr_rows = []
+        for exercise_id, pr in records.items():
+            if not isinstance(pr, dict):
+                continue
+            weight, reps = _number(pr.get("weight"), float), _number(pr.get("reps"), _reps)
+            if exercise_id in current and not is_personal_record(current[exercise_id], weight, reps):
+                continue
+            pr_rows.append((athlete_id, exercise_id, weight, reps, _number(pr.get("volume"), float), pr.get("date")))
+        conn.executemany("INSERT INTO personal_records (athlete_id, exercise_id, weight, reps, volume, date) "
+                         "VALUES (?, ?, ?, ?, ?, ?) "
+                         "ON CONFLICT (athlete_id, exercise_id) DO UPDATE SET weight = excluded.weight, "
+                         "reps = excluded.reps, volume = excluded.volume, date = excluded.date",
+                         pr_rows)
+        
+        conn.execute("INSERT INTO imports (path, athlete_id, file_hash, imported_at) VALUES (?, ?, ?, ?) "
+                     "ON CONFLICT (path) DO UPDATE SET athlete_id = excluded.athlete_id, "
+                     "file_hash = excluded.file_hash, imported_at = excluded.imported_at",
+                     (source, athlete_id, file_hash, time.strftime("%Y-%m-%dT%H:%M:%S")))
+    
+    return counts
+
+def _rows(conn, query, params):
+    """Run a query and return its rows as dicts."""
+    cursor = conn.execute(query, params)
+    names = [column[0] for column in cursor.description]
+    return [dict(zip(names, row)) for row in cursor]
+
+def exercise_history(conn, athlete, exercise_id):
+    """
+    Return every logged set of an exercise for an athlete, oldest first.
+    
+    Returns:
+        list: Dicts with date, phase, week, day, set_index, weight, reps and completed
+    """
+    return _rows(conn, """
+        SELECT s.date, ss.phase, ss.week, ss.day, s.set_index, s.weight, s.reps, s.completed
+        FROM sets s
+        JOIN sessions ss ON ss.id = s.session_id
+        JOIN athletes a ON a.id = s.athlete_id
+        WHERE a.name = ? AND s.exercise_id = ?
+        ORDER BY s.date, ss.phase, ss.week, ss.id, s.set_index
+    """, (athlete, exercise_id))
+
+def weekly_volume(conn, athlete, phase=None):
+    """
+    Return sets, reps and tonnage per phase and week for an athlete.
+    
+    Returns:
+        list: Dicts with phase, week, sessions, sets, total_reps and tonnage
+    """
+    return _rows(conn, """
+        SELECT ss.phase, ss.week, COUNT(DISTINCT ss.id) AS sessions,
+               SUM(s.weight > 0 AND s.reps > 0) AS sets,
+               SUM(CASE WHEN s.weight > 0 AND s.reps > 0 THEN s.reps ELSE 0 END) AS total_reps,
+               SUM(CASE WHEN s.weight > 0 AND s.reps > 0 THEN s.weight * s.reps ELSE 0 END) AS tonnage
+        FROM sessions ss
+        JOIN athletes a ON a.id = ss.athlete_id
+        LEFT JOIN sets s ON s.session_id = ss.id
+        WHERE a.name = ? AND (? IS NULL OR ss.phase = ?)
+        GROUP BY ss.phase, ss.week
+        ORDER BY ss.phase, ss.week
+    """, (athlete, phase, phase))
+
+def personal_records(conn, athlete):
+    """
+    Return the stored personal records of an athlete.
+    
+    Returns:
+        list: Dicts with exercise_id, weight, reps, volume and date
+    """
+    return _rows(conn, """
+        SELECT pr.exercise_id, pr.weight, pr.reps, pr.volume, pr.date
+        FROM personal_records pr
+        JOIN athletes a ON a.id = pr.athlete_id
+        WHERE a.name = ?
+        ORDER BY pr.exercise_id
+    """, (athlete,))
+
+def exercise_leaderboard(conn, exercise_id, since=None, limit=10):
+    """
+    Return the athletes with the heaviest logged set of an exercise.
+    
+    Args:
+        since (str, optional): Only count sets on or after this YYYY-MM-DD date
+    
+    Returns:
+        list: Dicts with athlete, best_weight, sets and last_date
+    """
+    return _rows(conn, """
+        SELECT a.name AS athlete, MAX(s.weight) AS best_weight, COUNT(*) AS sets, MAX(s.date) AS last_date
+        FROM sets s
+        JOIN athletes a ON a.id = s.athlete_id
+        WHERE s.exercise_id = ? AND s.weight > 0 AND s.reps > 0 AND (? IS NULL OR s.date >= ?)
+        GROUP BY s.athlete_id
+        ORDER BY best_weight DESC
+        LIMIT ?
+    """, (exercise_id, since, since, limit))
+
+# Reports available from the command line: name -> (function, argument names)
+REPORTS = {
+    "history": (exercise_history, ["athlete", "exercise_id"]),
+    "volume": (weekly_volume, ["athlete"]),
+    "prs": (personal_records, ["athlete"]),
+    "leaderboard": (exercise_leaderboard, ["exercise_id"])
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Store exported pplWorkoutData backups in SQLite and report on them.")
+    parser.add_argument("--db", default=DB_FILE, help=f"Database file (default: {DB_FILE})")
+    add_arguments(parser)
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    import_parser = commands.add_parser("import", help="Import export files")
+    import_parser.add_argument("sources", nargs="+", help="Directories, glob patterns or export files")
+    add_athlete_arguments(import_parser)
+    import_parser.add_argument("--force", action="store_true", help="Re-import files that did not change")
+    import_parser.add_argument("--rebuild-prs", action="store_true",
+                               help="Recompute personal records from the logged sets instead of trusting the export")
+    
+    report_parser = commands.add_parser("report", help="Print a report")
+    report_parser.add_argument("report", choices=sorted(REPORTS))
+    report_parser.add_argument("arguments", nargs="+", help="Athlete and/or exercise id, as the report needs")
+    args = parser.parse_args()
+    apply_arguments(args)
+    
+    conn = connect(args.db)
+    
+    try:
+        if args.command == "import":
+            # Oldest exports first (their names end in the export date), so newer ones are applied last
+            paths = export_order(find_exports(args.sources))
+            start = time.perf_counter()
+            with metrics.stage("import"):
+                for path in paths:
+                    try:
+                        counts = import_export(conn, path, args.athlete, args.force, args.rebuild_prs, args.athlete_from_dir)
+                    except (OSError, ValueError) as e:
+                        print(f"Error importing {path}: {str(e)}")
+                        continue
+                    if counts is None:
+                        detail(f"Unchanged: {path}")
+                    else:
+                        metrics.count(ROWS_SCANNED, counts["sets"])
+                        detail(f"Imported {path}: {counts['added']} added, {counts['updated']} updated, "
+                               f"{counts['unchanged']} unchanged, {counts['removed']} removed sessions, {counts['sets']} sets")
+            print(f"Processed {len(paths)} files in {time.perf_counter() - start:.2f}s")
+        else:
+            function, names = REPORTS[args.report]
+            if len(args.arguments) != len(names):
+                parser.error(f"report {args.report} needs: {' '.join(names)}")
+            with metrics.stage("report"):
+                rows = list(function(conn, *args.arguments))
+            for row in rows:
+                print(json.dumps(row))
+    finally:
+        conn.close()
+    
+    finish(args.metrics)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Compact typed model of a workout program: Program -> Phase -> Week -> Day
+-> Exercise, built from slotted dataclasses instead of nested dicts.
+
+An Exercise stores its fields in slots and interns its strings: names,
+notes and prescriptions such as "3", "8-9" or "~2-3 min" repeat across the
+weeks of a program and across programs, so each distinct value is stored
+once and a large corpus takes a fraction of the memory of the parsed JSON.
+Exercise is also a read-only mapping with the keys of the source schema,
+so the generators (transform_exercise, iter_week_html, derive_week) can
+read it as they read an exercise dict, without converting it first.
+
+Usage:
+    python workout_model.py --benchmark
+    python workout_model.py --benchmark "The Ultimate Push Pull Legs System - 6x (2)_workout_data.json" --copies 200
+"""
+
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+
+from json_io import load_json
+
+# Exercise fields in the order of the _workout_data.json schema
+EXERCISE_FIELDS = [
+    "name", "warmup_sets", "working_sets", "reps", "load", "rpe",
+    "rest", "substitution1", "substitution2", "notes"
+]
+
+# Default program_info values, as written by extract_workout_data
+DEFAULT_PROGRAM_NAME = "The Ultimate Push Pull Legs System"
+
+# Default source file for the benchmark
+BENCHMARK_FILE = "The Ultimate Push Pull Legs System - 6x (2)_workout_data.json"
+
+_FIELD_SET = frozenset(EXERCISE_FIELDS)
+
+@dataclass(slots=True)
+class Exercise(Mapping):
+    """One exercise of a day, with the fields of the source schema."""
+    
+    name: str
+    warmup_sets: str = ""
+    working_sets: str = ""
+    reps: str = ""
+    load: str = ""
+    rpe: str = ""
+    rest: str = ""
+    substitution1: str = ""
+    substitution2: str = ""
+    notes: str = ""
+    
+    # Read-only mapping view, so generators can use exercise["reps"] and **exercise
+    def __getitem__(self, key):
+        if key not in _FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __iter__(self):
+        return iter(EXERCISE_FIELDS)
+    
+    def __len__(self):
+        return len(EXERCISE_FIELDS)
+    
+    @classmethod
+    def from_values(cls, values):
+        """Build an exercise from values in EXERCISE_FIELDS order, interning the strings."""
+        return cls(*[sys.intern(value) if isinstance(value, str) else value for value in values])
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Build an exercise from a dict of the source schema; missing fields are empty."""
+        return cls.from_values(data.get(name, "") for name in EXERCISE_FIELDS)
+    
+    @classmethod
+    def from_columns(cls, columns):
+        """
+        Build exercises from column lists, as assembled from the Excel rows.
+        
+        Args:
+            columns (dict): Field name -> list of values, one list per
+                EXERCISE_FIELDS entry, all of the same length
+        
+        Returns:
+            list: Exercises in row order
+        """
+        return [cls.from_values(values) for values in zip(*(columns[name] for name in EXERCISE_FIELDS))]
+    
+    def to_dict(self):
+        """Return the exercise as a plain dict of the source schema."""
+        return {name: getattr(self, name) for name in EXERCISE_FIELDS}
+
+@dataclass(slots=True)
+class Day:
+    """A training day, e.g. "push1", with its exercises in order."""
+    
+    key: str
+    exercises: list = field(default_factory=list)
+
+@dataclass(slots=True)
+class Week:
+    """A week of a phase, with its days in source order."""
+    
+    number: int
+    days: dict = field(default_factory=dict)
+    
+    def view(self):
+        """
+        Return the week in the source layout, day key -> list of exercises.
+        
+        The lists are the model's own lists, not copies, and the exercises
+        are Exercise objects.
+        """
+        return {key: day.exercises for key, day in self.days.items()}
+
+@dataclass(slots=True)
+class Phase:
+    """A phase of the program with its description, weeks and deload week numbers."""
+    
+    number: int
+    description: str = ""
+    weeks: dict = field(default_factory=dict)
+    deload_weeks: list = field(default_factory=list)
+    
+    def view(self):
+        """Return the phase in the source layout, see Program.view()."""
+        data = {
+            "description": self.description,
+            "weeks": {f"week{week.number}": week.view() for week in self.weeks.values()}
+        }
+        if self.deload_weeks:
+            data["deload_weeks"] = self.deload_weeks
+        return data
+
+@dataclass(slots=True)
+class Program:
+    """A whole program, as stored in a _workout_data.json file."""
+    
+    name: str = DEFAULT_PROGRAM_NAME
+    phase_count: int = 3
+    weeks_per_phase: int = 6
+    days_per_week: int = 6
+    phases: dict = field(default_factory=dict)
+    
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build a program from workout data in the _workout_data.json schema.
+        
+        Args:
+            data (dict): Parsed workout data
+        
+        Returns:
+            Program: The program; phases and weeks keep their source order
+        """
+        info = data.get("program_info", {})
+        program = cls(
+            name=info.get("name", DEFAULT_PROGRAM_NAME),
+            phase_count=info.get("phases", 3),
+            weeks_per_phase=info.get("weeks_per_phase", 6),
+            days_per_week=info.get("days_per_week", 6)
+        )
+        
+        from_dict = Exercise.from_dict
+        for phase_key, phase_data in data.get("phases", {}).items():
+            phase = Phase(int(phase_key[5:]), phase_data.get("description", ""),
+                          deload_weeks=list(phase_data.get("deload_weeks", [])))
+            for week_key, week_data in phase_data.get("weeks", {}).items():
+                week = Week(int(week_key[4:]))
+                for day_key, exercises in week_data.items():
+                    if isinstance(exercises, list):
+                        week.days[day_key] = Day(day_key, [from_dict(exercise) for exercise in exercises])
+                phase.weeks[week.number] = week
+            program.phases[phase.number] = phase
+        
+        return program
+    
+    def view(self):
+        """
+        Return the program in the _workout_data.json layout without copying
+        the exercises.
+        
+        The result can be passed to the generators in place of the parsed
+        JSON: the day lists are the model's own lists of Exercise objects.
+        Use to_dict() for output that has to be serialized.
+        
+        Returns:
+            dict: Workout data with program_info and phases
+        """
+        return {
+            "program_info": {
+                "name": self.name,
+                "phases": self.phase_count,
+                "weeks_per_phase": self.weeks_per_phase,
+                "days_per_week": self.days_per_week
+            },
+            "phases": {f"phase{phase.number}": phase.view() for phase in self.phases.values()}
+        }
+    
+    def to_dict(self):
+        """Return the program as plain workout data that can be written as JSON."""
+        data = self.view()
+        for phase_data in data["phases"].values():
+            for week_data in phase_data["weeks"].values():
+                for day_key, exercises in week_data.items():
+                    week_data[day_key] = [exercise.to_dict() for exercise in exercises]
+        return data
+    
+    def exercises(self):
+        """Yield (phase, week, day, exercise) for every exercise of the program."""
+        for phase in self.phases.values():
+            for week in phase.weeks.values():
+                for day in week.days.values():
+                    for exercise in day.exercises:
+                        yield phase.number, week.number, day.key, exercise
+
+def load_program(path):
+    """Load a _workout_data.json file as a Program."""
+    return Program.from_dict(load_json(path))
+
+def _allocated(build, copies):
+    """Return the bytes allocated by building copies objects with build()."""
+    gc.collect()
+    tracemalloc.start()
+    objects = [build() for _ in range(copies)]
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return allocated
+
+def benchmark(path, copies=50, repeat=20):
+    """
+    Compare the memory and field access time of dicts and the model.
+    
+    Args:
+        path (str): _workout_data.json file
+        copies (int): Number of copies of the program held in memory,
+            standing in for a corpus of programs
+        repeat (int): Number of passes over all exercises for the access timing
+    
+    Returns:
+        dict: Exercise count, bytes per exercise and access ns per field for
+            "dict" and "model"
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    
+    program = Program.from_dict(json.loads(raw))
+    exercise_count = sum(1 for _ in program.exercises())
+    
+    results = {"exercises": exercise_count}
+    builders = {
+        "dict": lambda: json.loads(raw),
+        "model": lambda: Program.from_dict(json.loads(raw))
+    }
+    for kind, build in builders.items():
+        # Parsing garbage is freed before the model is measured
+        results[f"{kind}_bytes_per_exercise"] = _allocated(build, copies) / (exercise_count * copies)
+    
+    # Field reads in a render-style loop
+    dicts = [exercise.to_dict() for _, _, _, exercise in program.exercises()]
+    models = [exercise for _, _, _, exercise in program.exercises()]
+    
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for exercise in dicts:
+            exercise["name"], exercise["reps"], exercise["rpe"], exercise["substitution1"]
+    results["dict_ns_per_field"] = (time.perf_counter() - start) * 1e9 / (repeat * len(dicts) * 4)
+    
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for exercise in models:
+            exercise.name, exercise.reps, exercise.rpe, exercise.substitution1
+    results["model_ns_per_field"] = (time.perf_counter() - start) * 1e9 / (repeat * len(models) * 4)
+    
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the typed workout model against plain dicts.")
+    parser.add_argument("--benchmark", nargs="?", const=BENCHMARK_FILE, metavar="FILE",
+                        help=f"Workout data file to benchmark (default: {BENCHMARK_FILE})")
+    parser.add_argument("--copies", type=int, default=50,
+                        help="Copies of the program held in memory (default: 50)")
+    args = parser.parse_args()
+    
+    if args.benchmark is None:
+        parser.print_help()
+        return
+    
+    results = benchmark(args.benchmark, args.copies)
+    print(f"{results['exercises']} exercises per program, {args.copies} copies")
+    print(f"{'':<6} {'bytes/exercise':>15} {'ns/field read':>14}")
+    for kind in ["dict", "model"]:
+        print(f"{kind:<6} {results[f'{kind}_bytes_per_exercise']:>15.0f} {results[f'{kind}_ns_per_field']:>14.1f}")
+
+if __name__ == "__main__":
+    main()
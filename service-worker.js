@@ -1,4 +1,13 @@
-const CACHE_NAME = 'ppl-workout-v8';
+const CACHE_NAME = 'ppl-workout-v10';
+
+// Generated exercise data is cached separately and refreshed file by file
+// from the precache manifest written by scripts/generate_workout_json.py
+const DATA_CACHE_NAME = 'ppl-workout-data';
+const PRECACHE_MANIFEST_URL = './dev/exercise-data/precache-manifest.json';
+
+// Key under which the last applied manifest is kept in the data cache
+const APPLIED_MANIFEST_KEY = './dev/exercise-data/precache-manifest.applied.json';
+
 const ASSETS_TO_CACHE = [
   './',
   './index.html',
@@ -10,45 +19,87 @@ const ASSETS_TO_CACHE = [
   './assets/js/exercise-inputs.min.js',
   './assets/js/progress-tracker.min.js',
   './assets/js/network-status.min.js',
+  './assets/js/compact-program.min.js',
   './assets/js/workout-loader.min.js',
   './assets/icons/optimized/Icon-192.png',
   './assets/icons/optimized/icon-512.png',
   './assets/icons/optimized/maskable-icon.png',
-  './favicon.ico',
-  './dev/exercise-data/phase1-week1.json',
-  './dev/exercise-data/phase1-week2.json',
-  './dev/exercise-data/phase1-week3.json',
-  './dev/exercise-data/phase1-week4.json',
-  './dev/exercise-data/phase1-week5.json',
-  './dev/exercise-data/phase1-week6.json',
-  './dev/exercise-data/phase2-week1.json',
-  './dev/exercise-data/phase2-week2.json',
-  './dev/exercise-data/phase2-week3.json',
-  './dev/exercise-data/phase2-week4.json',
-  './dev/exercise-data/phase2-week5.json',
-  './dev/exercise-data/phase2-week6.json',
-  './dev/exercise-data/phase3-week1.json',
-  './dev/exercise-data/phase3-week2.json',
-  './dev/exercise-data/phase3-week3.json',
-  './dev/exercise-data/phase3-week4.json',
-  './dev/exercise-data/phase3-week5.json',
-  './dev/exercise-data/phase3-week6.json'
+  './favicon.ico'
 ];
 
 // Offline fallback page
 const OFFLINE_PAGE = './offline.html';
 
+/**
+ * Bring the exercise data cache up to date with the precache manifest.
+ * Only files whose revision changed, or that are missing from the cache,
+ * are downloaded; files no longer listed are removed.
+ * @returns {Promise} Resolves when the data cache matches the manifest
+ */
+function precacheExerciseData() {
+  return Promise.all([
+    fetch(PRECACHE_MANIFEST_URL, { cache: 'no-store' })
+      .then((response) => {
+        if (!response.ok) {
+          throw new Error(`Precache manifest request failed: ${response.status}`);
+        }
+        return response.json();
+      }),
+    caches.open(DATA_CACHE_NAME)
+  ]).then(([manifest, cache]) => {
+    return cache.match(APPLIED_MANIFEST_KEY)
+      .then((response) => response ? response.json() : { assets: [] })
+      .then((applied) => {
+        const previousRevisions = new Map(applied.assets.map((asset) => [asset.url, asset.revision]));
+        const currentUrls = new Set(manifest.assets.map((asset) => asset.url));
+        
+        // Find the assets that changed or were evicted from the cache
+        return Promise.all(manifest.assets.map((asset) => {
+          return cache.match(asset.url)
+            .then((cached) => (!cached || previousRevisions.get(asset.url) !== asset.revision) ? asset : null);
+        })).then((changed) => {
+          changed = changed.filter(Boolean);
+          
+          return Promise.all(changed.map((asset) => {
+            return fetch(asset.url, { cache: 'no-store' })
+              .then((response) => {
+                if (!response.ok) {
+                  throw new Error(`Failed to fetch ${asset.url}: ${response.status}`);
+                }
+                return cache.put(asset.url, response);
+              });
+          }))
+            .then(() => Promise.all(applied.assets
+              .filter((asset) => !currentUrls.has(asset.url))
+              .map((asset) => cache.delete(asset.url))))
+            .then(() => cache.put(APPLIED_MANIFEST_KEY, new Response(JSON.stringify(manifest), {
+              headers: { 'Content-Type': 'application/json' }
+            })))
+            .then(() => {
+              console.log(`Exercise data up to date: ${changed.length} of ${manifest.assets.length} files fetched`);
+            });
+        });
+      });
+  });
+}
+
 // Install event - cache assets
 self.addEventListener('install', (event) => {
   event.waitUntil(
-    caches.open(CACHE_NAME)
-      .then((cache) => {
-        console.log('Opened cache');
-        return cache.addAll(ASSETS_TO_CACHE);
-      })
-      .catch((error) => {
-        console.error('Pre-caching failed:', error);
-      })
+    Promise.all([
+      caches.open(CACHE_NAME)
+        .then((cache) => {
+          console.log('Opened cache');
+          return cache.addAll(ASSETS_TO_CACHE);
+        })
+        .catch((error) => {
+          console.error('Pre-caching failed:', error);
+        }),
+      precacheExerciseData()
+        .catch((error) => {
+          console.error('Exercise data pre-caching failed:', error);
+        })
+    ])
   );
 });
 
@@ -58,7 +109,7 @@ self.addEventListener('activate', (event) => {
     caches.keys().then((cacheNames) => {
       return Promise.all(
         cacheNames.map((cacheName) => {
-          if (cacheName !== CACHE_NAME) {
+          if (cacheName !== CACHE_NAME && cacheName !== DATA_CACHE_NAME) {
             console.log('Deleting old cache:', cacheName);
             return caches.delete(cacheName);
           }
@@ -80,6 +131,14 @@ self.addEventListener('fetch', (event) => {
       (event.request.method === 'GET' &&
        event.request.headers.get('accept').includes('text/html'))) {
     
+    // Pick up exercise data changes published since the worker was installed
+    event.waitUntil(
+      precacheExerciseData()
+        .catch((error) => {
+          console.error('Exercise data refresh failed:', error);
+        })
+    );
+    
     event.respondWith(
       fetch(event.request)
         .catch(() => {
@@ -117,7 +176,8 @@ self.addEventListener('fetch', (event) => {
               const responseToCache = networkResponse.clone();
               
               // Add to cache for future use
-              caches.open(CACHE_NAME)
+              const cacheName = event.request.url.includes('/dev/exercise-data/') ? DATA_CACHE_NAME : CACHE_NAME;
+              caches.open(cacheName)
                 .then((cache) => {
                   cache.put(event.request, responseToCache);
                 });